@@ -0,0 +1,36 @@
+"""Container search trigram index
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-01-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('containers', sa.Column(
+        'search_text',
+        sa.Text(),
+        sa.Computed("name || ' ' || tenant || ' ' || purpose || ' ' || status", persisted=True),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_containers_search_text_trgm',
+        'containers',
+        ['search_text'],
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_containers_search_text_trgm', table_name='containers')
+    op.drop_column('containers', 'search_text')
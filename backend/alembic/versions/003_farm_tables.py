@@ -0,0 +1,178 @@
+"""Farm inventory and metric tables
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-01-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('panels',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('rfid_tag', sa.String(), nullable=True),
+    sa.Column('utilization_percentage', sa.Integer(), nullable=True),
+    sa.Column('crop_count', sa.Integer(), nullable=True),
+    sa.Column('is_empty', sa.Boolean(), nullable=True),
+    sa.Column('provisioned_at', sa.DateTime(), nullable=True),
+    sa.Column('container_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['container_id'], ['containers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('trays',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('rfid_tag', sa.String(), nullable=True),
+    sa.Column('utilization_percentage', sa.Integer(), nullable=True),
+    sa.Column('crop_count', sa.Integer(), nullable=True),
+    sa.Column('is_empty', sa.Boolean(), nullable=True),
+    sa.Column('provisioned_at', sa.DateTime(), nullable=True),
+    sa.Column('container_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['container_id'], ['containers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('panel_locations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('wall', sa.String(), nullable=False),
+    sa.Column('slot_number', sa.Integer(), nullable=False),
+    sa.Column('panel_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['panel_id'], ['panels.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('tray_locations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('shelf', sa.String(), nullable=False),
+    sa.Column('slot_number', sa.Integer(), nullable=False),
+    sa.Column('tray_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['tray_id'], ['trays.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('crop_locations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('tray_id', sa.String(), nullable=True),
+    sa.Column('panel_id', sa.String(), nullable=True),
+    sa.Column('row', sa.Integer(), nullable=True),
+    sa.Column('column', sa.Integer(), nullable=True),
+    sa.Column('channel', sa.Integer(), nullable=True),
+    sa.Column('position', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['panel_id'], ['panels.id'], ),
+    sa.ForeignKeyConstraint(['tray_id'], ['trays.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('crops',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('container_id', sa.String(), nullable=False),
+    sa.Column('seed_type', sa.String(), nullable=False),
+    sa.Column('seed_date', sa.DateTime(), nullable=True),
+    sa.Column('transplanting_date_planned', sa.DateTime(), nullable=True),
+    sa.Column('harvesting_date_planned', sa.DateTime(), nullable=True),
+    sa.Column('transplanted_date', sa.DateTime(), nullable=True),
+    sa.Column('harvesting_date', sa.DateTime(), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('overdue_days', sa.Integer(), nullable=True),
+    sa.Column('location_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['container_id'], ['containers.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['crop_locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('crop_metrics',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('crop_id', sa.String(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.Column('height_cm', sa.Float(), nullable=True),
+    sa.Column('leaf_count', sa.Integer(), nullable=True),
+    sa.Column('stem_diameter_mm', sa.Float(), nullable=True),
+    sa.Column('leaf_area_cm2', sa.Float(), nullable=True),
+    sa.Column('biomass_g', sa.Float(), nullable=True),
+    sa.Column('health_score', sa.Float(), nullable=True),
+    sa.Column('disease_detected', sa.Boolean(), nullable=True),
+    sa.Column('pest_detected', sa.Boolean(), nullable=True),
+    sa.Column('stress_level', sa.Float(), nullable=True),
+    sa.Column('temperature_c', sa.Float(), nullable=True),
+    sa.Column('humidity_percent', sa.Float(), nullable=True),
+    sa.Column('light_intensity_umol', sa.Float(), nullable=True),
+    sa.Column('ph_level', sa.Float(), nullable=True),
+    sa.Column('ec_level', sa.Float(), nullable=True),
+    sa.Column('nitrogen_ppm', sa.Float(), nullable=True),
+    sa.Column('phosphorus_ppm', sa.Float(), nullable=True),
+    sa.Column('potassium_ppm', sa.Float(), nullable=True),
+    sa.Column('calcium_ppm', sa.Float(), nullable=True),
+    sa.Column('magnesium_ppm', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['crop_id'], ['crops.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('crop_statistics',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('crop_id', sa.String(), nullable=False),
+    sa.Column('avg_daily_growth_rate', sa.Float(), nullable=True),
+    sa.Column('max_recorded_height', sa.Float(), nullable=True),
+    sa.Column('total_leaf_count', sa.Integer(), nullable=True),
+    sa.Column('growth_stage', sa.String(), nullable=True),
+    sa.Column('predicted_yield_g', sa.Float(), nullable=True),
+    sa.Column('predicted_harvest_date', sa.DateTime(), nullable=True),
+    sa.Column('yield_quality_score', sa.Float(), nullable=True),
+    sa.Column('survival_rate', sa.Float(), nullable=True),
+    sa.Column('resource_efficiency', sa.Float(), nullable=True),
+    sa.Column('time_to_harvest_days', sa.Integer(), nullable=True),
+    sa.Column('temperature_tolerance', sa.Float(), nullable=True),
+    sa.Column('humidity_tolerance', sa.Float(), nullable=True),
+    sa.Column('light_efficiency', sa.Float(), nullable=True),
+    sa.Column('disease_resistance', sa.Float(), nullable=True),
+    sa.Column('pest_resistance', sa.Float(), nullable=True),
+    sa.Column('overall_health_trend', sa.String(), nullable=True),
+    sa.Column('variety', sa.String(), nullable=True),
+    sa.Column('genetic_traits', sa.JSON(), nullable=True),
+    sa.Column('cultivation_method', sa.String(), nullable=True),
+    sa.Column('fertilizer_program', sa.String(), nullable=True),
+    sa.Column('irrigation_schedule', sa.String(), nullable=True),
+    sa.Column('nutritional_content', sa.JSON(), nullable=True),
+    sa.Column('taste_profile', sa.JSON(), nullable=True),
+    sa.Column('appearance_score', sa.Float(), nullable=True),
+    sa.Column('shelf_life_days', sa.Integer(), nullable=True),
+    sa.Column('cultivation_notes', sa.Text(), nullable=True),
+    sa.Column('harvest_notes', sa.Text(), nullable=True),
+    sa.Column('special_observations', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['crop_id'], ['crops.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('inventory_metrics',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('container_id', sa.String(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('nursery_station_utilization', sa.Integer(), nullable=True),
+    sa.Column('cultivation_area_utilization', sa.Integer(), nullable=True),
+    sa.Column('air_temperature', sa.Float(), nullable=True),
+    sa.Column('humidity', sa.Integer(), nullable=True),
+    sa.Column('co2_level', sa.Integer(), nullable=True),
+    sa.Column('yield_kg', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['container_id'], ['containers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('inventory_metrics')
+    op.drop_table('crop_statistics')
+    op.drop_table('crop_metrics')
+    op.drop_table('crops')
+    op.drop_table('crop_locations')
+    op.drop_table('tray_locations')
+    op.drop_table('panel_locations')
+    op.drop_table('trays')
+    op.drop_table('panels')
@@ -0,0 +1,80 @@
+"""Daily and weekly metric rollups
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-02-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('inventory_metric_rollups',
+    sa.Column('container_id', sa.String(), nullable=False),
+    sa.Column('granularity', sa.String(), nullable=False),
+    sa.Column('bucket_start', sa.Date(), nullable=False),
+    sa.Column('air_temperature_min', sa.Float(), nullable=True),
+    sa.Column('air_temperature_max', sa.Float(), nullable=True),
+    sa.Column('air_temperature_sum', sa.Float(), nullable=True),
+    sa.Column('air_temperature_count', sa.Integer(), nullable=False),
+    sa.Column('humidity_min', sa.Float(), nullable=True),
+    sa.Column('humidity_max', sa.Float(), nullable=True),
+    sa.Column('humidity_sum', sa.Float(), nullable=True),
+    sa.Column('humidity_count', sa.Integer(), nullable=False),
+    sa.Column('co2_level_min', sa.Float(), nullable=True),
+    sa.Column('co2_level_max', sa.Float(), nullable=True),
+    sa.Column('co2_level_sum', sa.Float(), nullable=True),
+    sa.Column('co2_level_count', sa.Integer(), nullable=False),
+    sa.Column('yield_kg_min', sa.Float(), nullable=True),
+    sa.Column('yield_kg_max', sa.Float(), nullable=True),
+    sa.Column('yield_kg_sum', sa.Float(), nullable=True),
+    sa.Column('yield_kg_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['container_id'], ['containers.id'], ),
+    sa.PrimaryKeyConstraint('container_id', 'granularity', 'bucket_start')
+    )
+
+    op.create_table('crop_metric_rollups',
+    sa.Column('crop_id', sa.String(), nullable=False),
+    sa.Column('granularity', sa.String(), nullable=False),
+    sa.Column('bucket_start', sa.Date(), nullable=False),
+    sa.Column('height_cm_min', sa.Float(), nullable=True),
+    sa.Column('height_cm_max', sa.Float(), nullable=True),
+    sa.Column('height_cm_sum', sa.Float(), nullable=True),
+    sa.Column('height_cm_count', sa.Integer(), nullable=False),
+    sa.Column('biomass_g_min', sa.Float(), nullable=True),
+    sa.Column('biomass_g_max', sa.Float(), nullable=True),
+    sa.Column('biomass_g_sum', sa.Float(), nullable=True),
+    sa.Column('biomass_g_count', sa.Integer(), nullable=False),
+    sa.Column('health_score_min', sa.Float(), nullable=True),
+    sa.Column('health_score_max', sa.Float(), nullable=True),
+    sa.Column('health_score_sum', sa.Float(), nullable=True),
+    sa.Column('health_score_count', sa.Integer(), nullable=False),
+    sa.Column('temperature_c_min', sa.Float(), nullable=True),
+    sa.Column('temperature_c_max', sa.Float(), nullable=True),
+    sa.Column('temperature_c_sum', sa.Float(), nullable=True),
+    sa.Column('temperature_c_count', sa.Integer(), nullable=False),
+    sa.Column('humidity_percent_min', sa.Float(), nullable=True),
+    sa.Column('humidity_percent_max', sa.Float(), nullable=True),
+    sa.Column('humidity_percent_sum', sa.Float(), nullable=True),
+    sa.Column('humidity_percent_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['crop_id'], ['crops.id'], ),
+    sa.PrimaryKeyConstraint('crop_id', 'granularity', 'bucket_start')
+    )
+
+    op.create_table('rollup_watermarks',
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('source')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_watermarks')
+    op.drop_table('crop_metric_rollups')
+    op.drop_table('inventory_metric_rollups')
@@ -0,0 +1,58 @@
+"""Tenants table with container counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-02-10 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('tenants',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('container_count', sa.Integer(), nullable=False),
+    sa.Column('physical_count', sa.Integer(), nullable=False),
+    sa.Column('virtual_count', sa.Integer(), nullable=False),
+    sa.Column('created_count', sa.Integer(), nullable=False),
+    sa.Column('active_count', sa.Integer(), nullable=False),
+    sa.Column('maintenance_count', sa.Integer(), nullable=False),
+    sa.Column('inactive_count', sa.Integer(), nullable=False),
+    sa.Column('alert_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+
+    op.execute("""
+        INSERT INTO tenants (
+            id, name, container_count, physical_count, virtual_count,
+            created_count, active_count, maintenance_count, inactive_count, alert_count
+        )
+        SELECT
+            gen_random_uuid()::text,
+            tenant,
+            count(*),
+            count(*) FILTER (WHERE type = 'physical'),
+            count(*) FILTER (WHERE type = 'virtual'),
+            count(*) FILTER (WHERE status = 'created'),
+            count(*) FILTER (WHERE status = 'active'),
+            count(*) FILTER (WHERE status = 'maintenance'),
+            count(*) FILTER (WHERE status = 'inactive'),
+            count(*) FILTER (WHERE has_alert)
+        FROM containers
+        GROUP BY tenant
+    """)
+
+    op.create_index('ix_containers_tenant', 'containers', ['tenant'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_containers_tenant', table_name='containers')
+    op.drop_table('tenants')
@@ -0,0 +1,62 @@
+"""Composite indexes for container filters and foreign keys
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-02-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# Every container list filter is an equality followed by ORDER BY modified DESC, id DESC,
+# so each index ends in the sort key and serves both the filter and the LIMIT.
+CONTAINER_ORDER = [sa.text('modified DESC'), sa.text('id DESC')]
+
+CONTAINER_INDEXES = [
+    ('ix_containers_modified_id', []),
+    ('ix_containers_type_modified', ['type']),
+    ('ix_containers_tenant_modified', ['tenant']),
+    ('ix_containers_purpose_modified', ['purpose']),
+    ('ix_containers_status_modified', ['status']),
+]
+
+FOREIGN_KEY_INDEXES = [
+    ('ix_crops_container_id', 'crops', ['container_id']),
+    ('ix_trays_container_id', 'trays', ['container_id']),
+    ('ix_panels_container_id', 'panels', ['container_id']),
+    ('ix_inventory_metrics_container_date', 'inventory_metrics', ['container_id', 'date']),
+    ('ix_crop_metrics_crop_recorded_at', 'crop_metrics', ['crop_id', 'recorded_at']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build, but cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in CONTAINER_INDEXES:
+            op.create_index(name, 'containers', columns + CONTAINER_ORDER, postgresql_concurrently=True)
+        op.create_index(
+            'ix_containers_alert_modified',
+            'containers',
+            CONTAINER_ORDER,
+            postgresql_where=sa.text('has_alert'),
+            postgresql_concurrently=True
+        )
+        for name, table, columns in FOREIGN_KEY_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        # The (tenant, modified, id) index answers everything the single-column one did
+        op.drop_index('ix_containers_tenant', table_name='containers', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_containers_tenant', 'containers', ['tenant'], postgresql_concurrently=True)
+        for name, table, _ in FOREIGN_KEY_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        op.drop_index('ix_containers_alert_modified', table_name='containers', postgresql_concurrently=True)
+        for name, _ in CONTAINER_INDEXES:
+            op.drop_index(name, table_name='containers', postgresql_concurrently=True)
@@ -0,0 +1,84 @@
+"""Partition crop_metrics and inventory_metrics by month
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-02-24 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# Months created past the newest existing row; app.jobs.partitions keeps extending this
+PREMAKE_MONTHS = 3
+
+# table, partition column, foreign key column, referenced table, index name
+PARTITIONED_TABLES = [
+    ('crop_metrics', 'recorded_at', 'crop_id', 'crops', 'ix_crop_metrics_crop_recorded_at'),
+    ('inventory_metrics', 'date', 'container_id', 'containers', 'ix_inventory_metrics_container_date'),
+]
+
+
+def _rebuild(table, column, fk_column, fk_table, index, partitioned):
+    old = f'{table}_old'
+    op.drop_index(index, table_name=table)
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+
+    # LIKE keeps the column order, NOT NULLs and the id sequence default, so rows copy over with SELECT *
+    if partitioned:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE ({column})')
+        # Unique constraints on a partitioned table must include the partition key
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {column})')
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+    op.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_{fk_column}_fkey '
+        f'FOREIGN KEY ({fk_column}) REFERENCES {fk_table} (id)'
+    )
+    op.create_index(index, table, [fk_column, column])
+
+    if partitioned:
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month_start date;
+                last_month date;
+            BEGIN
+                SELECT
+                    date_trunc('month', coalesce(min({column}), now()))::date,
+                    (date_trunc('month', greatest(max({column}), now())) + interval '{PREMAKE_MONTHS} months')::date
+                INTO month_start, last_month
+                FROM {old};
+                WHILE month_start <= last_month LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_p' || to_char(month_start, 'YYYYMM'),
+                        month_start,
+                        (month_start + interval '1 month')::date
+                    );
+                    month_start := (month_start + interval '1 month')::date;
+                END LOOP;
+            END $$
+        """)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    # The sequence is owned by the old id column and would be dropped with it
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {old}')
+
+
+def upgrade() -> None:
+    for table, column, fk_column, fk_table, index in PARTITIONED_TABLES:
+        _rebuild(table, column, fk_column, fk_table, index, partitioned=True)
+
+
+def downgrade() -> None:
+    # Dropping the partitioned parent drops its partitions with it
+    for table, column, fk_column, fk_table, index in PARTITIONED_TABLES:
+        _rebuild(table, column, fk_column, fk_table, index, partitioned=False)
@@ -0,0 +1,26 @@
+"""One crop_statistics row per crop
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-03-03 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the newest row for any crop that somehow has several
+    op.execute("""
+        DELETE FROM crop_statistics
+        WHERE id NOT IN (SELECT max(id) FROM crop_statistics GROUP BY crop_id)
+    """)
+    op.create_unique_constraint('uq_crop_statistics_crop_id', 'crop_statistics', ['crop_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_crop_statistics_crop_id', 'crop_statistics', type_='unique')
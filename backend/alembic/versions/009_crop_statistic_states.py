@@ -0,0 +1,51 @@
+"""Incremental crop statistic state
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-03-10 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('crop_statistic_states',
+    sa.Column('crop_id', sa.String(), nullable=False),
+    sa.Column('origin_days', sa.Float(), nullable=False),
+    sa.Column('high_water_mark', sa.Float(), nullable=False),
+    sa.Column('rows', sa.Float(), nullable=False),
+    sa.Column('height_cm_n', sa.Float(), nullable=False),
+    sa.Column('height_cm_t', sa.Float(), nullable=False),
+    sa.Column('height_cm_tt', sa.Float(), nullable=False),
+    sa.Column('height_cm_y', sa.Float(), nullable=False),
+    sa.Column('height_cm_ty', sa.Float(), nullable=False),
+    sa.Column('biomass_g_n', sa.Float(), nullable=False),
+    sa.Column('biomass_g_t', sa.Float(), nullable=False),
+    sa.Column('biomass_g_tt', sa.Float(), nullable=False),
+    sa.Column('biomass_g_y', sa.Float(), nullable=False),
+    sa.Column('biomass_g_ty', sa.Float(), nullable=False),
+    sa.Column('health_score_n', sa.Float(), nullable=False),
+    sa.Column('health_score_t', sa.Float(), nullable=False),
+    sa.Column('health_score_tt', sa.Float(), nullable=False),
+    sa.Column('health_score_y', sa.Float(), nullable=False),
+    sa.Column('health_score_ty', sa.Float(), nullable=False),
+    sa.Column('disease_detected_count', sa.Float(), nullable=False),
+    sa.Column('pest_detected_count', sa.Float(), nullable=False),
+    sa.Column('height_cm_max', sa.Float(), nullable=True),
+    sa.Column('biomass_g_max', sa.Float(), nullable=True),
+    sa.Column('leaf_count_max', sa.Float(), nullable=True),
+    sa.Column('last_t', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['crop_id'], ['crops.id'], ),
+    sa.PrimaryKeyConstraint('crop_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('crop_statistic_states')
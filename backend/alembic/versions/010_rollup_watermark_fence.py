@@ -0,0 +1,25 @@
+"""Rollup watermark fence
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-03-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('rollup_watermarks', sa.Column('fence_id', sa.Integer(), nullable=True))
+    op.add_column('rollup_watermarks', sa.Column('fence_xids', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('rollup_watermarks', 'fence_xids')
+    op.drop_column('rollup_watermarks', 'fence_id')
@@ -0,0 +1,38 @@
+"""Container modified not null
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-03-24 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cursor pages order and compare on (modified, id); a NULL modified cannot be encoded
+    # in a cursor and drops out of the keyset comparison
+    op.execute(
+        "UPDATE containers SET modified = coalesce(created, timezone('utc', now())) "
+        "WHERE modified IS NULL"
+    )
+    op.alter_column(
+        'containers', 'modified',
+        existing_type=sa.DateTime(),
+        nullable=False,
+        server_default=sa.text("timezone('utc', now())")
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'containers', 'modified',
+        existing_type=sa.DateTime(),
+        nullable=True,
+        server_default=None
+    )
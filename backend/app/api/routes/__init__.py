@@ -1,3 +1,3 @@
-from . import containers, tenants
+from . import containers, crops, internal, metrics, tenants
 
-__all__ = ["containers", "tenants"]
+__all__ = ["containers", "crops", "internal", "metrics", "tenants"]
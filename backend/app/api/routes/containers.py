@@ -1,14 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.core.db import get_async_db
-from app.schemas.container import ContainerCreate, ContainerUpdate, ContainerResponse, ContainerListResponse
+from datetime import date, datetime, timedelta
+from app.core.config import settings
+from app.core.db import get_async_db, get_async_read_db, open_read_session
+from app.core.events import event_stream, get_event_bus
+from app.core.conditional import PreconditionFailedError, conditional_json_response, parse_http_date
+from app.core.pagination import InvalidCursorError
+from app.schemas.container import (
+    ContainerCreate, ContainerUpdate, ContainerResponse, ContainerListResponse,
+    ContainerBatchUpdate, ContainerBatchDelete, ContainerBatchResponse
+)
+from app.schemas.metric import MetricSeriesResponse
 from app.services.container_service import ContainerService
+from app.services.export_encoders import EXPORT_EXTENSIONS, EXPORT_MEDIA_TYPES
+from app.services.export_service import ExportService, closing_session
+from app.services.metric_rollup_service import MetricRollupService
 
 router = APIRouter()
 
 @router.get("/", response_model=ContainerListResponse)
 async def get_containers(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
@@ -17,34 +31,150 @@ async def get_containers(
     purpose_filter: Optional[str] = Query(None),
     status_filter: Optional[str] = Query(None),
     has_alerts: Optional[bool] = Query(None),
-    db: AsyncSession = Depends(get_async_db)
+    cursor: Optional[str] = Query(None),
+    total_mode: str = Query("exact", pattern="^(exact|estimate|none)$"),
+    facets: bool = Query(False),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     service = ContainerService(db)
-    return await service.get_containers_with_filters(
-        skip=skip, limit=limit, search=search,
-        type_filter=type_filter, tenant_filter=tenant_filter,
-        purpose_filter=purpose_filter, status_filter=status_filter,
-        has_alerts=has_alerts
+    try:
+        # Returning a Response skips FastAPI's response_model re-validation;
+        # the model is still declared for the OpenAPI schema
+        content, last_modified = await service.get_containers_json(
+            skip=skip, limit=limit, search=search,
+            type_filter=type_filter, tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter, status_filter=status_filter,
+            has_alerts=has_alerts, cursor=cursor, total_mode=total_mode,
+            facets=facets
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return conditional_json_response(request, content, last_modified)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_containers(
+    request: Request,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|arrow)$"),
+    search: Optional[str] = Query(None),
+    type_filter: Optional[str] = Query(None),
+    tenant_filter: Optional[str] = Query(None),
+    purpose_filter: Optional[str] = Query(None),
+    status_filter: Optional[str] = Query(None),
+    has_alerts: Optional[bool] = Query(None)
+):
+    # Every matching container in one streamed response, read through a server-side cursor
+    session = open_read_session(request)
+    try:
+        body = ExportService(session).export_containers(
+            export_format, search=search,
+            type_filter=type_filter, tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter, status_filter=status_filter,
+            has_alerts=has_alerts
+        )
+    except RuntimeError as e:
+        await session.close()
+        raise HTTPException(status_code=501, detail=str(e))
+    return StreamingResponse(
+        closing_session(body, session),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="containers.{EXPORT_EXTENSIONS[export_format]}"'}
+    )
+
+@router.get("/events", response_class=StreamingResponse)
+async def container_events(
+    tenant: Optional[str] = Query(None),
+    container_id: Optional[List[str]] = Query(None)
+):
+    # Status and alert changes pushed as they are written, in place of polling the list
+    events = get_event_bus()
+    if not events.enabled:
+        raise HTTPException(status_code=503, detail="Container events are disabled")
+    return StreamingResponse(
+        event_stream(events.broker, tenant, container_id, settings.EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @router.get("/performance", response_model=dict)
 async def get_performance_metrics(
     type_filter: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    service = ContainerService(db)
+    try:
+        return await service.get_performance_metrics(
+            type_filter=type_filter, start_date=start_date,
+            end_date=end_date, bucket=bucket
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Batch routes are registered before the /{container_id} routes so "batch" is not taken for an id.
+# Each batch runs in one transaction; items that fail are reported individually.
+@router.post("/batch", response_model=ContainerBatchResponse)
+async def create_containers(
+    items: List[ContainerCreate],
     db: AsyncSession = Depends(get_async_db)
 ):
     service = ContainerService(db)
-    return await service.get_performance_metrics(type_filter=type_filter)
+    try:
+        return await service.create_containers(items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/batch", response_model=ContainerBatchResponse)
+async def update_containers(
+    items: List[ContainerBatchUpdate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = ContainerService(db)
+    try:
+        return await service.update_containers(items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/batch/delete", response_model=ContainerBatchResponse)
+async def delete_containers(
+    batch: ContainerBatchDelete,
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = ContainerService(db)
+    try:
+        return await service.delete_containers(batch.ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{container_id}/metrics", response_model=MetricSeriesResponse)
+async def get_container_metrics(
+    container_id: str,
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    resolution: str = Query("day", pattern="^(day|week|month)$"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=29)
+    service = MetricRollupService(db)
+    try:
+        return await service.get_inventory_series(container_id, start_date, end_date, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{container_id}", response_model=ContainerResponse)
 async def get_container(
+    request: Request,
     container_id: str,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     service = ContainerService(db)
-    container = await service.get_container_by_id(container_id)
-    if not container:
+    cached = await service.get_container_json(container_id)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Container not found")
-    return container
+    content, last_modified = cached
+    return conditional_json_response(request, content, last_modified)
 
 @router.post("/", response_model=ContainerResponse)
 async def create_container(
@@ -61,10 +191,16 @@ async def create_container(
 async def update_container(
     container_id: str,
     container_data: ContainerUpdate,
+    if_unmodified_since: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_async_db)
 ):
     service = ContainerService(db)
-    container = await service.update_container(container_id, container_data)
+    try:
+        container = await service.update_container(
+            container_id, container_data, unmodified_since=parse_http_date(if_unmodified_since)
+        )
+    except PreconditionFailedError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     if not container:
         raise HTTPException(status_code=404, detail="Container not found")
     return container
@@ -75,7 +211,10 @@ async def delete_container(
     db: AsyncSession = Depends(get_async_db)
 ):
     service = ContainerService(db)
-    success = await service.delete_container(container_id)
+    try:
+        success = await service.delete_container(container_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not success:
         raise HTTPException(status_code=404, detail="Container not found")
     return {"message": "Container deleted successfully"}
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import date, datetime, timedelta
+from app.core.db import get_async_read_db
+from app.schemas.metric import MetricSeriesResponse
+from app.services.metric_rollup_service import MetricRollupService
+
+router = APIRouter()
+
+@router.get("/{crop_id}/metrics", response_model=MetricSeriesResponse)
+async def get_crop_metrics(
+    crop_id: str,
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    resolution: str = Query("day", pattern="^(day|week|month)$"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=29)
+    service = MetricRollupService(db)
+    try:
+        return await service.get_crop_series(crop_id, start_date, end_date, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,45 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from app.core.cache import get_response_cache
+from app.core.config import settings
+from app.core.db import async_engine, replica_engine
+from app.core.pool import pool_snapshot
+from app.core.profiling import get_profile_store
+
+async def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    # Without a configured token the internal endpoints do not exist
+    if settings.INTERNAL_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = (x_internal_token or "").encode("utf-8")
+    if not secrets.compare_digest(token, settings.INTERNAL_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Invalid internal token")
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/cache")
+async def get_cache_stats():
+    return get_response_cache().snapshot()
+
+@router.get("/pool")
+async def get_pool_stats():
+    snapshot = pool_snapshot(async_engine.pool)
+    if replica_engine is not None:
+        snapshot["replica"] = pool_snapshot(replica_engine.pool)
+    return snapshot
+
+@router.get("/profiles")
+async def get_profiles():
+    return get_profile_store().list()
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    report = get_profile_store().get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return report
+
+@router.delete("/profiles")
+async def clear_profiles():
+    get_profile_store().clear()
+    return {"message": "Profiles cleared"}
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import date
+from app.core.config import settings
+from app.core.db import get_async_db, open_read_session
+from app.schemas.metric import IngestResponse
+from app.services.export_encoders import EXPORT_EXTENSIONS, EXPORT_MEDIA_TYPES
+from app.services.export_service import ExportService, closing_session
+from app.services.metric_ingest_service import (
+    MetricIngestService, IngestBusyError, IngestTooLargeError, iter_items, iter_ndjson, read_json_array
+)
+
+router = APIRouter()
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+async def _ingest(kind: str, request: Request, db: AsyncSession) -> IngestResponse:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        items = iter_ndjson(request.stream())
+    else:
+        try:
+            payload = await read_json_array(request.stream(), settings.INGEST_MAX_JSON_BYTES)
+        except IngestTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+        items = iter_items(payload)
+
+    service = MetricIngestService(db)
+    try:
+        return await service.ingest(kind, items)
+    except IngestBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+@router.post("/crop", response_model=IngestResponse)
+async def ingest_crop_metrics(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _ingest("crop", request, db)
+
+@router.post("/inventory", response_model=IngestResponse)
+async def ingest_inventory_metrics(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _ingest("inventory", request, db)
+
+@router.get("/crop/export", response_class=StreamingResponse)
+async def export_crop_metrics(
+    request: Request,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|arrow)$"),
+    crop_id: Optional[str] = Query(None),
+    container_id: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None)
+):
+    # Raw readings, streamed through a server-side cursor; bound the dates to prune partitions
+    session = open_read_session(request)
+    try:
+        body = ExportService(session).export_crop_metrics(
+            export_format, crop_id=crop_id, container_id=container_id,
+            start_date=start_date, end_date=end_date
+        )
+    except ValueError as e:
+        await session.close()
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        await session.close()
+        raise HTTPException(status_code=501, detail=str(e))
+    return StreamingResponse(
+        closing_session(body, session),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="crop_metrics.{EXPORT_EXTENSIONS[export_format]}"'}
+    )
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.core.db import get_async_db
-from app.schemas.tenant import TenantResponse
+from app.core.db import get_async_read_db
+from app.schemas.tenant import TenantResponse, TenantSummaryResponse
 from app.services.tenant_service import TenantService
 
 router = APIRouter()
 
 @router.get("/", response_model=List[TenantResponse])
-async def get_tenants(db: AsyncSession = Depends(get_async_db)):
+async def get_tenants(db: AsyncSession = Depends(get_async_read_db)):
     service = TenantService(db)
-    return await service.get_all_tenants()
+    return Response(content=await service.get_all_tenants_json(), media_type="application/json")
+
+@router.get("/summary", response_model=List[TenantSummaryResponse])
+async def get_tenant_summaries(db: AsyncSession = Depends(get_async_read_db)):
+    service = TenantService(db)
+    return await service.get_tenant_summaries()
@@ -0,0 +1,211 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+
+# Entries remember the version of every tag they were built under. Invalidating a tag
+# bumps its version, so entries built before the bump are stale on the next read,
+# including ones written by a request that raced with the invalidation. The memory
+# backend's versions live in one process, so only the redis backend carries an
+# invalidation to other workers.
+
+TagVersions = Dict[str, int]
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.sets = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "sets": self.sets,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes, TagVersions]]" = OrderedDict()
+        self._tag_versions: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Tuple[bytes, TagVersions]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, versions = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value, versions
+
+    async def set(self, key: str, value: bytes, versions: TagVersions, ttl_seconds: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + (ttl_seconds or self.ttl_seconds)
+        self._entries[key] = (expires_at, value, versions)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def tag_versions(self, tags: Iterable[str]) -> TagVersions:
+        return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    async def bump_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tag_versions.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "vf:cache:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        self.client = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Tuple[bytes, TagVersions]]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        header, _, value = raw.partition(b"\n")
+        return value, json.loads(header)
+
+    async def set(self, key: str, value: bytes, versions: TagVersions, ttl_seconds: Optional[int] = None) -> None:
+        payload = json.dumps(versions).encode() + b"\n" + value
+        await self.client.set(self.prefix + key, payload, ex=ttl_seconds or self.ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def tag_versions(self, tags: Iterable[str]) -> TagVersions:
+        tags = list(tags)
+        if not tags:
+            return {}
+        values = await self.client.mget([self._tag_key(tag) for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    async def bump_tags(self, tags: Iterable[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self._tag_key(tag))
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self.backend is None:
+            return None
+        entry = await self.backend.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        value, versions = entry
+        if await self.backend.tag_versions(versions) != versions:
+            self.stats.stale += 1
+            self.stats.misses += 1
+            await self.backend.delete(key)
+            return None
+        self.stats.hits += 1
+        return value
+
+    async def get_or_load(
+        self, key: str, tags: List[str], loader: Callable[[], Awaitable[Optional[bytes]]], refresh: bool = False
+    ) -> Optional[bytes]:
+        # refresh skips the lookup and replaces the entry with a fresh load
+        cached = None if refresh else await self.get(key)
+        if cached is not None:
+            return cached
+        if self.backend is None:
+            return await loader()
+        # Read tag versions before loading so a concurrent invalidation makes this entry stale
+        versions = await self.backend.tag_versions(tags)
+        value = await loader()
+        if value is not None:
+            await self.backend.set(key, value, versions)
+            self.stats.sets += 1
+        return value
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        if self.backend is None:
+            return
+        tags = set(tags)
+        await self.backend.bump_tags(tags)
+        self.stats.invalidations += len(tags)
+
+    def snapshot(self) -> Dict[str, object]:
+        data = {"backend": settings.CACHE_BACKEND, **self.stats.as_dict()}
+        if self.backend is not None:
+            data["entries"] = self.backend.size()
+        return data
+
+
+def container_tag(container_id: str) -> str:
+    return f"container:{container_id}"
+
+
+def tenant_tag(tenant: str) -> str:
+    return f"containers:tenant:{tenant}"
+
+
+ALL_CONTAINERS_TAG = "containers:all"
+TENANTS_TAG = "tenants"
+
+
+def container_change_tags(container_ids: Iterable[str], tenants: Iterable[str]) -> List[str]:
+    # Tags covering the detail and list pages of containers whose derived readings changed
+    tags = {ALL_CONTAINERS_TAG}
+    tags.update(container_tag(container_id) for container_id in container_ids)
+    tags.update(tenant_tag(tenant) for tenant in tenants)
+    return sorted(tags)
+
+
+def _build_backend():
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL, settings.CACHE_TTL_SECONDS)
+    return None
+
+
+response_cache = ResponseCache(_build_backend())
+
+
+def get_response_cache() -> ResponseCache:
+    return response_cache
@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+from fastapi import Request, Response
+
+# The ETag is derived from the serialized body rather than Container.modified alone,
+# because trays, panels and the latest readings change without touching modified.
+# Last-Modified only follows modified, so it is the weaker validator and If-Modified-Since
+# is only consulted without an If-None-Match. With the response cache in front, either
+# is answered without touching the database or building a model.
+
+
+class PreconditionFailedError(Exception):
+    pass
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def last_modified_of(values: Iterable[Optional[datetime]]) -> Optional[str]:
+    timestamps = [value for value in values if value is not None]
+    if not timestamps:
+        return None
+    latest = max(timestamps).replace(tzinfo=timezone.utc)
+    return format_datetime(latest, usegmt=True)
+
+
+def with_last_modified(body: bytes, last_modified: Optional[str]) -> bytes:
+    # Cached bodies keep their Last-Modified on a first line, so a hit needs no parsing
+    return (last_modified or "").encode("latin-1") + b"\n" + body
+
+
+def split_last_modified(value: bytes) -> Tuple[bytes, Optional[str]]:
+    last_modified, _, body = value.partition(b"\n")
+    return body, last_modified.decode("latin-1") or None
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    # Naive UTC to compare with the stored timestamps; an invalid date is ignored as RFC 9110 requires
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def not_modified_since(request: Request, last_modified: Optional[str]) -> bool:
+    since = parse_http_date(request.headers.get("if-modified-since"))
+    if since is None or not last_modified:
+        return False
+    return parse_http_date(last_modified) <= since
+
+
+def conditional_json_response(request: Request, body: bytes, last_modified: Optional[str] = None) -> Response:
+    etag = compute_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    else:
+        not_modified = not_modified_since(request, last_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -54,6 +54,63 @@ class Settings(BaseSettings):
         dsn = f"postgresql+asyncpg://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}:5432/{values.get('POSTGRES_DB')}"
         return dsn
 
+    # Read-only endpoints use the replica when set; without one every read goes to the primary
+    ASYNC_SQLALCHEMY_REPLICA_URI: Optional[str] = None
+    REPLICA_STICKY_SECONDS: int = 5
+    REPLICA_STICKY_COOKIE: str = "vf_primary_until"
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Shared secret for the /internal endpoints (sent as X-Internal-Token) and for profiling
+    # on demand (sent as the value of PROFILING_HEADER). Unset, both are switched off.
+    INTERNAL_TOKEN: Optional[str] = None
+
+    # Request profiling: on demand via the header, for a random fraction of requests, or for
+    # every request with the report kept only above the slow threshold (costs a stack sample
+    # of the event loop thread every PROFILING_INTERVAL_SECONDS while requests are running)
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_SLOW_SECONDS: Optional[float] = None
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_MAX_REPORTS: int = 50
+
+    CONTAINER_SEARCH_BACKEND: str = "trigram"
+    CONTAINER_BATCH_MAX_ITEMS: int = 500
+    EXPORT_CHUNK_SIZE: int = 2000
+
+    # Response cache for container and tenant reads. "memory" is per process: writes and
+    # ingest only invalidate entries in their own process, so deployments with several
+    # workers need "redis" to see invalidations everywhere
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL_SECONDS: int = 30
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_REDIS_URL: Optional[str] = None
+
+    # Container change events for GET /containers/events: "memory" only reaches clients of
+    # the worker that made the change, "postgres" fans out to every worker over LISTEN/NOTIFY
+    EVENTS_BACKEND: str = "memory"
+    EVENTS_CHANNEL: str = "container_events"
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    INGEST_BATCH_SIZE: int = 1000
+    INGEST_MAX_ROWS: int = 100_000
+    # Row errors listed in an ingest response; the rest are only counted
+    INGEST_MAX_ERRORS: int = 1000
+    # A JSON array body is parsed as a whole, so it is capped; NDJSON is streamed and is not
+    INGEST_MAX_JSON_BYTES: int = 10 * 1024 * 1024
+    INGEST_MAX_CONCURRENCY: int = 4
+    INGEST_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    INGEST_USE_COPY: bool = True
+
+    METRIC_PARTITION_PREMAKE_MONTHS: int = 3
+    CROP_METRICS_RETENTION_MONTHS: Optional[int] = None
+    INVENTORY_METRICS_RETENTION_MONTHS: Optional[int] = None
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -1,21 +1,83 @@
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from fastapi import Request
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.pool import InstrumentedAsyncPool, register_pool_metrics
+from app.core.profiling import profile_statements
+from app.core.replica import READ_YOUR_WRITES, is_pinned_to_primary
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-async_engine = create_async_engine(settings.ASYNC_SQLALCHEMY_DATABASE_URI)
+def pool_options(uri: str, poolclass=None) -> dict:
+    # SQLite stand-ins keep the dialect's own pool; sizing only applies to server databases
+    if make_url(uri).get_backend_name() == "sqlite":
+        return {}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if poolclass is not None:
+        options["poolclass"] = poolclass
+    return options
+
+
+async_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URI,
+    **pool_options(settings.ASYNC_SQLALCHEMY_DATABASE_URI, InstrumentedAsyncPool)
+)
 AsyncSessionLocal = sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+replica_engine = (
+    create_async_engine(
+        settings.ASYNC_SQLALCHEMY_REPLICA_URI,
+        **pool_options(settings.ASYNC_SQLALCHEMY_REPLICA_URI, InstrumentedAsyncPool)
+    )
+    if settings.ASYNC_SQLALCHEMY_REPLICA_URI else None
+)
+for name, engine in (("primary", async_engine), ("replica", replica_engine)):
+    if engine is not None:
+        instrument_engine(engine)
+        profile_statements(engine)
+        register_pool_metrics(name, engine)
+ReplicaSessionLocal = (
+    sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None else AsyncSessionLocal
+)
+
 Base = declarative_base()
 
+
+# The API only uses the async engine; the sync one is built on first use by scripts and tools
+@lru_cache(maxsize=None)
+def get_sync_engine():
+    return create_engine(settings.SQLALCHEMY_DATABASE_URI, **pool_options(settings.SQLALCHEMY_DATABASE_URI))
+
+
+@lru_cache(maxsize=None)
+def get_sync_sessionmaker():
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_sync_engine())
+
+
+def __getattr__(name: str):
+    # Lazy module attributes for existing `from app.core.db import engine` style imports
+    if name in ("engine", "sync_engine"):
+        return get_sync_engine()
+    if name == "SessionLocal":
+        return get_sync_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_db():
-    db = SessionLocal()
+    db = get_sync_sessionmaker()()
     try:
         yield db
     finally:
@@ -24,3 +86,15 @@ def get_db():
 async def get_async_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+def open_read_session(request: Request) -> AsyncSession:
+    # For read-only endpoints: the replica unless the client wrote recently
+    if replica_engine is not None and is_pinned_to_primary(request, settings.REPLICA_STICKY_COOKIE):
+        session = AsyncSessionLocal()
+        session.info[READ_YOUR_WRITES] = True
+        return session
+    return ReplicaSessionLocal()
+
+async def get_async_read_db(request: Request):
+    async with open_read_session(request) as session:
+        yield session
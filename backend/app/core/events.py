@@ -0,0 +1,278 @@
+import asyncio
+import json
+import asyncpg
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, registry
+
+# Container change events pushed to dashboards instead of polling the list endpoint.
+# Writers publish to a bus; every worker runs one EventBroker that fans events out to its
+# subscribers. The memory bus only reaches subscribers of the publishing worker, the
+# postgres bus carries events between workers over LISTEN/NOTIFY. Each subscriber has a
+# bounded queue: a consumer that falls behind loses its backlog and gets a RESYNC marker
+# telling it to refetch, so one slow tab never holds memory or blocks the others.
+
+EVENT_SUBSCRIBERS = registry.register(Gauge("event_subscribers", "Open container event subscriptions"))
+EVENTS_PUBLISHED = registry.register(Counter("events_published_total", "Container events published"))
+EVENTS_DROPPED = registry.register(
+    Counter("events_dropped_total", "Container events discarded because a subscriber fell behind")
+)
+EVENT_BUS_RECONNECTS = registry.register(
+    Counter("event_bus_reconnects_total", "Times the LISTEN connection had to be re-established")
+)
+
+RESYNC = {"type": "resync"}
+# NOTIFY payloads must stay below 8000 bytes
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+class Subscription:
+    def __init__(self, tenant: Optional[str], container_ids: Optional[Set[str]], queue_size: int):
+        self.tenant = tenant
+        self.container_ids = container_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.container_ids is not None and event.get("id") not in self.container_ids:
+            return False
+        # A container moving between tenants is reported to both
+        if self.tenant is not None and self.tenant not in (event.get("tenant"), event.get("previous_tenant")):
+            return False
+        return True
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            EVENTS_DROPPED.inc(self.queue.qsize())
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class EventBroker:
+    # Subscriptions are indexed by their most selective filter, so an event only visits
+    # the subscribers that can match it
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._by_container: Dict[str, Set[Subscription]] = {}
+        self._by_tenant: Dict[str, Set[Subscription]] = {}
+        self._unfiltered: Set[Subscription] = set()
+
+    def subscribe(self, tenant: Optional[str] = None, container_ids: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(tenant, set(container_ids) if container_ids else None, self.queue_size)
+        for bucket in self._buckets(subscription, create=True):
+            bucket.add(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for bucket in self._buckets(subscription, create=False):
+            bucket.discard(subscription)
+        for index in (self._by_container, self._by_tenant):
+            for key in [key for key, bucket in index.items() if not bucket]:
+                del index[key]
+        EVENT_SUBSCRIBERS.dec()
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        candidates = set(self._unfiltered)
+        candidates.update(self._by_container.get(event.get("id"), ()))
+        for tenant in {event.get("tenant"), event.get("previous_tenant")}:
+            candidates.update(self._by_tenant.get(tenant, ()))
+        for subscription in candidates:
+            if subscription.matches(event):
+                subscription.offer(event)
+
+    def resync(self) -> None:
+        # Events may have been missed, e.g. while the LISTEN connection was down
+        for subscription in self.subscriptions():
+            subscription.offer(RESYNC)
+
+    def subscriptions(self) -> Set[Subscription]:
+        subscriptions = set(self._unfiltered)
+        for index in (self._by_container, self._by_tenant):
+            for bucket in index.values():
+                subscriptions.update(bucket)
+        return subscriptions
+
+    def _buckets(self, subscription: Subscription, create: bool) -> List[Set[Subscription]]:
+        if subscription.container_ids is not None:
+            keys, index = subscription.container_ids, self._by_container
+        elif subscription.tenant is not None:
+            keys, index = [subscription.tenant], self._by_tenant
+        else:
+            return [self._unfiltered]
+        if create:
+            return [index.setdefault(key, set()) for key in keys]
+        return [index[key] for key in keys if key in index]
+
+
+class MemoryEventBus:
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            self.broker.dispatch(event)
+
+
+class PostgresEventBus:
+    def __init__(self, broker: EventBroker, url: str, channel: str):
+        self.broker = broker
+        # asyncpg is used directly: the listening connection stays open for the worker's
+        # lifetime and should not hold a slot in the SQLAlchemy pool
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def publish(self, events: List[Dict[str, Any]]) -> None:
+        connection = self._connection
+        if connection is None:
+            # Subscribers are told to resync once the connection is back
+            return
+        try:
+            async with self._lock:
+                for payload in self._payloads(events):
+                    await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+            # The write itself has committed; a lost event only costs the listeners a resync
+            pass
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            delay = 1.0
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(self.channel, self._on_notify)
+                self._connection = connection
+                self.broker.resync()
+                await closed.wait()
+                EVENT_BUS_RECONNECTS.inc()
+            finally:
+                self._connection = None
+                if not connection.is_closed():
+                    await connection.close()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        for event in json.loads(payload):
+            self.broker.dispatch(event)
+
+    @staticmethod
+    def _payloads(events: List[Dict[str, Any]]) -> Iterable[str]:
+        # Packs events into as few NOTIFYs as fit the payload limit
+        batch: List[str] = []
+        size = 2
+        for event in events:
+            encoded = json.dumps(event, separators=(",", ":"), default=str)
+            if batch and size + len(encoded) + 1 > MAX_NOTIFY_PAYLOAD:
+                yield "[" + ",".join(batch) + "]"
+                batch, size = [], 2
+            batch.append(encoded)
+            size += len(encoded) + 1
+        if batch:
+            yield "[" + ",".join(batch) + "]"
+
+
+class EventBus:
+    def __init__(self, backend):
+        self.backend = backend
+        self.broker = backend.broker if backend is not None else None
+
+    async def start(self) -> None:
+        if self.backend is not None:
+            await self.backend.start()
+
+    async def stop(self) -> None:
+        if self.backend is not None:
+            await self.backend.stop()
+
+    async def publish(self, events: List[Dict[str, Any]]) -> None:
+        if self.backend is None or not events:
+            return
+        EVENTS_PUBLISHED.inc(len(events))
+        await self.backend.publish(events)
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+
+def container_event(event_type: str, container: Any, previous_tenant: Optional[str] = None) -> Dict[str, Any]:
+    event = {
+        "type": event_type,
+        "id": container.id,
+        "tenant": container.tenant,
+        "status": container.status,
+        "has_alert": bool(container.has_alert),
+    }
+    if previous_tenant is not None and previous_tenant != container.tenant:
+        event["previous_tenant"] = previous_tenant
+    return event
+
+
+async def event_stream(broker: EventBroker, tenant: Optional[str], container_ids: Optional[List[str]], heartbeat: float):
+    # Server-sent events; the subscription lives exactly as long as the response body
+    subscription = broker.subscribe(tenant, container_ids)
+    try:
+        yield b": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection and surfaces dead clients
+                yield b": heartbeat\n\n"
+                continue
+            name = "resync" if event is RESYNC else "container"
+            data = json.dumps(event, separators=(",", ":"), default=str)
+            yield f"event: {name}\ndata: {data}\n\n".encode()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def _build_backend():
+    broker = EventBroker(settings.EVENTS_QUEUE_SIZE)
+    if settings.EVENTS_BACKEND == "memory":
+        return MemoryEventBus(broker)
+    if settings.EVENTS_BACKEND == "postgres":
+        return PostgresEventBus(broker, settings.ASYNC_SQLALCHEMY_DATABASE_URI, settings.EVENTS_CHANNEL)
+    return None
+
+
+event_bus = EventBus(_build_backend())
+
+
+def get_event_bus() -> EventBus:
+    return event_bus
@@ -0,0 +1,152 @@
+import asyncio
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from app.core.metrics import Counter, Family, Gauge, Histogram, registry
+
+# Request latency, SQL time per repository method, serialization time and event loop lag,
+# so a slow endpoint can be attributed to the database, to building the response or to a
+# blocked loop. Routes are labelled by their path template to keep the series bounded.
+
+HTTP_REQUEST_SECONDS = registry.register(
+    Family(Histogram, "http_request_duration_seconds", "Time to serve a request", ("method", "route", "status"))
+)
+HTTP_IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "Requests currently being served"))
+DB_STATEMENT_SECONDS = registry.register(
+    Family(Histogram, "db_statement_duration_seconds", "Time to execute a SQL statement", ("repository_method",))
+)
+DB_STATEMENT_ERRORS = registry.register(
+    Family(Counter, "db_statement_errors_total", "SQL statements that raised", ("repository_method",))
+)
+SERIALIZATION_SECONDS = registry.register(
+    Family(Histogram, "serialization_duration_seconds", "Time to build and encode responses", ("view", "phase"))
+)
+EVENT_LOOP_LAG_SECONDS = registry.register(
+    Histogram("event_loop_lag_seconds", "How late the event loop runs a scheduled callback")
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+UNATTRIBUTED = "<none>"
+EVENT_LOOP_PROBE_SECONDS = 0.5
+
+current_repository_method: ContextVar[str] = ContextVar("current_repository_method", default=UNATTRIBUTED)
+
+
+def instrument_repository(cls):
+    # Tags SQL issued by each public method with "Class.method"
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        label = f"{cls.__name__}.{name}"
+        if inspect.isasyncgenfunction(member):
+            setattr(cls, name, _tag_generator(label, member))
+        elif inspect.iscoroutinefunction(member):
+            setattr(cls, name, _tag_coroutine(label, member))
+    return cls
+
+
+def _tag_coroutine(label: str, func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = current_repository_method.set(label)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            current_repository_method.reset(token)
+    return wrapper
+
+
+def _tag_generator(label: str, func):
+    # The tag is only set while the generator runs, never across a yield into the caller
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        generator = func(*args, **kwargs)
+        try:
+            while True:
+                token = current_repository_method.set(label)
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_repository_method.reset(token)
+                yield item
+        finally:
+            await generator.aclose()
+    return wrapper
+
+
+def instrument_engine(engine) -> None:
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._statement_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_statement_started", None)
+    if started is not None:
+        DB_STATEMENT_SECONDS.labels(current_repository_method.get()).observe(time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    DB_STATEMENT_ERRORS.labels(current_repository_method.get()).inc()
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route_template(scope), str(status)).observe(
+                time.perf_counter() - start
+            )
+
+
+def route_template(scope) -> str:
+    # The router stores the matched route in the scope. Depending on the FastAPI version an
+    # included router's route carries its full path or only the part after the router
+    # prefix; in the latter case the prefix is recovered from the request path.
+    route = scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    for index, char in enumerate(path):
+        if char == "/" and path_regex.match(path[index:]):
+            return path[:index] + route.path
+    return route.path
+
+
+async def monitor_event_loop(interval: float = EVENT_LOOP_PROBE_SECONDS) -> None:
+    # A sleep that wakes up late means something held the loop for that long
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(loop.time() - start - interval, 0.0))
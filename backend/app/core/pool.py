@@ -0,0 +1,88 @@
+import time
+from contextvars import ContextVar
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Dict
+from app.core.metrics import Counter, Family, Gauge, Histogram, registry
+
+# QueuePool._do_get calls itself when it loses a race for an overflow slot; only the
+# outermost call is timed so one checkout is one observation
+_in_checkout: ContextVar[bool] = ContextVar("pool_in_checkout", default=False)
+
+
+POOL_WAIT_SECONDS = registry.register(
+    Family(Histogram, "db_pool_wait_seconds", "Time spent waiting for a pooled connection", ("pool",))
+)
+POOL_CHECKOUTS = registry.register(
+    Family(Counter, "db_pool_checkouts_total", "Connections handed out by the pool", ("pool",))
+)
+POOL_TIMEOUTS = registry.register(
+    Family(Counter, "db_pool_timeouts_total", "Checkouts that gave up after pool_timeout", ("pool",))
+)
+POOL_CHECKED_OUT = registry.register(
+    Family(Gauge, "db_pool_checked_out", "Connections currently checked out", ("pool",))
+)
+POOL_SIZE = registry.register(Family(Gauge, "db_pool_size", "Configured pool size", ("pool",)))
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    # Times how long each checkout waits for a connection, including opening a new one
+    # when the pool is below its limit, and counts checkouts that hit pool_timeout
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram("db_pool_wait_seconds", "Time spent waiting for a pooled connection")
+        self.checkouts = Counter("db_pool_checkouts_total", "Connections handed out by the pool")
+        self.timeouts = Counter("db_pool_timeouts_total", "Checkouts that gave up after pool_timeout")
+
+    def _do_get(self):
+        if _in_checkout.get():
+            return super()._do_get()
+        token = _in_checkout.set(True)
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts.inc()
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - start)
+            _in_checkout.reset(token)
+        self.checkouts.inc()
+        return record
+
+    def recreate(self):
+        # Keep the counters when the engine replaces its pool (e.g. after dispose)
+        pool = super().recreate()
+        pool.wait_seconds, pool.checkouts, pool.timeouts = self.wait_seconds, self.checkouts, self.timeouts
+        return pool
+
+
+def pool_snapshot(pool) -> Dict[str, object]:
+    if not hasattr(pool, "checkedout"):
+        # NullPool/StaticPool (SQLite stand-ins) have no queue to report on
+        return {"class": type(pool).__name__}
+    snapshot = {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, InstrumentedAsyncPool):
+        snapshot["checkouts"] = pool.checkouts.value
+        snapshot["timeouts"] = pool.timeouts.value
+        snapshot["wait_seconds"] = pool.wait_seconds.snapshot()
+    return snapshot
+
+
+def register_pool_metrics(name: str, engine) -> None:
+    # The engine swaps in a new pool on dispose(), so gauges look the pool up at scrape time
+    if not isinstance(engine.pool, InstrumentedAsyncPool):
+        return
+    POOL_WAIT_SECONDS.attach((name,), engine.pool.wait_seconds)
+    POOL_CHECKOUTS.attach((name,), engine.pool.checkouts)
+    POOL_TIMEOUTS.attach((name,), engine.pool.timeouts)
+    POOL_CHECKED_OUT.attach((name,), Gauge(POOL_CHECKED_OUT.name, "", function=lambda: engine.pool.checkedout()))
+    POOL_SIZE.attach((name,), Gauge(POOL_SIZE.name, "", function=lambda: engine.pool.size()))
@@ -0,0 +1,278 @@
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+from app.core.instrumentation import current_repository_method
+
+# Per-request profiles: a sampled call-stack profile plus every SQL statement with its
+# timing. A background thread samples the event loop thread's stack; a sample belongs to
+# the request whose middleware frame is on that stack, so concurrent requests on the same
+# loop are told apart. Samples only show time the request spent running on the loop; time
+# spent awaiting the database shows up in the SQL timeline instead. Finished reports go to
+# a bounded in-memory ring buffer.
+
+MAX_STATEMENTS = 500
+MAX_STATEMENT_LENGTH = 2000
+REPORTED_STACKS = 50
+REPORTED_FUNCTIONS = 25
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self, scope, trigger: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.query = scope.get("query_string", b"").decode("latin-1")
+        self.trigger = trigger
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.status: Optional[int] = None
+        self.thread_id = threading.get_ident()
+        self.frame = None
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.statements: List[Dict[str, Any]] = []
+        self.statement_count = 0
+        self.statement_seconds = 0.0
+
+    def add_statement(self, statement: str, started: float, duration: float, rows: int) -> None:
+        self.statement_count += 1
+        self.statement_seconds += duration
+        if len(self.statements) >= MAX_STATEMENTS:
+            return
+        self.statements.append({
+            "offset_ms": round((started - self.started) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+            "repository_method": current_repository_method.get(),
+            "rows": rows,
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "sql_count": self.statement_count,
+            "sql_ms": round(self.statement_seconds * 1000, 3),
+            "samples": self.samples,
+        }
+
+    def report(self, interval: float) -> Dict[str, Any]:
+        self_samples: Counter = Counter()
+        total_samples: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if stack:
+                self_samples[stack[-1]] += count
+            for function in set(stack):
+                total_samples[function] += count
+        return {
+            **self.summary(),
+            "sql": {
+                "count": self.statement_count,
+                "total_ms": round(self.statement_seconds * 1000, 3),
+                "omitted": self.statement_count - len(self.statements),
+                "statements": self.statements,
+            },
+            "profile": {
+                "interval_ms": interval * 1000,
+                "samples": self.samples,
+                # Folded stacks, root first, as consumed by flame graph tools
+                "stacks": [
+                    {"stack": ";".join(stack), "samples": count}
+                    for stack, count in self.stacks.most_common(REPORTED_STACKS)
+                ],
+                "functions": [
+                    {"function": function, "self_samples": self_samples[function], "total_samples": total_samples[function]}
+                    for function in sorted(
+                        total_samples, key=lambda name: (self_samples[name], total_samples[name]), reverse=True
+                    )[:REPORTED_FUNCTIONS]
+                ],
+            },
+        }
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._profiles: Dict[Any, RequestProfile] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.frame] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def remove(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.pop(profile.frame, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                idle = not self._profiles
+                if idle:
+                    self._wake.clear()
+            if idle:
+                self._wake.wait()
+                continue
+            self._sample()
+            time.sleep(self.interval)
+
+    def _sample(self) -> None:
+        # Holding the lock means a profile never changes after remove() returns
+        with self._lock:
+            frames = sys._current_frames()
+            for thread_id in {profile.thread_id for profile in self._profiles.values()}:
+                self._attribute(frames.get(thread_id))
+
+    def _attribute(self, frame) -> None:
+        stack = []
+        while frame is not None:
+            profile = self._profiles.get(frame)
+            if profile is not None:
+                stack.reverse()
+                profile.stacks[tuple(stack)] += 1
+                profile.samples += 1
+                return
+            stack.append(_describe(frame))
+            frame = frame.f_back
+
+
+def _describe(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(APP_ROOT):
+        filename = os.path.relpath(filename, APP_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({filename}:{frame.f_lineno})"
+
+
+class ProfileStore:
+    def __init__(self, max_reports: int):
+        self._reports: deque = deque(maxlen=max_reports)
+        self._lock = threading.Lock()
+
+    def add(self, report: Dict[str, Any]) -> None:
+        with self._lock:
+            self._reports.append(report)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            reports = list(self._reports)
+        summary_fields = ("sql", "profile")
+        return [
+            {key: value for key, value in report.items() if key not in summary_fields}
+            for report in reversed(reports)
+        ]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((report for report in self._reports if report["id"] == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+
+
+profile_store = ProfileStore(settings.PROFILING_MAX_REPORTS)
+stack_sampler = StackSampler(settings.PROFILING_INTERVAL_SECONDS)
+
+
+def get_profile_store() -> ProfileStore:
+    return profile_store
+
+
+def profile_statements(engine) -> None:
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_profile.get() is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profile_started", None)
+    if profile is not None and started is not None:
+        profile.add_statement(statement, started, time.perf_counter() - started, cursor.rowcount)
+
+
+class ProfilingMiddleware:
+    # Profiles a request when it carries the profiling header set to the internal token, for
+    # a random PROFILING_SAMPLE_RATE fraction of requests, or, with PROFILING_SLOW_SECONDS
+    # set, every request and keeps the report only if it ran longer than the threshold
+    def __init__(
+        self, app, header: str, token: Optional[str], sample_rate: float, slow_seconds: Optional[float]
+    ):
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self.token = token.encode("utf-8") if token else None
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+
+    async def __call__(self, scope, receive, send):
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope, trigger)
+        profile.frame = sys._getframe()
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if trigger != "slow":
+                    MutableHeaders(scope=message).append("x-profile-id", profile.id)
+            await send(message)
+
+        token = _current_profile.set(profile)
+        stack_sampler.add(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stack_sampler.remove(profile)
+            _current_profile.reset(token)
+            profile.duration = time.perf_counter() - profile.started
+            if trigger != "slow" or profile.duration >= self.slow_seconds:
+                profile_store.add(profile.report(stack_sampler.interval))
+
+    def _trigger(self, scope) -> Optional[str]:
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == self.header and secrets.compare_digest(value, self.token):
+                    return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        if self.slow_seconds is not None:
+            return "slow"
+        return None
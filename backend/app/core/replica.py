@@ -0,0 +1,49 @@
+import time
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+
+# After a successful write the client is pinned to the primary for REPLICA_STICKY_SECONDS
+# through a cookie, so its next reads cannot land on a replica that has not replayed the
+# write yet. Pinned sessions also skip cached responses, which may have been built from
+# a lagging replica, and overwrite them with what the primary returns.
+
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+READ_YOUR_WRITES = "read_your_writes"
+
+
+def is_pinned_to_primary(request: Request, cookie: str) -> bool:
+    value = request.cookies.get(cookie)
+    if value is None:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def reads_own_writes(session) -> bool:
+    return session.info.get(READ_YOUR_WRITES, False)
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app, cookie: str, seconds: int):
+        self.app = app
+        self.cookie = cookie
+        self.seconds = seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", self._cookie_header())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    def _cookie_header(self) -> str:
+        until = int(time.time()) + self.seconds
+        return f"{self.cookie}={until}; Max-Age={self.seconds}; Path=/; HttpOnly; SameSite=lax"
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+from datetime import date
+from app.core.db import AsyncSessionLocal
+from app.services.crop_lifecycle_service import CropLifecycleService, LIFECYCLE_BATCH_SIZE
+
+async def run_once(as_of: date = None, container_id: str = None, batch_size: int = LIFECYCLE_BATCH_SIZE) -> None:
+    async with AsyncSessionLocal() as session:
+        report = await CropLifecycleService(session).refresh(as_of, container_id, batch_size)
+    print(
+        f"{report['as_of']}: {report['crops']} crops checked, {report['updated']} updated, "
+        f"{report['status_changes']} changed status"
+    )
+    for transition in report["transitions"]:
+        print(f"  {transition['from']} -> {transition['to']}: {transition['crops']}")
+
+async def run(
+    as_of: date = None, container_id: str = None, batch_size: int = LIFECYCLE_BATCH_SIZE, interval: float = None
+) -> None:
+    # With an interval the job keeps running and refreshes on that schedule; a fixed --date
+    # only makes sense for a single run
+    while True:
+        await run_once(as_of, container_id, batch_size)
+        if not interval:
+            return
+        await asyncio.sleep(interval)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute crop age, overdue days and status")
+    parser.add_argument("--container-id")
+    parser.add_argument("--date", type=date.fromisoformat, help="compute as of this day instead of today (UTC)")
+    parser.add_argument("--batch-size", type=int, default=LIFECYCLE_BATCH_SIZE)
+    parser.add_argument("--interval", type=float, help="repeat every N seconds instead of running once")
+    args = parser.parse_args()
+    if args.interval and args.date:
+        parser.error("--date cannot be combined with --interval")
+    asyncio.run(run(args.date, args.container_id, args.batch_size, args.interval))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import sys
+from app.core.db import AsyncSessionLocal
+from app.services.crop_statistics_service import CropStatisticsService, STATISTICS_CHUNK_SIZE
+
+async def run(command: str, chunk_size: int = STATISTICS_CHUNK_SIZE) -> int:
+    async with AsyncSessionLocal() as session:
+        service = CropStatisticsService(session)
+        if command == "check":
+            report = await service.check(chunk_size)
+        elif command == "rebuild":
+            result = await service.rebuild(chunk_size)
+        else:
+            result = await service.refresh(chunk_size)
+    if command != "check":
+        print(f"{result['crops']} crops updated from {result['rows']} metric rows")
+        return 0
+    print(
+        f"{report['crops']} crops checked: {report['mismatched']} differ from their stored state, "
+        f"{report['missing_state']} have no state"
+    )
+    for example in report["examples"]:
+        print(f"  {example['crop_id']}: {', '.join(example['fields'])}")
+    return 1 if report["mismatched"] or report["missing_state"] else 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute crop statistics from crop metrics")
+    parser.add_argument("command", choices=["refresh", "rebuild", "check"])
+    parser.add_argument("--chunk-size", type=int, default=STATISTICS_CHUNK_SIZE)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.command, args.chunk_size)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+from app.core.db import AsyncSessionLocal
+from app.repositories.partition_repository import PARTITIONED_TABLES, partition_name
+from app.services.partition_service import PartitionService
+
+async def run(table: str = None, premake_months: int = None, dry_run: bool = False) -> None:
+    async with AsyncSessionLocal() as session:
+        service = PartitionService(session)
+        if dry_run:
+            plans = await service.plan(table, premake_months=premake_months)
+            for name, plan in plans.items():
+                create = [partition_name(name, month) for month in plan["create"]]
+                print(f"{name}: would create {create or 'nothing'}, would drop {plan['drop'] or 'nothing'}")
+            return
+        report = await service.maintain(table, premake_months=premake_months)
+    for name, result in report.items():
+        print(
+            f"{name}: created {result['created'] or 'nothing'}, dropped {result['dropped'] or 'nothing'}, "
+            f"{result['expired_default_rows']} expired rows removed from the default partition"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create upcoming monthly metric partitions and drop expired ones")
+    parser.add_argument("--table", choices=list(PARTITIONED_TABLES))
+    parser.add_argument("--premake-months", type=int)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.table, args.premake_months, args.dry_run))
+
+if __name__ == "__main__":
+    main()
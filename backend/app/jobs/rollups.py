@@ -0,0 +1,25 @@
+import argparse
+import asyncio
+from app.core.db import AsyncSessionLocal
+from app.services.metric_rollup_service import MetricRollupService, ROLLUP_BATCH_SIZE
+
+async def run(command: str, source: str = None, batch_size: int = ROLLUP_BATCH_SIZE) -> None:
+    async with AsyncSessionLocal() as session:
+        service = MetricRollupService(session)
+        if command == "backfill":
+            processed = await service.backfill(source, batch_size)
+        else:
+            processed = await service.refresh(source, batch_size)
+    for name, rows in processed.items():
+        print(f"{name}: {rows} rows rolled up")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain daily and weekly metric rollups")
+    parser.add_argument("command", choices=["refresh", "backfill"])
+    parser.add_argument("--source", choices=["inventory_metrics", "crop_metrics"])
+    parser.add_argument("--batch-size", type=int, default=ROLLUP_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(run(args.command, args.source, args.batch_size))
+
+if __name__ == "__main__":
+    main()
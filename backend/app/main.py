@@ -1,6 +1,14 @@
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.db import async_engine, replica_engine
+from app.core.events import event_bus
+from app.core.instrumentation import RequestMetricsMiddleware, monitor_event_loop
+from app.core.metrics import registry
+from app.core.profiling import ProfilingMiddleware
+from app.core.replica import ReadYourWritesMiddleware
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -15,14 +23,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if replica_engine is not None:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        cookie=settings.REPLICA_STICKY_COOKIE,
+        seconds=settings.REPLICA_STICKY_SECONDS,
+    )
+
+app.add_middleware(
+    ProfilingMiddleware,
+    header=settings.PROFILING_HEADER,
+    token=settings.INTERNAL_TOKEN,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    slow_seconds=settings.PROFILING_SLOW_SECONDS,
+)
+
+# Outermost, so the latency includes the other middleware
+app.add_middleware(RequestMetricsMiddleware)
+
+background_tasks = set()
+
+@app.on_event("startup")
+async def start_event_loop_monitor():
+    task = asyncio.create_task(monitor_event_loop())
+    background_tasks.add(task)
+
+@app.on_event("startup")
+async def start_event_bus():
+    await event_bus.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    for task in background_tasks:
+        task.cancel()
+    await event_bus.stop()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 async def root():
     return {"message": "Vertical Farming Management API"}
 
-from app.api.routes import containers, tenants
+from app.api.routes import containers, crops, internal, metrics, tenants
 app.include_router(containers.router, prefix=f"{settings.API_V1_STR}/containers", tags=["containers"])
+app.include_router(crops.router, prefix=f"{settings.API_V1_STR}/crops", tags=["crops"])
+app.include_router(metrics.router, prefix=f"{settings.API_V1_STR}/metrics", tags=["metrics"])
 app.include_router(tenants.router, prefix=f"{settings.API_V1_STR}/tenants", tags=["tenants"])
+app.include_router(internal.router, prefix="/internal", tags=["internal"])
@@ -6,9 +6,12 @@ from .tray import Tray
 from .inventory_metric import InventoryMetric
 from .crop_metric import CropMetric
 from .crop_statistic import CropStatistic
+from .crop_statistic_state import CropStatisticState
 from .crop_location import CropLocation
 from .panel_location import PanelLocation
 from .tray_location import TrayLocation
+from .tenant import Tenant
+from .metric_rollup import InventoryMetricRollup, CropMetricRollup, RollupWatermark
 
 __all__ = [
     "Container",
@@ -19,7 +22,12 @@ __all__ = [
     "InventoryMetric",
     "CropMetric",
     "CropStatistic",
+    "CropStatisticState",
     "CropLocation",
     "PanelLocation",
-    "TrayLocation"
+    "TrayLocation",
+    "Tenant",
+    "InventoryMetricRollup",
+    "CropMetricRollup",
+    "RollupWatermark"
 ]
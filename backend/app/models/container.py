@@ -1,12 +1,22 @@
-from sqlalchemy import Column, String, Boolean, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, ForeignKey, Computed, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 import uuid
 from datetime import datetime
 
+SEARCH_TEXT_EXPRESSION = "name || ' ' || tenant || ' ' || purpose || ' ' || status"
+
 class Container(Base):
     __tablename__ = "containers"
+    __table_args__ = (
+        Index(
+            "ix_containers_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     type = Column(String, nullable=False)
@@ -17,14 +27,33 @@ class Container(Base):
     status = Column(String, nullable=False, default="created")
     seed_types = Column(JSON, nullable=True)
     created = Column(DateTime, default=datetime.utcnow)
-    modified = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Never NULL (migration 011): list cursors order and compare on (modified, id)
+    modified = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+        server_default=text("timezone('utc', now())")
+    )
     has_alert = Column(Boolean, default=False)
     notes = Column(String, nullable=True)
     shadow_service_enabled = Column(Boolean, default=False)
     ecosystem_connected = Column(Boolean, default=False)
+    search_text = Column(Text, Computed(SEARCH_TEXT_EXPRESSION, persisted=True))
     
     location = relationship("Location", back_populates="containers")
     crops = relationship("Crop", back_populates="container")
     panels = relationship("Panel", back_populates="container")
     trays = relationship("Tray", back_populates="container")
     inventory_metrics = relationship("InventoryMetric", back_populates="container")
+
+
+# Mirrors migration 006: each list filter is an equality followed by ORDER BY modified DESC, id DESC
+Index("ix_containers_modified_id", Container.modified.desc(), Container.id.desc())
+Index("ix_containers_type_modified", Container.type, Container.modified.desc(), Container.id.desc())
+Index("ix_containers_tenant_modified", Container.tenant, Container.modified.desc(), Container.id.desc())
+Index("ix_containers_purpose_modified", Container.purpose, Container.modified.desc(), Container.id.desc())
+Index("ix_containers_status_modified", Container.status, Container.modified.desc(), Container.id.desc())
+Index(
+    "ix_containers_alert_modified",
+    Container.modified.desc(),
+    Container.id.desc(),
+    postgresql_where=Container.has_alert
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 import uuid
@@ -6,6 +6,9 @@ from datetime import datetime
 
 class Crop(Base):
     __tablename__ = "crops"
+    __table_args__ = (
+        Index("ix_crops_container_id", "container_id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     container_id = Column(String, ForeignKey("containers.id"), nullable=False)
@@ -1,13 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 
 class CropMetric(Base):
     __tablename__ = "crop_metrics"
+    __table_args__ = (
+        Index("ix_crop_metrics_crop_recorded_at", "crop_id", "recorded_at"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
     
+    # Monthly range partitions on recorded_at; the primary key has to include the partition key
     id = Column(Integer, primary_key=True, autoincrement=True)
     crop_id = Column(String, ForeignKey("crops.id"), nullable=False)
-    recorded_at = Column(DateTime, nullable=False)
+    recorded_at = Column(DateTime, primary_key=True, nullable=False)
     height_cm = Column(Float, nullable=True)
     leaf_count = Column(Integer, nullable=True)
     stem_diameter_mm = Column(Float, nullable=True)
@@ -29,3 +34,12 @@ class CropMetric(Base):
     magnesium_ppm = Column(Float, nullable=True)
     
     crop = relationship("Crop", back_populates="metrics")
+
+
+# Tables built by create_all instead of migrations still need somewhere to put rows;
+# app.jobs.partitions adds the monthly partitions
+event.listen(
+    CropMetric.__table__,
+    "after_create",
+    DDL("CREATE TABLE crop_metrics_default PARTITION OF crop_metrics DEFAULT").execute_if(dialect="postgresql")
+)
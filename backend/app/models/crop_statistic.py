@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, JSON, ForeignKey, UniqueConstraint
 from app.core.db import Base
 
 class CropStatistic(Base):
     __tablename__ = "crop_statistics"
+    __table_args__ = (
+        UniqueConstraint("crop_id", name="uq_crop_statistics_crop_id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     crop_id = Column(String, ForeignKey("crops.id"), nullable=False)
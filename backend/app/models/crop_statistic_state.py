@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey
+from app.core.db import Base
+from datetime import datetime
+
+class CropStatisticState(Base):
+    # Running sufficient statistics behind each CropStatistic row (see app.services.crop_analytics).
+    # t is measured in days from origin_days, the crop's first reading in days since the epoch;
+    # high_water_mark is the newest recorded_at already folded in, in epoch seconds.
+    __tablename__ = "crop_statistic_states"
+    
+    crop_id = Column(String, ForeignKey("crops.id"), primary_key=True)
+    origin_days = Column(Float, nullable=False)
+    high_water_mark = Column(Float, nullable=False)
+    rows = Column(Float, nullable=False)
+    height_cm_n = Column(Float, nullable=False)
+    height_cm_t = Column(Float, nullable=False)
+    height_cm_tt = Column(Float, nullable=False)
+    height_cm_y = Column(Float, nullable=False)
+    height_cm_ty = Column(Float, nullable=False)
+    biomass_g_n = Column(Float, nullable=False)
+    biomass_g_t = Column(Float, nullable=False)
+    biomass_g_tt = Column(Float, nullable=False)
+    biomass_g_y = Column(Float, nullable=False)
+    biomass_g_ty = Column(Float, nullable=False)
+    health_score_n = Column(Float, nullable=False)
+    health_score_t = Column(Float, nullable=False)
+    health_score_tt = Column(Float, nullable=False)
+    health_score_y = Column(Float, nullable=False)
+    health_score_ty = Column(Float, nullable=False)
+    disease_detected_count = Column(Float, nullable=False)
+    pest_detected_count = Column(Float, nullable=False)
+    height_cm_max = Column(Float, nullable=True)
+    biomass_g_max = Column(Float, nullable=True)
+    leaf_count_max = Column(Float, nullable=True)
+    last_t = Column(Float, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
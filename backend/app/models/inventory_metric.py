@@ -1,13 +1,18 @@
-from sqlalchemy import Column, Integer, String, Date, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Float, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 
 class InventoryMetric(Base):
     __tablename__ = "inventory_metrics"
+    __table_args__ = (
+        Index("ix_inventory_metrics_container_date", "container_id", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
     
+    # Monthly range partitions on date; the primary key has to include the partition key
     id = Column(Integer, primary_key=True, autoincrement=True)
     container_id = Column(String, ForeignKey("containers.id"), nullable=False)
-    date = Column(Date, nullable=False)
+    date = Column(Date, primary_key=True, nullable=False)
     nursery_station_utilization = Column(Integer, nullable=True)
     cultivation_area_utilization = Column(Integer, nullable=True)
     air_temperature = Column(Float, nullable=True)
@@ -16,3 +21,12 @@ class InventoryMetric(Base):
     yield_kg = Column(Float, nullable=True)
     
     container = relationship("Container", back_populates="inventory_metrics")
+
+
+# Tables built by create_all instead of migrations still need somewhere to put rows;
+# app.jobs.partitions adds the monthly partitions
+event.listen(
+    InventoryMetric.__table__,
+    "after_create",
+    DDL("CREATE TABLE inventory_metrics_default PARTITION OF inventory_metrics DEFAULT").execute_if(dialect="postgresql")
+)
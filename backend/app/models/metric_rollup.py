@@ -0,0 +1,67 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Date, Float, ForeignKey
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.core.db import Base
+
+INVENTORY_ROLLUP_METRICS = ("air_temperature", "humidity", "co2_level", "yield_kg")
+CROP_ROLLUP_METRICS = ("height_cm", "biomass_g", "health_score", "temperature_c", "humidity_percent")
+ROLLUP_GRANULARITIES = ("day", "week")
+
+class InventoryMetricRollup(Base):
+    __tablename__ = "inventory_metric_rollups"
+    
+    container_id = Column(String, ForeignKey("containers.id"), primary_key=True)
+    granularity = Column(String, primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    air_temperature_min = Column(Float, nullable=True)
+    air_temperature_max = Column(Float, nullable=True)
+    air_temperature_sum = Column(Float, nullable=True)
+    air_temperature_count = Column(Integer, nullable=False, default=0)
+    humidity_min = Column(Float, nullable=True)
+    humidity_max = Column(Float, nullable=True)
+    humidity_sum = Column(Float, nullable=True)
+    humidity_count = Column(Integer, nullable=False, default=0)
+    co2_level_min = Column(Float, nullable=True)
+    co2_level_max = Column(Float, nullable=True)
+    co2_level_sum = Column(Float, nullable=True)
+    co2_level_count = Column(Integer, nullable=False, default=0)
+    yield_kg_min = Column(Float, nullable=True)
+    yield_kg_max = Column(Float, nullable=True)
+    yield_kg_sum = Column(Float, nullable=True)
+    yield_kg_count = Column(Integer, nullable=False, default=0)
+
+class CropMetricRollup(Base):
+    __tablename__ = "crop_metric_rollups"
+    
+    crop_id = Column(String, ForeignKey("crops.id"), primary_key=True)
+    granularity = Column(String, primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    height_cm_min = Column(Float, nullable=True)
+    height_cm_max = Column(Float, nullable=True)
+    height_cm_sum = Column(Float, nullable=True)
+    height_cm_count = Column(Integer, nullable=False, default=0)
+    biomass_g_min = Column(Float, nullable=True)
+    biomass_g_max = Column(Float, nullable=True)
+    biomass_g_sum = Column(Float, nullable=True)
+    biomass_g_count = Column(Integer, nullable=False, default=0)
+    health_score_min = Column(Float, nullable=True)
+    health_score_max = Column(Float, nullable=True)
+    health_score_sum = Column(Float, nullable=True)
+    health_score_count = Column(Integer, nullable=False, default=0)
+    temperature_c_min = Column(Float, nullable=True)
+    temperature_c_max = Column(Float, nullable=True)
+    temperature_c_sum = Column(Float, nullable=True)
+    temperature_c_count = Column(Integer, nullable=False, default=0)
+    humidity_percent_min = Column(Float, nullable=True)
+    humidity_percent_max = Column(Float, nullable=True)
+    humidity_percent_sum = Column(Float, nullable=True)
+    humidity_percent_count = Column(Integer, nullable=False, default=0)
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+    
+    source = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    # Highest id seen by an earlier refresh and the transactions running at that moment:
+    # once all of them have ended, every id up to fence_id is committed
+    fence_id = Column(Integer, nullable=True)
+    fence_xids = Column(ARRAY(BigInteger), nullable=True)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 from datetime import datetime
 
 class Panel(Base):
     __tablename__ = "panels"
+    __table_args__ = (
+        Index("ix_panels_container_id", "container_id"),
+    )
     
     id = Column(String, primary_key=True)
     rfid_tag = Column(String, nullable=True)
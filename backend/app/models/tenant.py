@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer
+from app.core.db import Base
+import uuid
+
+TENANT_COUNTER_COLUMNS = (
+    "container_count",
+    "physical_count",
+    "virtual_count",
+    "created_count",
+    "active_count",
+    "maintenance_count",
+    "inactive_count",
+    "alert_count",
+)
+
+class Tenant(Base):
+    __tablename__ = "tenants"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String, nullable=False, unique=True)
+    container_count = Column(Integer, nullable=False, default=0)
+    physical_count = Column(Integer, nullable=False, default=0)
+    virtual_count = Column(Integer, nullable=False, default=0)
+    created_count = Column(Integer, nullable=False, default=0)
+    active_count = Column(Integer, nullable=False, default=0)
+    maintenance_count = Column(Integer, nullable=False, default=0)
+    inactive_count = Column(Integer, nullable=False, default=0)
+    alert_count = Column(Integer, nullable=False, default=0)
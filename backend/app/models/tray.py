@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 from datetime import datetime
 
 class Tray(Base):
     __tablename__ = "trays"
+    __table_args__ = (
+        Index("ix_trays_container_id", "container_id"),
+    )
     
     id = Column(String, primary_key=True)
     rfid_tag = Column(String, nullable=True)
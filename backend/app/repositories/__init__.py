@@ -1,7 +1,21 @@
 from .container_repository import ContainerRepository
 from .tenant_repository import TenantRepository
+from .inventory_metric_repository import InventoryMetricRepository
+from .metric_rollup_repository import MetricRollupRepository
+from .metric_ingest_repository import MetricIngestRepository
+from .partition_repository import PartitionRepository
+from .crop_statistic_repository import CropStatisticRepository
+from .crop_metric_repository import CropMetricRepository
+from .crop_lifecycle_repository import CropLifecycleRepository
 
 __all__ = [
     "ContainerRepository",
-    "TenantRepository"
+    "TenantRepository",
+    "InventoryMetricRepository",
+    "MetricRollupRepository",
+    "MetricIngestRepository",
+    "PartitionRepository",
+    "CropStatisticRepository",
+    "CropMetricRepository",
+    "CropLifecycleRepository"
 ]
@@ -1,14 +1,37 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import (
+    Boolean, select, update, delete, exists, func, and_, case, column, text, tuple_, values
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Tuple
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+from datetime import datetime, timedelta
 from app.models.container import Container
+from app.models.crop import Crop
+from app.models.inventory_metric import InventoryMetric
 from app.models.location import Location
+from app.models.metric_rollup import InventoryMetricRollup
+from app.models.panel import Panel
+from app.models.tray import Tray
 from app.schemas.container import ContainerCreate, ContainerUpdate
+from app.repositories.container_search import get_container_search
+from app.repositories.tenant_repository import TenantRepository, add_counter_delta, container_counter_delta
+from app.core.config import settings
+from app.core.instrumentation import instrument_repository
 
+# Rows that keep a container from being deleted
+CONTAINER_DEPENDENTS = (
+    Tray.container_id, Panel.container_id, Crop.container_id,
+    InventoryMetric.container_id, InventoryMetricRollup.container_id
+)
+
+@instrument_repository
 class ContainerRepository:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, search_backend: Optional[str] = None):
         self.db = db
+        self.search = get_container_search(search_backend or settings.CONTAINER_SEARCH_BACKEND)
+        self.tenants = TenantRepository(db)
 
     async def get_all(
         self,
@@ -19,20 +42,98 @@ class ContainerRepository:
         tenant_filter: Optional[str] = None,
         purpose_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
-        has_alerts: Optional[bool] = None
-    ) -> Tuple[List[Container], int]:
+        has_alerts: Optional[bool] = None,
+        cursor: Optional[Tuple[datetime, str]] = None,
+        count_mode: str = "exact"
+    ) -> Tuple[List[Container], Optional[int]]:
         query = select(Container).options(selectinload(Container.location))
         
+        filters = self._build_filters(
+            search=search,
+            type_filter=type_filter,
+            tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter,
+            status_filter=status_filter,
+            has_alerts=has_alerts
+        )
+        
+        if filters:
+            query = query.where(and_(*filters))
+        
+        total = await self._count(filters, count_mode)
+        
+        order_by = [Container.modified.desc(), Container.id.desc()]
+        if cursor is not None:
+            # Cursors encode (modified, id) only, so relevance-ranked pages never hand one out
+            query = query.where(tuple_(Container.modified, Container.id) < tuple_(*cursor))
+        else:
+            query = query.offset(skip)
+            if self.ranks_search(search):
+                order_by = self.search.order_by(search) + order_by
+        
+        query = query.limit(limit).order_by(*order_by)
+        result = await self.db.execute(query)
+        containers = result.scalars().all()
+        
+        return list(containers), total
+
+    def ranks_search(self, search: Optional[str]) -> bool:
+        return bool(search) and bool(self.search.order_by(search))
+
+    def export_query(
+        self,
+        search: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        tenant_filter: Optional[str] = None,
+        purpose_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        has_alerts: Optional[bool] = None
+    ):
+        # Flat rows with the location inlined, in list order so the same indexes serve it
+        query = (
+            select(
+                Container.id, Container.name, Container.type, Container.tenant, Container.purpose,
+                Container.status, Container.has_alert, Container.notes, Container.seed_types,
+                Container.shadow_service_enabled, Container.ecosystem_connected,
+                Location.city.label("location_city"),
+                Location.country.label("location_country"),
+                Location.address.label("location_address"),
+                Container.created, Container.modified
+            )
+            .outerjoin(Location, Container.location_id == Location.id)
+            .order_by(Container.modified.desc(), Container.id.desc())
+        )
+        filters = self._build_filters(
+            search=search,
+            type_filter=type_filter,
+            tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter,
+            status_filter=status_filter,
+            has_alerts=has_alerts
+        )
+        if filters:
+            query = query.where(and_(*filters))
+        return query
+
+    async def stream_export(self, query, chunk_size: int) -> AsyncIterator[Sequence[Any]]:
+        # Server-side cursor: only one chunk of rows is held at a time
+        result = await self.db.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+    def _build_filters(
+        self,
+        search: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        tenant_filter: Optional[str] = None,
+        purpose_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        has_alerts: Optional[bool] = None
+    ) -> list:
         filters = []
         
         if search:
-            search_filter = or_(
-                Container.name.ilike(f"%{search}%"),
-                Container.tenant.ilike(f"%{search}%"),
-                Container.purpose.ilike(f"%{search}%"),
-                Container.status.ilike(f"%{search}%")
-            )
-            filters.append(search_filter)
+            filters.append(self.search.filter(search))
         
         if type_filter:
             filters.append(Container.type == type_filter)
@@ -47,108 +148,376 @@ class ContainerRepository:
             filters.append(Container.status == status_filter)
         
         if has_alerts is not None:
-            filters.append(Container.has_alert == has_alerts)
+            # Rendered without a bind parameter so the planner can match the partial alert index
+            filters.append(Container.has_alert if has_alerts else ~Container.has_alert)
         
+        return filters
+
+    async def get_facets(
+        self,
+        search: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        tenant_filter: Optional[str] = None,
+        purpose_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        has_alerts: Optional[bool] = None
+    ) -> Tuple[Dict[str, Dict[str, int]], int]:
+        filters = self._build_filters(
+            search=search,
+            type_filter=type_filter,
+            tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter,
+            status_filter=status_filter,
+            has_alerts=has_alerts
+        )
+
+        # One pass over the filtered rows: a grouping set per facet plus () for the total
+        facet_columns = {
+            "type": Container.type,
+            "tenant": Container.tenant,
+            "purpose": Container.purpose,
+            "status": Container.status,
+            "has_alert": Container.has_alert,
+        }
+        query = select(
+            *facet_columns.values(),
+            *[func.grouping(column).label(f"grouping_{name}") for name, column in facet_columns.items()],
+            func.count().label("count")
+        ).group_by(func.grouping_sets(*[tuple_(column) for column in facet_columns.values()], tuple_()))
         if filters:
             query = query.where(and_(*filters))
+
+        facets = {name: {} for name in facet_columns}
+        total = 0
+        for row in (await self.db.execute(query)).mappings():
+            grouped = [name for name in facet_columns if row[f"grouping_{name}"] == 0]
+            if not grouped:
+                total = row["count"]
+                continue
+            name = grouped[0]
+            value = row[facet_columns[name].key]
+            if value is None:
+                continue
+            key = str(value).lower() if isinstance(value, bool) else str(value)
+            facets[name][key] = row["count"]
+        return facets, total
+
+    async def _count(self, filters: list, count_mode: str) -> Optional[int]:
+        if count_mode == "none":
+            return None
+        
+        if count_mode == "estimate" and not filters:
+            # reltuples is maintained by VACUUM/ANALYZE and is -1 for a never-analyzed table
+            estimate_query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'containers'::regclass")
+            estimate = (await self.db.execute(estimate_query)).scalar()
+            if estimate is not None and estimate >= 0:
+                return estimate
         
         total_query = select(func.count(Container.id))
         if filters:
             total_query = total_query.where(and_(*filters))
         
         total_result = await self.db.execute(total_query)
-        total = total_result.scalar()
-        
-        query = query.offset(skip).limit(limit).order_by(Container.modified.desc())
-        result = await self.db.execute(query)
-        containers = result.scalars().all()
-        
-        return list(containers), total
+        return total_result.scalar()
+
+    async def get_inventory_snapshots(self, container_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        # Three set-based queries per page regardless of its size, instead of lazy loads per row
+        snapshots = {
+            container_id: {"tray_ids": [], "panel_ids": [], "latest_metric": None}
+            for container_id in container_ids
+        }
+        if not snapshots:
+            return snapshots
+
+        trays = await self.db.execute(
+            select(Tray.container_id, Tray.id).where(Tray.container_id.in_(container_ids)).order_by(Tray.id)
+        )
+        for container_id, tray_id in trays:
+            snapshots[container_id]["tray_ids"].append(tray_id)
+
+        panels = await self.db.execute(
+            select(Panel.container_id, Panel.id).where(Panel.container_id.in_(container_ids)).order_by(Panel.id)
+        )
+        for container_id, panel_id in panels:
+            snapshots[container_id]["panel_ids"].append(panel_id)
+
+        latest_metrics = await self.db.execute(
+            select(
+                InventoryMetric.container_id,
+                InventoryMetric.air_temperature,
+                InventoryMetric.humidity,
+                InventoryMetric.co2_level,
+                InventoryMetric.nursery_station_utilization,
+                InventoryMetric.cultivation_area_utilization,
+                InventoryMetric.yield_kg
+            )
+            .where(InventoryMetric.container_id.in_(container_ids))
+            .order_by(InventoryMetric.container_id, InventoryMetric.date.desc(), InventoryMetric.id.desc())
+            .distinct(InventoryMetric.container_id)
+        )
+        for metric in latest_metrics:
+            snapshots[metric.container_id]["latest_metric"] = metric
+
+        return snapshots
 
     async def get_by_id(self, container_id: str) -> Optional[Container]:
         query = select(Container).options(selectinload(Container.location)).where(Container.id == container_id)
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_tenants_of(self, container_ids: List[str]) -> List[str]:
+        if not container_ids:
+            return []
+        result = await self.db.execute(
+            select(Container.tenant).where(Container.id.in_(container_ids)).distinct()
+        )
+        return list(result.scalars())
+
+    async def get_tenant(self, container_id: str) -> Optional[str]:
+        result = await self.db.execute(select(Container.tenant).where(Container.id == container_id))
+        return result.scalar_one_or_none()
+
     async def get_by_name(self, name: str) -> Optional[Container]:
         query = select(Container).where(Container.name == name)
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def create(self, container_data: ContainerCreate) -> Container:
-        location = None
-        if container_data.location and container_data.type == "physical":
-            location = Location(
-                city=container_data.location.city,
-                country=container_data.location.country,
-                address=container_data.location.address
-            )
-            self.db.add(location)
+    async def create(self, container_data: ContainerCreate) -> Optional[Container]:
+        # The unique name is enforced by ON CONFLICT, so there is no racy pre-check;
+        # None means the name is already taken
+        containers = await self.create_many([container_data])
+        return containers[0] if containers else None
+
+    async def get_existing_names(self, names: List[str]) -> Set[str]:
+        result = await self.db.execute(select(Container.name).where(Container.name.in_(names)))
+        return set(result.scalars().all())
+
+    async def create_many(self, items: List[ContainerCreate]) -> List[Container]:
+        # Locations go in as one batched flush and containers as one INSERT ... RETURNING.
+        # A name taken concurrently since the caller's check is skipped rather than failing
+        # the batch, so it is simply missing from the result.
+        locations = {}
+        for item in items:
+            if item.location and item.type == "physical":
+                locations[item.name] = Location(
+                    city=item.location.city,
+                    country=item.location.country,
+                    address=item.location.address
+                )
+        if locations:
+            self.db.add_all(locations.values())
             await self.db.flush()
 
-        container = Container(
-            name=container_data.name,
-            type=container_data.type,
-            tenant=container_data.tenant,
-            purpose=container_data.purpose,
-            seed_types=[seed.dict() for seed in container_data.seed_types],
-            location_id=location.id if location else None,
-            notes=container_data.notes,
-            shadow_service_enabled=container_data.settings.shadow_service_enabled,
-            ecosystem_connected=bool(container_data.settings.ecosystem)
-        )
-        
-        self.db.add(container)
+        rows = [
+            {
+                "name": item.name,
+                "type": item.type,
+                "tenant": item.tenant,
+                "purpose": item.purpose,
+                "seed_types": [seed.dict() for seed in item.seed_types],
+                "location_id": locations[item.name].id if item.name in locations else None,
+                "notes": item.notes,
+                "shadow_service_enabled": item.settings.shadow_service_enabled,
+                "ecosystem_connected": bool(item.settings.ecosystem),
+            }
+            for item in items
+        ]
+        statement = insert(Container).on_conflict_do_nothing(index_elements=[Container.name]).returning(Container)
+        containers = list((await self.db.scalars(statement, rows)).all())
+
+        created_names = {container.name for container in containers}
+        for name, location in locations.items():
+            if name not in created_names:
+                await self.db.delete(location)
+
+        deltas = {}
+        for container in containers:
+            set_committed_value(container, "location", locations.get(container.name))
+            add_counter_delta(deltas, container.tenant, container_counter_delta(
+                container.type, container.status, container.has_alert, 1
+            ))
+        await self.tenants.apply_counter_deltas(deltas)
         await self.db.commit()
-        
-        query = select(Container).options(selectinload(Container.location)).where(Container.id == container.id)
-        result = await self.db.execute(query)
-        return result.scalar_one()
+        return containers
 
-    async def update(self, container_id: str, container_data: ContainerUpdate) -> Optional[Container]:
-        container = await self.get_by_id(container_id)
-        if not container:
+    async def update(
+        self, container_id: str, container_data: ContainerUpdate, unmodified_since: Optional[datetime] = None
+    ) -> Optional[Tuple[Container, str]]:
+        # One UPDATE ... FROM previous ... RETURNING. The CTE locks the row and yields the
+        # values the tenant counters move away from, plus the current location for the response.
+        # With unmodified_since (an HTTP date, so whole seconds) the row is only updated if
+        # it has not changed after that second. Returns None if nothing was updated, and
+        # otherwise (container, tenant before the update).
+        previous = (
+            select(
+                Container.id, Container.tenant, Container.type, Container.status, Container.has_alert,
+                Location.city, Location.country, Location.address
+            )
+            .outerjoin(Location, Container.location_id == Location.id)
+            .where(Container.id == container_id)
+            .with_for_update(of=Container)
+        )
+        if unmodified_since is not None:
+            previous = previous.where(Container.modified < unmodified_since + timedelta(seconds=1))
+        previous = previous.cte("previous")
+        statement = (
+            update(Container)
+            .where(Container.id == previous.c.id)
+            .values(**self._update_values(container_data))
+            .returning(
+                Container, previous.c.tenant, previous.c.type, previous.c.status, previous.c.has_alert,
+                previous.c.city, previous.c.country, previous.c.address
+            )
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.db.execute(statement)).one_or_none()
+        if row is None:
             return None
+        deltas = {}
+        updated = await self._finish_update(row, container_data, deltas)
+        await self.tenants.apply_counter_deltas(deltas)
+        await self.db.commit()
+        return updated
 
-        update_data = container_data.dict(exclude_unset=True)
-        
-        if "location" in update_data and container.type == "physical":
-            if container.location:
-                for key, value in update_data["location"].items():
-                    setattr(container.location, key, value)
-            else:
-                location = Location(**update_data["location"])
-                self.db.add(location)
-                await self.db.flush()
-                container.location_id = location.id
-            del update_data["location"]
+    async def _finish_update(self, row: Any, container_data: ContainerUpdate, deltas: Dict) -> Tuple[Container, str]:
+        # row is (container, previous tenant, type, status, has_alert, city, country, address)
+        container, *previous_counters, city, country, address = row
 
-        if "seed_types" in update_data:
-            update_data["seed_types"] = [seed.dict() for seed in container_data.seed_types]
+        location = None
+        if city is not None:
+            location = Location(id=container.location_id, city=city, country=country, address=address)
+        # Only physical containers have a location; for virtual ones it is ignored
+        location_data = container_data.dict(exclude_unset=True).get("location")
+        if location_data is not None and container.type == "physical":
+            location = await self._write_location(container, location_data)
+        set_committed_value(container, "location", location)
 
+        add_counter_delta(deltas, previous_counters[0], container_counter_delta(*previous_counters[1:], -1))
+        add_counter_delta(deltas, container.tenant, container_counter_delta(
+            container.type, container.status, container.has_alert, 1
+        ))
+        return container, previous_counters[0]
+
+    @staticmethod
+    def _update_values(container_data: ContainerUpdate) -> Dict[str, Any]:
+        update_data = container_data.dict(exclude_unset=True)
+        values = {key: update_data[key] for key in ("tenant", "purpose", "notes", "status") if key in update_data}
+        if "seed_types" in update_data:
+            values["seed_types"] = [seed.dict() for seed in container_data.seed_types]
         if "settings" in update_data:
             settings = update_data["settings"]
-            container.shadow_service_enabled = settings.get("shadow_service_enabled", container.shadow_service_enabled)
-            container.ecosystem_connected = bool(settings.get("ecosystem"))
-            del update_data["settings"]
+            if "shadow_service_enabled" in settings:
+                values["shadow_service_enabled"] = settings["shadow_service_enabled"]
+            values["ecosystem_connected"] = bool(settings.get("ecosystem"))
+        # Always set, so a location-only change still moves modified
+        values["modified"] = datetime.utcnow()
+        return values
 
-        for key, value in update_data.items():
-            setattr(container, key, value)
+    async def _write_location(self, container: Container, location_data: Dict[str, Any]) -> Location:
+        if container.location_id is not None:
+            statement = (
+                update(Location)
+                .where(Location.id == container.location_id)
+                .values(**location_data)
+                .returning(Location)
+                .execution_options(synchronize_session=False)
+            )
+            return (await self.db.scalars(statement)).one()
+
+        location = Location(**location_data)
+        self.db.add(location)
+        await self.db.flush()
+        await self.db.execute(
+            update(Container)
+            .where(Container.id == container.id)
+            .values(location_id=location.id)
+            .execution_options(synchronize_session=False)
+        )
+        set_committed_value(container, "location_id", location.id)
+        return location
+
+    async def update_many(self, updates: List[Tuple[str, ContainerUpdate]]) -> List[Tuple[Container, str]]:
+        # The single-update statement over a VALUES list: one UPDATE ... FROM previous, incoming
+        # ... RETURNING for the whole batch. previous locks the targets in id order so
+        # concurrent batches lock consistently. Items set different fields, so a column only
+        # some of them set carries a set_<column> flag and keeps its value where that is false.
+        # Returns (container, tenant before the update) for each container found.
+        items = [(container_id, self._update_values(container_data)) for container_id, container_data in updates]
+        names = sorted({name for _, changes in items for name in changes})
+        partial = [name for name in names if any(name not in changes for _, changes in items)]
+        columns = Container.__table__.c
+        incoming = values(
+            column("id", columns.id.type),
+            *[column(name, columns[name].type) for name in names],
+            *[column(f"set_{name}", Boolean) for name in partial],
+            name="incoming"
+        ).data([
+            (container_id, *[changes.get(name) for name in names], *[name in changes for name in partial])
+            for container_id, changes in items
+        ])
+
+        previous = (
+            select(
+                Container.id, Container.tenant, Container.type, Container.status, Container.has_alert,
+                Location.city, Location.country, Location.address
+            )
+            .outerjoin(Location, Container.location_id == Location.id)
+            .where(Container.id.in_([container_id for container_id, _ in items]))
+            .order_by(Container.id)
+            .with_for_update(of=Container)
+            .cte("previous")
+        )
+        assignments = {
+            name: case((incoming.c[f"set_{name}"], incoming.c[name]), else_=columns[name])
+            if name in partial else incoming.c[name]
+            for name in names
+        }
+        statement = (
+            update(Container)
+            .where(Container.id == previous.c.id, incoming.c.id == previous.c.id)
+            .values(assignments)
+            .returning(
+                Container, previous.c.tenant, previous.c.type, previous.c.status, previous.c.has_alert,
+                previous.c.city, previous.c.country, previous.c.address
+            )
+            .execution_options(synchronize_session=False)
+        )
+        rows = list(await self.db.execute(statement))
 
+        by_id = dict(updates)
+        deltas = {}
+        updated = {}
+        for row in rows:
+            container, previous_tenant = await self._finish_update(row, by_id[row[0].id], deltas)
+            updated[container.id] = (container, previous_tenant)
+        await self.tenants.apply_counter_deltas(deltas)
         await self.db.commit()
-        await self.db.refresh(container)
-        return container
+        return [updated[container_id] for container_id, _ in updates if container_id in updated]
 
-    async def delete(self, container_id: str) -> bool:
-        container = await self.get_by_id(container_id)
-        if not container:
-            return False
+    async def delete_many(self, container_ids: List[str]) -> Tuple[List[Any], Set[str]]:
+        # A single DELETE ... RETURNING that skips containers still referenced elsewhere.
+        # Returns the deleted rows and the ids that exist but are still in use.
+        in_use = [exists().where(column == Container.id) for column in CONTAINER_DEPENDENTS]
+        statement = (
+            delete(Container)
+            .where(Container.id.in_(container_ids), *[~clause for clause in in_use])
+            .returning(Container.id, Container.tenant, Container.type, Container.status, Container.has_alert)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = list(await self.db.execute(statement))
+
+        remaining = set(container_ids) - {row.id for row in deleted}
+        blocked = set()
+        if remaining:
+            result = await self.db.execute(select(Container.id).where(Container.id.in_(remaining)))
+            blocked = set(result.scalars().all())
 
-        await self.db.delete(container)
+        deltas = {}
+        for row in deleted:
+            add_counter_delta(deltas, row.tenant, container_counter_delta(row.type, row.status, row.has_alert, -1))
+        await self.tenants.apply_counter_deltas(deltas)
         await self.db.commit()
-        return True
+        return deleted, blocked
 
     async def get_tenants(self) -> List[str]:
-        query = select(Container.tenant).distinct()
-        result = await self.db.execute(query)
-        return [tenant for tenant in result.scalars().all()]
+        return await self.tenants.get_all()
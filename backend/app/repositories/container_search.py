@@ -0,0 +1,60 @@
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.sql.elements import ColumnElement
+from typing import List
+from app.models.container import Container
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _split_terms(search: str) -> List[str]:
+    return [_escape_like(term) for term in search.split() if term]
+
+
+class IlikeContainerSearch:
+    def filter(self, search: str) -> ColumnElement:
+        return or_(
+            Container.name.ilike(f"%{search}%"),
+            Container.tenant.ilike(f"%{search}%"),
+            Container.purpose.ilike(f"%{search}%"),
+            Container.status.ilike(f"%{search}%")
+        )
+
+    def order_by(self, search: str) -> List[ColumnElement]:
+        return []
+
+
+class TrigramContainerSearch:
+    # Every term must occur in search_text, which the pg_trgm GIN index answers
+    # without a sequential scan. Name prefix matches rank first, then similarity.
+    def filter(self, search: str) -> ColumnElement:
+        terms = _split_terms(search)
+        if not terms:
+            return self._match(_escape_like(search))
+        return and_(*[self._match(term) for term in terms])
+
+    def order_by(self, search: str) -> List[ColumnElement]:
+        terms = _split_terms(search)
+        if not terms:
+            return []
+        return [
+            case((Container.name.ilike(f"{terms[0]}%", escape="\\"), 0), else_=1),
+            func.similarity(Container.name, search.strip()).desc(),
+        ]
+
+    def _match(self, term: str) -> ColumnElement:
+        return Container.search_text.ilike(f"%{term}%", escape="\\")
+
+
+SEARCH_BACKENDS = {
+    "ilike": IlikeContainerSearch,
+    "trigram": TrigramContainerSearch,
+}
+
+
+def get_container_search(name: str):
+    try:
+        return SEARCH_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown container search backend '{name}'")
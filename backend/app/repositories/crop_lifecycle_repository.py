@@ -0,0 +1,73 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, case, cast, literal, or_, true, Date
+from typing import Any, List, Optional
+from datetime import date
+from app.models.crop import Crop
+from app.core.instrumentation import instrument_repository
+
+
+def lifecycle_values(as_of: date):
+    # age, overdue_days and status as of a day, from the crop's planned and actual dates.
+    # A harvested crop keeps the age it reached and how many days late it was harvested.
+    today = literal(as_of, Date)
+    seeded = cast(Crop.seed_date, Date)
+    planned_harvest = cast(Crop.harvesting_date_planned, Date)
+    last_day = func.coalesce(cast(Crop.harvesting_date, Date), today)
+    age = case((Crop.seed_date.is_(None), None), else_=func.greatest(last_day - seeded, 0))
+    overdue_days = case(
+        (Crop.harvesting_date_planned.is_(None), None),
+        else_=func.greatest(last_day - planned_harvest, 0)
+    )
+    status = case(
+        (Crop.harvesting_date.is_not(None), "harvested"),
+        (planned_harvest < today, "overdue"),
+        (planned_harvest == today, "ready_for_harvest"),
+        (Crop.transplanted_date.is_not(None), "growing"),
+        else_="germinating"
+    )
+    return {"age": age, "overdue_days": overdue_days, "status": status}
+
+
+@instrument_repository
+class CropLifecycleRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def refresh_batch(
+        self, as_of: date, after_id: str, batch_size: int, container_id: Optional[str] = None
+    ) -> List[Any]:
+        # One statement per batch of crops in id order: the batch CTE walks the primary key,
+        # the UPDATE rewrites only crops whose derived fields differ and the outer query
+        # folds the RETURNING rows into (previous_status, status, crops) counts. Each row
+        # of the result also carries the batch's last id and size; transition columns are
+        # NULL when nothing changed. The values are computed from the row being updated
+        # rather than the CTE, so a concurrent edit of the dates is never overwritten with
+        # values derived from the old ones.
+        batch = select(Crop.id, Crop.status.label("previous_status")).where(Crop.id > after_id)
+        if container_id is not None:
+            batch = batch.where(Crop.container_id == container_id)
+        batch = batch.order_by(Crop.id).limit(batch_size).cte("batch")
+
+        values = lifecycle_values(as_of)
+        updated = (
+            update(Crop)
+            # The id range lets the planner read just the batch's index range of crops
+            .where(Crop.id > after_id, Crop.id <= select(func.max(batch.c.id)).scalar_subquery())
+            .where(Crop.id == batch.c.id)
+            .where(or_(*[getattr(Crop, name).is_distinct_from(value) for name, value in values.items()]))
+            .values(values)
+            .returning(batch.c.previous_status, Crop.status)
+            .cte("updated")
+        )
+        progress = select(func.max(batch.c.id).label("last_id"), func.count().label("scanned")).subquery("progress")
+        transitions = (
+            select(updated.c.previous_status, updated.c.status, func.count().label("crops"))
+            .group_by(updated.c.previous_status, updated.c.status)
+            .subquery("transitions")
+        )
+        query = select(
+            progress.c.last_id, progress.c.scanned,
+            transitions.c.previous_status, transitions.c.status, transitions.c.crops
+        ).select_from(progress.outerjoin(transitions, true()))
+        result = await self.db.execute(query)
+        return result.all()
@@ -0,0 +1,41 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Any, AsyncIterator, Optional, Sequence
+from datetime import date, datetime, time, timedelta
+from app.models.crop import Crop
+from app.models.crop_metric import CropMetric
+from app.core.instrumentation import instrument_repository
+
+@instrument_repository
+class CropMetricRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def export_query(
+        self,
+        crop_id: Optional[str] = None,
+        container_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ):
+        # Bounds on recorded_at let the planner skip whole monthly partitions; rows come in
+        # ix_crop_metrics_crop_recorded_at order
+        query = (
+            select(Crop.container_id, *CropMetric.__table__.columns)
+            .join(Crop, Crop.id == CropMetric.crop_id)
+            .order_by(CropMetric.crop_id, CropMetric.recorded_at)
+        )
+        if crop_id:
+            query = query.where(CropMetric.crop_id == crop_id)
+        if container_id:
+            query = query.where(Crop.container_id == container_id)
+        if start_date:
+            query = query.where(CropMetric.recorded_at >= datetime.combine(start_date, time.min))
+        if end_date:
+            query = query.where(CropMetric.recorded_at < datetime.combine(end_date + timedelta(days=1), time.min))
+        return query
+
+    async def stream_export(self, query, chunk_size: int) -> AsyncIterator[Sequence[Any]]:
+        result = await self.db.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            yield rows
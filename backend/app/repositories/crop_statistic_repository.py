@@ -0,0 +1,103 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, cast, func, Float
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from app.models.crop import Crop
+from app.models.crop_metric import CropMetric
+from app.models.crop_statistic import CropStatistic
+from app.models.crop_statistic_state import CropStatisticState
+from app.repositories.metric_rollup_repository import WatermarkSource
+from app.core.instrumentation import instrument_repository
+
+# Incremental refreshes read crop_metrics by id behind their own watermark row
+CROP_STATISTICS_SOURCE = WatermarkSource("crop_statistics", CropMetric)
+
+# Columns owned by the analytics job; the descriptive fields are never overwritten.
+# predicted_harvest_date is left alone: the readings carry no harvest target to predict it from.
+COMPUTED_COLUMNS = (
+    "avg_daily_growth_rate",
+    "max_recorded_height",
+    "total_leaf_count",
+    "predicted_yield_g",
+    "time_to_harvest_days",
+    "yield_quality_score",
+    "disease_resistance",
+    "pest_resistance",
+    "overall_health_trend",
+)
+
+@instrument_repository
+class CropStatisticRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def lock(self) -> None:
+        # Rebuilds and incremental runs must not interleave, or new rows are counted twice
+        await self.db.execute(select(func.pg_advisory_xact_lock(func.hashtext("crop_statistics"))))
+
+    async def stream_metrics(
+        self, columns: Sequence[str], chunk_size: int, low_id: Optional[int] = None, high_id: Optional[int] = None
+    ) -> AsyncIterator[Sequence[Any]]:
+        # Rows are (crop_id, recorded_at epoch seconds, *columns) in crop order, optionally
+        # limited to ids in (low_id, high_id]; the server-side cursor keeps at most one chunk in
+        # memory. A whole-table read is served in order by ix_crop_metrics_crop_recorded_at;
+        # an id range comes from each partition's primary key and only its rows are sorted.
+        query = (
+            select(CropMetric.crop_id, self._epoch_seconds(), *[getattr(CropMetric, name) for name in columns])
+            .order_by(CropMetric.crop_id, CropMetric.recorded_at)
+        )
+        if low_id is not None:
+            query = query.where(CropMetric.id > low_id)
+        if high_id is not None:
+            query = query.where(CropMetric.id <= high_id)
+        async for rows in self._stream(query, chunk_size):
+            yield rows
+
+    async def get_crop_dates(self, crop_ids: List[str]) -> Dict[str, Any]:
+        if not crop_ids:
+            return {}
+        result = await self.db.execute(
+            select(Crop.id, Crop.seed_date, Crop.harvesting_date_planned, Crop.harvesting_date)
+            .where(Crop.id.in_(crop_ids))
+        )
+        return {row.id: row for row in result}
+
+    async def get_states(self, crop_ids: List[str]) -> Dict[str, CropStatisticState]:
+        if not crop_ids:
+            return {}
+        result = await self.db.execute(select(CropStatisticState).where(CropStatisticState.crop_id.in_(crop_ids)))
+        return {state.crop_id: state for state in result.scalars()}
+
+    async def upsert(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        statement = insert(CropStatistic).values(rows)
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[CropStatistic.crop_id],
+                set_={name: statement.excluded[name] for name in COMPUTED_COLUMNS}
+            )
+        )
+
+    async def upsert_states(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        statement = insert(CropStatisticState).values(rows)
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[CropStatisticState.crop_id],
+                set_={name: statement.excluded[name] for name in rows[0] if name != "crop_id"}
+            )
+        )
+
+    async def clear_states(self) -> None:
+        await self.db.execute(delete(CropStatisticState))
+
+    @staticmethod
+    def _epoch_seconds():
+        return cast(func.extract("epoch", CropMetric.recorded_at), Float)
+
+    async def _stream(self, query, chunk_size: int) -> AsyncIterator[Sequence[Any]]:
+        result = await self.db.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            yield rows
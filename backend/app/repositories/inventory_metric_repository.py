@@ -0,0 +1,60 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, cast, distinct, literal_column, tuple_, Date, DateTime
+from typing import List, Optional
+from datetime import date
+from app.models.container import Container
+from app.models.inventory_metric import InventoryMetric
+from app.core.instrumentation import instrument_repository
+
+BUCKET_SIZES = ("day", "week", "month")
+
+@instrument_repository
+class InventoryMetricRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_performance_aggregates(
+        self,
+        start_date: date,
+        end_date: date,
+        bucket: str = "day",
+        type_filter: Optional[str] = None
+    ) -> List:
+        if bucket not in BUCKET_SIZES:
+            raise ValueError(f"Unsupported bucket size '{bucket}'")
+
+        # The unit is inlined so the GROUP BY and select list render the same expression;
+        # truncating a plain timestamp keeps bucket boundaries independent of the session time zone
+        bucket_start = cast(func.date_trunc(literal_column(f"'{bucket}'"), cast(InventoryMetric.date, DateTime)), Date)
+        utilization = (
+            func.coalesce(InventoryMetric.nursery_station_utilization, InventoryMetric.cultivation_area_utilization)
+            + func.coalesce(InventoryMetric.cultivation_area_utilization, InventoryMetric.nursery_station_utilization)
+        ) / 2.0
+
+        query = (
+            select(
+                Container.type,
+                bucket_start.label("bucket"),
+                func.grouping(bucket_start).label("is_total"),
+                func.count(distinct(Container.id)).label("container_count"),
+                func.sum(InventoryMetric.yield_kg).label("total_yield"),
+                func.avg(InventoryMetric.yield_kg).label("avg_yield"),
+                func.avg(utilization).label("avg_utilization")
+            )
+            .select_from(Container)
+            .outerjoin(
+                InventoryMetric,
+                and_(
+                    InventoryMetric.container_id == Container.id,
+                    InventoryMetric.date >= start_date,
+                    InventoryMetric.date <= end_date
+                )
+            )
+            .group_by(func.grouping_sets(tuple_(Container.type), tuple_(Container.type, bucket_start)))
+        )
+
+        if type_filter:
+            query = query.where(Container.type == type_filter)
+
+        result = await self.db.execute(query)
+        return list(result.all())
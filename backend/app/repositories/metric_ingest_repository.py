@@ -0,0 +1,51 @@
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, func
+from sqlalchemy.exc import DBAPIError
+from typing import Dict, List, Set
+from app.models.container import Container
+from app.models.crop import Crop
+from app.models.crop_metric import CropMetric
+from app.models.inventory_metric import InventoryMetric
+from app.core.instrumentation import instrument_repository
+
+INGEST_TARGETS = {
+    "crop": (CropMetric, "crop_id", Crop),
+    "inventory": (InventoryMetric, "container_id", Container),
+}
+
+@instrument_repository
+class MetricIngestRepository:
+    def __init__(self, db: AsyncSession, use_copy: bool = True):
+        self.db = db
+        self.use_copy = use_copy
+        self._has_xid = False
+
+    async def existing_parent_ids(self, kind: str, ids: Set[str]) -> Set[str]:
+        _, _, parent = INGEST_TARGETS[kind]
+        result = await self.db.execute(select(parent.id).where(parent.id.in_(ids)))
+        return set(result.scalars().all())
+
+    async def write_rows(self, kind: str, columns: List[str], rows: List[Dict]) -> None:
+        model, _, _ = INGEST_TARGETS[kind]
+        if not self._has_xid and self.db.bind.dialect.name == "postgresql":
+            # Take the transaction id before any metric id is drawn, so the rollup refresh
+            # sees this transaction as running for as long as its ids are not yet visible
+            await self.db.execute(select(func.pg_current_xact_id()))
+            self._has_xid = True
+        if self.use_copy and self.db.bind.dialect.driver == "asyncpg":
+            await self._copy_rows(model, columns, rows)
+        else:
+            # executemany over a Core insert is batched into multi-row VALUES by SQLAlchemy
+            await self.db.execute(insert(model), rows)
+
+    async def _copy_rows(self, model, columns: List[str], rows: List[Dict]) -> None:
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        records = [tuple(row[column] for column in columns) for row in rows]
+        try:
+            await raw.driver_connection.copy_records_to_table(
+                model.__tablename__, records=records, columns=columns
+            )
+        except asyncpg.PostgresError as e:
+            raise DBAPIError(f"COPY {model.__tablename__}", None, e)
@@ -0,0 +1,191 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, update, delete, cast, literal, literal_column, text, Date, DateTime
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+from app.models.inventory_metric import InventoryMetric
+from app.models.crop_metric import CropMetric
+from app.models.metric_rollup import (
+    InventoryMetricRollup, CropMetricRollup, RollupWatermark,
+    INVENTORY_ROLLUP_METRICS, CROP_ROLLUP_METRICS, ROLLUP_GRANULARITIES
+)
+from app.core.instrumentation import instrument_repository
+
+class WatermarkSource:
+    # A table consumed in id order, with its progress kept in rollup_watermarks under name
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+
+
+class RollupSource(WatermarkSource):
+    def __init__(self, name, model, key, timestamp, rollup, metrics):
+        super().__init__(name, model)
+        self.key = key
+        self.timestamp = timestamp
+        self.rollup = rollup
+        self.metrics = metrics
+
+    @property
+    def rollup_key(self):
+        return getattr(self.rollup, self.key)
+
+
+ROLLUP_SOURCES = {
+    "inventory_metrics": RollupSource(
+        "inventory_metrics", InventoryMetric, "container_id", InventoryMetric.date,
+        InventoryMetricRollup, INVENTORY_ROLLUP_METRICS
+    ),
+    "crop_metrics": RollupSource(
+        "crop_metrics", CropMetric, "crop_id", CropMetric.recorded_at,
+        CropMetricRollup, CROP_ROLLUP_METRICS
+    ),
+}
+
+
+def _truncate(unit: str, value):
+    return cast(func.date_trunc(literal_column(f"'{unit}'"), cast(value, DateTime)), Date)
+
+
+@instrument_repository
+class MetricRollupRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def lock_watermark(self, source: WatermarkSource) -> RollupWatermark:
+        await self.db.execute(
+            insert(RollupWatermark).values(source=source.name, last_id=0).on_conflict_do_nothing()
+        )
+        query = select(RollupWatermark).where(RollupWatermark.source == source.name).with_for_update()
+        return (await self.db.execute(query.execution_options(populate_existing=True))).scalar_one()
+
+    async def get_last_id(self, source: WatermarkSource) -> int:
+        result = await self.db.execute(select(RollupWatermark.last_id).where(RollupWatermark.source == source.name))
+        return result.scalar() or 0
+
+    async def set_watermark(self, source: WatermarkSource, last_id: int) -> None:
+        await self.db.execute(
+            update(RollupWatermark).where(RollupWatermark.source == source.name).values(last_id=last_id)
+        )
+
+    async def set_fence(self, source: WatermarkSource, fence_id: Optional[int], fence_xids: Optional[List[int]]) -> None:
+        await self.db.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.source == source.name)
+            .values(fence_id=fence_id, fence_xids=fence_xids)
+        )
+
+    async def get_id_horizon(self, source: WatermarkSource) -> Tuple[int, List[int]]:
+        # The highest visible id, and the ids of the other transactions running right after
+        # it was read: pg_locks is live, so a writer that committed in between is already gone
+        max_id = (await self.db.execute(select(func.max(source.model.id)))).scalar() or 0
+        result = await self.db.execute(text("""
+            SELECT transactionid::text::bigint FROM pg_locks
+            WHERE locktype = 'transactionid' AND mode = 'ExclusiveLock' AND granted
+              AND pid IS DISTINCT FROM pg_backend_pid()
+        """))
+        return max_id, list(result.scalars())
+
+    async def get_safe_id(self, source: WatermarkSource, watermark: RollupWatermark) -> int:
+        # Ids are drawn before commit, so a lower id can become visible after a higher one
+        # (ingest holds its transaction open for a whole request). The watermark only passes
+        # ids whose writers are known to have finished: every visible id when no other
+        # transaction is running, otherwise the fence recorded by an earlier pass once all
+        # transactions running back then have ended. Rows in the gap are picked up later
+        # instead of being skipped.
+        max_id, running = await self.get_id_horizon(source)
+        if not running:
+            if watermark.fence_id is not None:
+                await self.set_fence(source, None, None)
+            return max_id
+        if watermark.fence_id is not None:
+            if not set(watermark.fence_xids).isdisjoint(running):
+                return watermark.last_id
+            if watermark.last_id < watermark.fence_id:
+                return watermark.fence_id
+        if max_id > watermark.last_id:
+            await self.set_fence(source, max_id, running)
+        elif watermark.fence_id is not None:
+            await self.set_fence(source, None, None)
+        return watermark.last_id
+
+    async def reset_watermark(self, source: WatermarkSource) -> None:
+        await self.set_watermark(source, 0)
+        await self.set_fence(source, None, None)
+
+    async def apply_range(self, source: RollupSource, low_id: int, high_id: int) -> None:
+        for granularity in ROLLUP_GRANULARITIES:
+            await self.db.execute(self._merge_statement(source, granularity, low_id, high_id))
+
+    async def clear(self, source: RollupSource) -> None:
+        await self.db.execute(delete(source.rollup))
+        await self.reset_watermark(source)
+
+    async def get_series(
+        self,
+        source: RollupSource,
+        key: str,
+        start_date: date,
+        end_date: date,
+        granularity: str,
+        resolution: str
+    ) -> List[Dict]:
+        rollup = source.rollup
+        bucket = rollup.bucket_start if granularity == resolution else _truncate(resolution, rollup.bucket_start)
+
+        columns = [bucket.label("bucket")]
+        for metric in source.metrics:
+            columns += [
+                func.min(getattr(rollup, f"{metric}_min")).label(f"{metric}_min"),
+                func.max(getattr(rollup, f"{metric}_max")).label(f"{metric}_max"),
+                func.sum(getattr(rollup, f"{metric}_sum")).label(f"{metric}_sum"),
+                func.sum(getattr(rollup, f"{metric}_count")).label(f"{metric}_count"),
+            ]
+
+        query = (
+            select(*columns)
+            .where(
+                source.rollup_key == key,
+                rollup.granularity == granularity,
+                rollup.bucket_start >= start_date,
+                rollup.bucket_start <= end_date
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        result = await self.db.execute(query)
+        return [dict(row._mapping) for row in result]
+
+    def _merge_statement(self, source: RollupSource, granularity: str, low_id: int, high_id: int):
+        model = source.model
+        bucket = _truncate(granularity, source.timestamp)
+
+        columns = [source.key, "granularity", "bucket_start"]
+        aggregates = [getattr(model, source.key), literal(granularity), bucket]
+        for metric in source.metrics:
+            value = getattr(model, metric)
+            columns += [f"{metric}_min", f"{metric}_max", f"{metric}_sum", f"{metric}_count"]
+            aggregates += [func.min(value), func.max(value), func.sum(value), func.count(value)]
+
+        aggregated = (
+            select(*aggregates)
+            .where(model.id > low_id, model.id <= high_id)
+            .group_by(getattr(model, source.key), bucket)
+        )
+
+        statement = insert(source.rollup).from_select(columns, aggregated)
+        existing = source.rollup.__table__.c
+        merged = {}
+        for metric in source.metrics:
+            # LEAST/GREATEST ignore NULLs, so a bucket gaining its first reading takes it as-is
+            merged[f"{metric}_min"] = func.least(existing[f"{metric}_min"], statement.excluded[f"{metric}_min"])
+            merged[f"{metric}_max"] = func.greatest(existing[f"{metric}_max"], statement.excluded[f"{metric}_max"])
+            merged[f"{metric}_sum"] = (
+                func.coalesce(existing[f"{metric}_sum"], 0) + func.coalesce(statement.excluded[f"{metric}_sum"], 0)
+            )
+            merged[f"{metric}_count"] = existing[f"{metric}_count"] + statement.excluded[f"{metric}_count"]
+
+        return statement.on_conflict_do_update(
+            index_elements=[source.key, "granularity", "bucket_start"],
+            set_=merged
+        )
@@ -0,0 +1,107 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import List, Optional
+from datetime import date
+import re
+from app.core.instrumentation import instrument_repository
+
+# Parent table -> partition column. Partitions cover one calendar month each and are
+# named <table>_pYYYYMM; rows outside every month land in <table>_default.
+PARTITIONED_TABLES = {
+    "crop_metrics": "recorded_at",
+    "inventory_metrics": "date",
+}
+
+BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+class Partition:
+    def __init__(self, name: str, lower: Optional[date], upper: Optional[date]):
+        self.name = name
+        self.lower = lower
+        self.upper = upper
+
+    @property
+    def is_default(self) -> bool:
+        return self.lower is None
+
+    def covers(self, month: date) -> bool:
+        return not self.is_default and self.lower <= month < self.upper
+
+
+@instrument_repository
+class PartitionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_partitions(self, table: str) -> List[Partition]:
+        result = await self.db.execute(
+            text("""
+                SELECT child.relname AS name, pg_get_expr(child.relpartbound, child.oid) AS bound
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = :table
+                ORDER BY child.relname
+            """),
+            {"table": table}
+        )
+        partitions = []
+        for name, bound in result:
+            match = BOUND_PATTERN.search(bound)
+            if match is None:
+                partitions.append(Partition(name, None, None))
+            else:
+                lower, upper = (date.fromisoformat(value[:10]) for value in match.groups())
+                partitions.append(Partition(name, lower, upper))
+        return partitions
+
+    async def create_partition(self, table: str, month: date) -> str:
+        # Built standalone and attached afterwards: ATTACH only takes SHARE UPDATE EXCLUSIVE
+        # on the parent, and rows that already fell into the default partition for this
+        # month are moved across first, which CREATE ... PARTITION OF would refuse
+        column = PARTITIONED_TABLES[table]
+        name = partition_name(table, month)
+        lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+        await self.db.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+        await self.db.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {default_partition_name(table)}
+                WHERE {column} >= '{lower}' AND {column} < '{upper}'
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """))
+        await self.db.execute(
+            text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')")
+        )
+        return name
+
+    async def drop_partition(self, table: str, name: str) -> None:
+        # Retention drops whole months as a catalog change instead of a row-by-row DELETE
+        await self.db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        await self.db.execute(text(f"DROP TABLE {name}"))
+
+    async def delete_default_rows_before(self, table: str, cutoff: date) -> int:
+        column = PARTITIONED_TABLES[table]
+        result = await self.db.execute(
+            text(f"DELETE FROM {default_partition_name(table)} WHERE {column} < '{cutoff.isoformat()}'")
+        )
+        return result.rowcount
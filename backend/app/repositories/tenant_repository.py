@@ -1,13 +1,61 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
-from app.models.container import Container
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List, Optional
+from app.models.tenant import Tenant, TENANT_COUNTER_COLUMNS
+from app.core.instrumentation import instrument_repository
+import uuid
 
+TenantDeltas = Dict[str, Dict[str, int]]
+
+def container_counter_delta(
+    container_type: Optional[str], status: Optional[str], has_alert: Optional[bool], sign: int
+) -> Dict[str, int]:
+    delta = {"container_count": sign}
+    # Values may still be the schema enums when they come straight from a request
+    container_type = getattr(container_type, "value", container_type)
+    status = getattr(status, "value", status)
+    for column in (f"{container_type}_count", f"{status}_count"):
+        if column in TENANT_COUNTER_COLUMNS:
+            delta[column] = sign
+    if has_alert:
+        delta["alert_count"] = sign
+    return delta
+
+def add_counter_delta(deltas: TenantDeltas, tenant: str, delta: Dict[str, int]) -> None:
+    totals = deltas.setdefault(tenant, {})
+    for column, value in delta.items():
+        totals[column] = totals.get(column, 0) + value
+
+@instrument_repository
 class TenantRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def get_all(self) -> List[str]:
-        query = select(Container.tenant).distinct()
+        query = select(Tenant.name).where(Tenant.container_count > 0).order_by(Tenant.name)
         result = await self.db.execute(query)
         return [tenant for tenant in result.scalars().all()]
+
+    async def get_summaries(self) -> List[Tenant]:
+        query = select(Tenant).where(Tenant.container_count > 0).order_by(Tenant.name)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def apply_counter_deltas(self, deltas: TenantDeltas) -> None:
+        # Runs inside the caller's transaction, so counters commit or roll back with the write.
+        # Tenants are visited in name order to keep row locks consistently ordered.
+        for tenant in sorted(deltas):
+            delta = {column: value for column, value in deltas[tenant].items() if value}
+            if not delta:
+                continue
+            statement = insert(Tenant).values(
+                id=str(uuid.uuid4()),
+                name=tenant,
+                **{column: delta.get(column, 0) for column in TENANT_COUNTER_COLUMNS}
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[Tenant.name],
+                set_={column: getattr(Tenant, column) + value for column, value in delta.items()}
+            )
+            await self.db.execute(statement)
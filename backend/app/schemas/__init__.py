@@ -1,13 +1,24 @@
-from .container import ContainerCreate, ContainerUpdate, ContainerResponse, ContainerListResponse
-from .tenant import TenantResponse
+from .container import (
+    ContainerCreate, ContainerUpdate, ContainerResponse, ContainerListResponse,
+    ContainerBatchUpdate, ContainerBatchDelete, ContainerBatchResponse
+)
+from .tenant import TenantResponse, TenantSummaryResponse
 from .location import LocationCreate, LocationResponse
+from .metric import MetricSummary, MetricSeriesPoint, MetricSeriesResponse
 
 __all__ = [
     "ContainerCreate",
     "ContainerUpdate", 
     "ContainerResponse",
     "ContainerListResponse",
+    "ContainerBatchUpdate",
+    "ContainerBatchDelete",
+    "ContainerBatchResponse",
     "TenantResponse",
+    "TenantSummaryResponse",
     "LocationCreate",
-    "LocationResponse"
+    "LocationResponse",
+    "MetricSummary",
+    "MetricSeriesPoint",
+    "MetricSeriesResponse"
 ]
@@ -12,6 +12,13 @@ class ContainerPurpose(str, Enum):
     research = "research"
     production = "production"
 
+class BatchItemStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    conflict = "conflict"
+    not_found = "not_found"
+
 class ContainerStatus(str, Enum):
     created = "created"
     active = "active"
@@ -95,7 +102,27 @@ class ContainerResponse(BaseModel):
 
 class ContainerListResponse(BaseModel):
     containers: List[ContainerResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    facets: Optional[Dict[str, Dict[str, int]]] = None
+
+class ContainerBatchUpdate(ContainerUpdate):
+    id: str = Field(..., min_length=1)
+
+class ContainerBatchDelete(BaseModel):
+    ids: List[str]
+
+class ContainerBatchItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: BatchItemStatus
+    error: Optional[str] = None
+    container: Optional[ContainerResponse] = None
+
+class ContainerBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[ContainerBatchItemResult]
@@ -0,0 +1,78 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Dict
+from datetime import date, datetime, timezone
+
+class MetricSummary(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+    count: int = 0
+
+class MetricSeriesPoint(BaseModel):
+    bucket: date
+    values: Dict[str, MetricSummary]
+
+class MetricSeriesResponse(BaseModel):
+    resolution: str
+    source_granularity: str
+    start_date: date
+    end_date: date
+    points: List[MetricSeriesPoint]
+
+class CropMetricCreate(BaseModel):
+    crop_id: str = Field(..., min_length=1)
+    recorded_at: datetime
+    height_cm: Optional[float] = None
+    leaf_count: Optional[int] = None
+    stem_diameter_mm: Optional[float] = None
+    leaf_area_cm2: Optional[float] = None
+    biomass_g: Optional[float] = None
+    health_score: Optional[float] = None
+    disease_detected: bool = False
+    pest_detected: bool = False
+    stress_level: Optional[float] = None
+    temperature_c: Optional[float] = None
+    humidity_percent: Optional[float] = None
+    light_intensity_umol: Optional[float] = None
+    ph_level: Optional[float] = None
+    ec_level: Optional[float] = None
+    nitrogen_ppm: Optional[float] = None
+    phosphorus_ppm: Optional[float] = None
+    potassium_ppm: Optional[float] = None
+    calcium_ppm: Optional[float] = None
+    magnesium_ppm: Optional[float] = None
+
+    @field_validator("recorded_at")
+    @classmethod
+    def to_naive_utc(cls, v: datetime) -> datetime:
+        if v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+class InventoryMetricCreate(BaseModel):
+    container_id: str = Field(..., min_length=1)
+    date: date
+    nursery_station_utilization: Optional[int] = None
+    cultivation_area_utilization: Optional[int] = None
+    air_temperature: Optional[float] = None
+    humidity: Optional[int] = None
+    co2_level: Optional[int] = None
+    yield_kg: Optional[float] = None
+
+class IngestError(BaseModel):
+    index: int
+    error: str
+
+class IngestBatchResult(BaseModel):
+    batch: int
+    accepted: int
+    rejected: int
+    error: Optional[str] = None
+
+class IngestResponse(BaseModel):
+    accepted: int
+    rejected: int
+    batches: List[IngestBatchResult]
+    errors: List[IngestError]
+    errors_omitted: int = 0
+    truncated: bool = False
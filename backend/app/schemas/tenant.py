@@ -6,3 +6,18 @@ class TenantResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class TenantSummaryResponse(BaseModel):
+    id: str
+    name: str
+    container_count: int
+    physical_count: int
+    virtual_count: int
+    created_count: int
+    active_count: int
+    maintenance_count: int
+    inactive_count: int
+    alert_count: int
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,19 @@
 from .container_service import ContainerService
 from .tenant_service import TenantService
+from .metric_rollup_service import MetricRollupService
+from .metric_ingest_service import MetricIngestService
+from .partition_service import PartitionService
+from .crop_statistics_service import CropStatisticsService
+from .export_service import ExportService
+from .crop_lifecycle_service import CropLifecycleService
 
 __all__ = [
     "ContainerService",
-    "TenantService"
+    "TenantService",
+    "MetricRollupService",
+    "MetricIngestService",
+    "PartitionService",
+    "CropStatisticsService",
+    "ExportService",
+    "CropLifecycleService"
 ]
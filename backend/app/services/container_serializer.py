@@ -0,0 +1,101 @@
+from pydantic_core import to_json
+from typing import Any, Dict, Iterable, List, Optional
+from app.schemas.container import (
+    ContainerEnvironment, ContainerInventory, ContainerMetrics, ContainerSettings, LocationBase, SeedType
+)
+
+# Field mappings are resolved once at import time instead of per container
+SCALAR_FIELDS = ("id", "name", "type", "tenant", "purpose", "notes", "status", "created", "modified")
+LOCATION_FIELDS = tuple(LocationBase.model_fields)
+SEED_TYPE_FIELDS = tuple(SeedType.model_fields)
+SETTINGS_DEFAULTS = ContainerSettings().model_dump()
+ENVIRONMENT_DEFAULTS = ContainerEnvironment().model_dump()
+INVENTORY_DEFAULTS = ContainerInventory().model_dump()
+METRICS_DEFAULTS = ContainerMetrics().model_dump()
+
+
+class ContainerSerializer:
+    # Builds the ContainerResponse shape straight from ORM objects or SQL rows.
+    # The database already enforces the schema, so this skips Pydantic validation.
+
+    def to_dict(self, container: Any, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = {field: getattr(container, field) for field in SCALAR_FIELDS}
+
+        location = getattr(container, "location", None)
+        data["location"] = (
+            {field: getattr(location, field) for field in LOCATION_FIELDS} if location is not None else None
+        )
+        data["seed_types"] = [
+            {field: seed.get(field) for field in SEED_TYPE_FIELDS} for seed in container.seed_types or []
+        ]
+
+        settings = dict(SETTINGS_DEFAULTS)
+        settings["shadow_service_enabled"] = bool(container.shadow_service_enabled)
+        data["settings"] = settings
+        data["environment"] = dict(ENVIRONMENT_DEFAULTS)
+        data["inventory"] = {key: list(value) for key, value in INVENTORY_DEFAULTS.items()}
+        data["metrics"] = dict(METRICS_DEFAULTS)
+        data["has_alert"] = bool(container.has_alert)
+
+        if snapshot is not None:
+            data["inventory"]["tray_ids"] = snapshot["tray_ids"]
+            data["inventory"]["panel_ids"] = snapshot["panel_ids"]
+            metric = snapshot["latest_metric"]
+            if metric is not None:
+                self._apply_latest_metric(data, metric)
+        return data
+
+    def to_dicts(
+        self, containers: Iterable[Any], snapshots: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        if snapshots is None:
+            return [self.to_dict(container) for container in containers]
+        return [self.to_dict(container, snapshots.get(container.id)) for container in containers]
+
+    @staticmethod
+    def _apply_latest_metric(data: Dict[str, Any], metric: Any) -> None:
+        environment = data["environment"]
+        environment["air_temperature"] = metric.air_temperature
+        environment["humidity"] = metric.humidity
+        environment["co2"] = metric.co2_level
+        if metric.nursery_station_utilization is not None:
+            environment["nursery_station"] = {"utilization_percentage": metric.nursery_station_utilization}
+        if metric.cultivation_area_utilization is not None:
+            environment["cultivation_area"] = {"utilization_percentage": metric.cultivation_area_utilization}
+
+        utilization = [
+            value for value in (metric.nursery_station_utilization, metric.cultivation_area_utilization)
+            if value is not None
+        ]
+        data["metrics"]["yield_kg"] = metric.yield_kg
+        data["metrics"]["space_utilization_percentage"] = (
+            sum(utilization) / len(utilization) if utilization else None
+        )
+
+    def list_payload(
+        self,
+        containers: Iterable[Any],
+        total: Optional[int],
+        page: Optional[int],
+        size: int,
+        pages: Optional[int],
+        next_cursor: Optional[str] = None,
+        snapshots: Optional[Dict[str, Dict[str, Any]]] = None,
+        facets: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Dict[str, Any]:
+        return {
+            "containers": self.to_dicts(containers, snapshots),
+            "total": total,
+            "page": page,
+            "size": size,
+            "pages": pages,
+            "next_cursor": next_cursor,
+            "facets": facets,
+        }
+
+    @staticmethod
+    def dumps(payload: Any) -> bytes:
+        return to_json(payload)
+
+
+container_serializer = ContainerSerializer()
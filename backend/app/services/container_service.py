@@ -1,15 +1,40 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime, timedelta
 from app.repositories.container_repository import ContainerRepository
-from app.schemas.container import ContainerCreate, ContainerUpdate, ContainerResponse, ContainerListResponse
+from app.repositories.inventory_metric_repository import InventoryMetricRepository
+from app.schemas.container import (
+    ContainerCreate, ContainerUpdate, ContainerResponse, ContainerListResponse, ContainerType,
+    ContainerBatchUpdate, ContainerBatchItemResult, ContainerBatchResponse, BatchItemStatus
+)
 from app.models.container import Container
+from app.core.conditional import (
+    PreconditionFailedError, last_modified_of, split_last_modified, with_last_modified
+)
+from app.core.config import settings
+from app.core.events import EventBus, container_event, get_event_bus
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.replica import reads_own_writes
+from app.core.instrumentation import SERIALIZATION_SECONDS
+from app.core.cache import (
+    ResponseCache, get_response_cache, container_tag, tenant_tag, ALL_CONTAINERS_TAG, TENANTS_TAG
+)
+from app.services.container_serializer import container_serializer
+import hashlib
+import json
 import math
 
+MAX_PERFORMANCE_BUCKETS = 366
+CONTAINER_IN_USE_ERROR = "Container still has trays, panels, crops or metrics"
+
 class ContainerService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: Optional[ResponseCache] = None, events: Optional[EventBus] = None):
         self.db = db
         self.repository = ContainerRepository(db)
+        self.metrics_repository = InventoryMetricRepository(db)
+        self.serializer = container_serializer
+        self.cache = cache or get_response_cache()
+        self.events = events or get_event_bus()
 
     async def get_containers_with_filters(
         self,
@@ -20,34 +45,121 @@ class ContainerService:
         tenant_filter: Optional[str] = None,
         purpose_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
-        has_alerts: Optional[bool] = None
+        has_alerts: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact",
+        facets: bool = False
     ) -> ContainerListResponse:
+        payload = await self._list_payload(
+            skip=skip, limit=limit, search=search,
+            type_filter=type_filter, tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter, status_filter=status_filter,
+            has_alerts=has_alerts, cursor=cursor, total_mode=total_mode,
+            facets=facets
+        )
+        return ContainerListResponse(**payload)
+
+    async def get_containers_json(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        search: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        tenant_filter: Optional[str] = None,
+        purpose_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        has_alerts: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact",
+        facets: bool = False
+    ) -> Tuple[bytes, Optional[str]]:
+        # The encoded page and its Last-Modified, the latest modified among its containers
+        params = dict(
+            skip=skip, limit=limit, search=search,
+            type_filter=type_filter, tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter, status_filter=status_filter,
+            has_alerts=has_alerts, cursor=cursor, total_mode=total_mode,
+            facets=facets
+        )
+        # A tenant-filtered page can only change through writes to that tenant
+        tags = [tenant_tag(tenant_filter)] if tenant_filter else [ALL_CONTAINERS_TAG]
+
+        async def load() -> bytes:
+            payload = await self._list_payload(**params)
+            last_modified = last_modified_of(container["modified"] for container in payload["containers"])
+            with SERIALIZATION_SECONDS.labels("list", "encode").time():
+                return with_last_modified(self.serializer.dumps(payload), last_modified)
+
+        cached = await self.cache.get_or_load(
+            self._cache_key("containers:list", params), tags, load, refresh=reads_own_writes(self.db)
+        )
+        return split_last_modified(cached)
+
+    async def _list_payload(
+        self,
+        skip: int,
+        limit: int,
+        search: Optional[str],
+        type_filter: Optional[str],
+        tenant_filter: Optional[str],
+        purpose_filter: Optional[str],
+        status_filter: Optional[str],
+        has_alerts: Optional[bool],
+        cursor: Optional[str],
+        total_mode: str,
+        facets: bool = False
+    ) -> Dict[str, Any]:
+        position = decode_cursor(cursor) if cursor else None
+        
+        facet_counts = None
+        if facets:
+            # The facet query's grand total replaces the separate COUNT
+            facet_counts, facet_total = await self.repository.get_facets(
+                search=search,
+                type_filter=type_filter,
+                tenant_filter=tenant_filter,
+                purpose_filter=purpose_filter,
+                status_filter=status_filter,
+                has_alerts=has_alerts
+            )
+        
+        # One extra row tells us whether a next page exists without another query
         containers, total = await self.repository.get_all(
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
             search=search,
             type_filter=type_filter,
             tenant_filter=tenant_filter,
             purpose_filter=purpose_filter,
             status_filter=status_filter,
-            has_alerts=has_alerts
+            has_alerts=has_alerts,
+            cursor=position,
+            count_mode="none" if facets else total_mode
         )
+        if facets and total_mode != "none":
+            total = facet_total
         
-        container_responses = []
-        for container in containers:
-            container_response = await self._convert_to_response(container)
-            container_responses.append(container_response)
+        next_cursor = None
+        if len(containers) > limit:
+            containers = containers[:limit]
+            last = containers[-1]
+            # A (modified, id) cursor cannot continue a relevance-ordered page; those page by offset
+            if position is not None or not self.repository.ranks_search(search):
+                next_cursor = encode_cursor(last.modified, last.id)
         
-        pages = math.ceil(total / limit) if limit > 0 else 1
-        page = (skip // limit) + 1 if limit > 0 else 1
+        page = None
+        pages = None
+        if position is None:
+            page = (skip // limit) + 1 if limit > 0 else 1
+            if total is not None:
+                pages = math.ceil(total / limit) if limit > 0 else 1
         
-        return ContainerListResponse(
-            containers=container_responses,
-            total=total,
-            page=page,
-            size=limit,
-            pages=pages
-        )
+        snapshots = await self.repository.get_inventory_snapshots([container.id for container in containers])
+        with SERIALIZATION_SECONDS.labels("list", "build").time():
+            return self.serializer.list_payload(
+                containers, total=total, page=page, size=limit, pages=pages,
+                next_cursor=next_cursor, snapshots=snapshots, facets=facet_counts
+            )
 
     async def get_container_by_id(self, container_id: str) -> Optional[ContainerResponse]:
         container = await self.repository.get_by_id(container_id)
@@ -55,89 +167,267 @@ class ContainerService:
             return None
         return await self._convert_to_response(container)
 
+    async def get_container_json(self, container_id: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        async def load() -> Optional[bytes]:
+            container = await self.repository.get_by_id(container_id)
+            if not container:
+                return None
+            snapshots = await self.repository.get_inventory_snapshots([container.id])
+            with SERIALIZATION_SECONDS.labels("detail", "build").time():
+                data = self.serializer.to_dict(container, snapshots[container.id])
+            with SERIALIZATION_SECONDS.labels("detail", "encode").time():
+                return with_last_modified(self.serializer.dumps(data), last_modified_of([data["modified"]]))
+
+        cached = await self.cache.get_or_load(
+            f"container:detail:{container_id}", [container_tag(container_id)], load, refresh=reads_own_writes(self.db)
+        )
+        return split_last_modified(cached) if cached is not None else None
+
     async def create_container(self, container_data: ContainerCreate) -> ContainerResponse:
-        existing = await self.repository.get_by_name(container_data.name)
-        if existing:
-            raise ValueError(f"Container with name '{container_data.name}' already exists")
-        
         container = await self.repository.create(container_data)
-        return await self._convert_to_response(container)
+        if container is None:
+            raise ValueError(f"Container with name '{container_data.name}' already exists")
+        await self.cache.invalidate([ALL_CONTAINERS_TAG, TENANTS_TAG, tenant_tag(container.tenant)])
+        await self.events.publish([container_event("created", container)])
+        return await self._convert_to_response(container, with_inventory=False)
 
-    async def update_container(self, container_id: str, container_data: ContainerUpdate) -> Optional[ContainerResponse]:
-        container = await self.repository.update(container_id, container_data)
-        if not container:
+    async def update_container(
+        self, container_id: str, container_data: ContainerUpdate, unmodified_since: Optional[datetime] = None
+    ) -> Optional[ContainerResponse]:
+        updated = await self.repository.update(container_id, container_data, unmodified_since)
+        if updated is None:
+            # Only the failure path pays for telling a stale precondition from a missing container
+            if unmodified_since is not None and await self.repository.get_tenant(container_id) is not None:
+                raise PreconditionFailedError("Container was modified after If-Unmodified-Since")
             return None
+        container, previous_tenant = updated
+        tags = [ALL_CONTAINERS_TAG, container_tag(container_id), tenant_tag(container.tenant)]
+        if previous_tenant != container.tenant:
+            tags += [tenant_tag(previous_tenant), TENANTS_TAG]
+        await self.cache.invalidate(tags)
+        await self.events.publish([container_event("updated", container, previous_tenant)])
         return await self._convert_to_response(container)
 
     async def delete_container(self, container_id: str) -> bool:
-        return await self.repository.delete(container_id)
+        deleted, in_use = await self.repository.delete_many([container_id])
+        if in_use:
+            raise ValueError(CONTAINER_IN_USE_ERROR)
+        if not deleted:
+            return False
+        await self.cache.invalidate([
+            ALL_CONTAINERS_TAG, TENANTS_TAG, container_tag(container_id), tenant_tag(deleted[0].tenant)
+        ])
+        await self.events.publish([container_event("deleted", deleted[0])])
+        return True
 
-    async def get_performance_metrics(self, type_filter: Optional[str] = None) -> Dict[str, Any]:
-        containers, _ = await self.repository.get_all(type_filter=type_filter)
-        
-        physical_containers = [c for c in containers if c.type == "physical"]
-        virtual_containers = [c for c in containers if c.type == "virtual"]
-        
-        return {
-            "physical": {
-                "count": len(physical_containers),
-                "avg_yield": 63.0,
-                "total_yield": 81.0,
-                "avg_utilization": 80.0,
-                "yield_data": [45, 52, 63, 58, 71, 69, 75],
-                "utilization_data": [75, 82, 80, 85, 78, 83, 80]
-            },
-            "virtual": {
-                "count": len(virtual_containers),
-                "avg_yield": 45.0,
-                "total_yield": 67.0,
-                "avg_utilization": 65.0,
-                "yield_data": [32, 38, 45, 41, 52, 48, 55],
-                "utilization_data": [60, 68, 65, 70, 62, 67, 65]
+    async def create_containers(self, items: List[ContainerCreate]) -> ContainerBatchResponse:
+        self._check_batch_size(items)
+        results: Dict[int, ContainerBatchItemResult] = {}
+        existing = await self.repository.get_existing_names([item.name for item in items])
+        accepted = {}
+        for index, item in enumerate(items):
+            if item.name in existing:
+                results[index] = self._batch_failure(
+                    index, BatchItemStatus.conflict, f"Container with name '{item.name}' already exists"
+                )
+            elif item.name in accepted:
+                results[index] = self._batch_failure(
+                    index, BatchItemStatus.conflict, f"Duplicate name '{item.name}' in batch"
+                )
+            else:
+                accepted[item.name] = index
+
+        containers = await self.repository.create_many([items[index] for index in accepted.values()]) if accepted else []
+        by_name = {container.name: container for container in containers}
+        for name, index in accepted.items():
+            container = by_name.get(name)
+            if container is None:
+                results[index] = self._batch_failure(
+                    index, BatchItemStatus.conflict, f"Container with name '{name}' already exists"
+                )
+            else:
+                results[index] = self._batch_success(index, BatchItemStatus.created, container)
+
+        tenants = {container.tenant for container in containers}
+        if containers:
+            await self.cache.invalidate([ALL_CONTAINERS_TAG, TENANTS_TAG] + [tenant_tag(tenant) for tenant in tenants])
+            await self.events.publish([container_event("created", container) for container in containers])
+        return self._batch_response(results)
+
+    async def update_containers(self, items: List[ContainerBatchUpdate]) -> ContainerBatchResponse:
+        self._check_batch_size(items)
+        results: Dict[int, ContainerBatchItemResult] = {}
+        accepted = {}
+        for index, item in enumerate(items):
+            if item.id in accepted:
+                results[index] = self._batch_failure(
+                    index, BatchItemStatus.conflict, f"Duplicate id '{item.id}' in batch", item.id
+                )
+            else:
+                accepted[item.id] = index
+
+        updated = await self.repository.update_many([(items[index].id, items[index]) for index in accepted.values()])
+        snapshots = await self.repository.get_inventory_snapshots([container.id for container, _ in updated])
+        tags = {ALL_CONTAINERS_TAG}
+        for container, previous_tenant in updated:
+            index = accepted.pop(container.id)
+            results[index] = self._batch_success(index, BatchItemStatus.updated, container, snapshots[container.id])
+            tags.update([container_tag(container.id), tenant_tag(container.tenant)])
+            if previous_tenant != container.tenant:
+                tags.update([tenant_tag(previous_tenant), TENANTS_TAG])
+        for container_id, index in accepted.items():
+            results[index] = self._batch_failure(index, BatchItemStatus.not_found, "Container not found", container_id)
+
+        if updated:
+            await self.cache.invalidate(sorted(tags))
+            await self.events.publish([
+                container_event("updated", container, previous_tenant) for container, previous_tenant in updated
+            ])
+        return self._batch_response(results)
+
+    async def delete_containers(self, container_ids: List[str]) -> ContainerBatchResponse:
+        self._check_batch_size(container_ids)
+        deleted, in_use = await self.repository.delete_many(list(dict.fromkeys(container_ids)))
+        deleted_ids = {row.id for row in deleted}
+        results: Dict[int, ContainerBatchItemResult] = {}
+        reported = set()
+        for index, container_id in enumerate(container_ids):
+            if container_id in reported:
+                results[index] = self._batch_failure(
+                    index, BatchItemStatus.conflict, f"Duplicate id '{container_id}' in batch", container_id
+                )
+            elif container_id in deleted_ids:
+                results[index] = ContainerBatchItemResult(index=index, id=container_id, status=BatchItemStatus.deleted)
+            elif container_id in in_use:
+                results[index] = self._batch_failure(index, BatchItemStatus.conflict, CONTAINER_IN_USE_ERROR, container_id)
+            else:
+                results[index] = self._batch_failure(index, BatchItemStatus.not_found, "Container not found", container_id)
+            reported.add(container_id)
+
+        if deleted:
+            tags = {ALL_CONTAINERS_TAG, TENANTS_TAG}
+            for row in deleted:
+                tags.update([container_tag(row.id), tenant_tag(row.tenant)])
+            await self.cache.invalidate(sorted(tags))
+            await self.events.publish([container_event("deleted", row) for row in deleted])
+        return self._batch_response(results)
+
+    @staticmethod
+    def _check_batch_size(items: List) -> None:
+        if not items:
+            raise ValueError("Batch must contain at least one item")
+        if len(items) > settings.CONTAINER_BATCH_MAX_ITEMS:
+            raise ValueError(f"Batch exceeds {settings.CONTAINER_BATCH_MAX_ITEMS} items")
+
+    def _batch_success(
+        self, index: int, status: BatchItemStatus, container: Container, snapshot: Optional[Dict[str, Any]] = None
+    ) -> ContainerBatchItemResult:
+        with SERIALIZATION_SECONDS.labels("batch", "build").time():
+            response = ContainerResponse(**self.serializer.to_dict(container, snapshot))
+        return ContainerBatchItemResult(index=index, id=container.id, status=status, container=response)
+
+    @staticmethod
+    def _batch_failure(
+        index: int, status: BatchItemStatus, error: str, container_id: Optional[str] = None
+    ) -> ContainerBatchItemResult:
+        return ContainerBatchItemResult(index=index, id=container_id, status=status, error=error)
+
+    @staticmethod
+    def _batch_response(results: Dict[int, ContainerBatchItemResult]) -> ContainerBatchResponse:
+        ordered = [results[index] for index in sorted(results)]
+        failed = sum(1 for result in ordered if result.error is not None)
+        return ContainerBatchResponse(succeeded=len(ordered) - failed, failed=failed, results=ordered)
+
+    async def get_performance_metrics(
+        self,
+        type_filter: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        bucket: str = "day"
+    ) -> Dict[str, Any]:
+        end_date = end_date or datetime.utcnow().date()
+        start_date = start_date or end_date - timedelta(days=6)
+        if start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+
+        buckets = self._bucket_starts(start_date, end_date, bucket)
+        if len(buckets) > MAX_PERFORMANCE_BUCKETS:
+            raise ValueError(f"Requested window spans more than {MAX_PERFORMANCE_BUCKETS} buckets")
+
+        rows = await self.metrics_repository.get_performance_aggregates(
+            start_date=start_date,
+            end_date=end_date,
+            bucket=bucket,
+            type_filter=type_filter
+        )
+
+        bucket_index = {bucket_start: i for i, bucket_start in enumerate(buckets)}
+        performance = {
+            container_type.value: {
+                "count": 0,
+                "avg_yield": 0.0,
+                "total_yield": 0.0,
+                "avg_utilization": 0.0,
+                "yield_data": [0.0] * len(buckets),
+                "utilization_data": [0.0] * len(buckets)
             }
+            for container_type in ContainerType
         }
 
-    async def _convert_to_response(self, container: Container) -> ContainerResponse:
-        location_data = None
-        if container.location:
-            location_data = {
-                "city": container.location.city,
-                "country": container.location.country,
-                "address": container.location.address
-            }
+        for row in rows:
+            summary = performance.get(row.type)
+            if summary is None:
+                continue
+            if row.is_total:
+                summary["count"] = row.container_count
+                summary["avg_yield"] = self._round(row.avg_yield)
+                summary["total_yield"] = self._round(row.total_yield)
+                summary["avg_utilization"] = self._round(row.avg_utilization)
+            elif row.bucket is not None:
+                i = bucket_index.get(row.bucket)
+                if i is not None:
+                    summary["yield_data"][i] = self._round(row.total_yield)
+                    summary["utilization_data"][i] = self._round(row.avg_utilization)
 
-        return ContainerResponse(
-            id=container.id,
-            name=container.name,
-            type=container.type,
-            tenant=container.tenant,
-            purpose=container.purpose,
-            seed_types=container.seed_types or [],
-            location=location_data,
-            notes=container.notes,
-            settings={
-                "shadow_service_enabled": container.shadow_service_enabled,
-                "copied_environment_from": None,
-                "robotics_simulation_enabled": None,
-                "ecosystem": None
-            },
-            environment={
-                "air_temperature": None,
-                "humidity": None,
-                "co2": None,
-                "nursery_station": None,
-                "cultivation_area": None
-            },
-            inventory={
-                "tray_ids": [],
-                "panel_ids": []
-            },
-            metrics={
-                "yield_kg": None,
-                "space_utilization_percentage": None
-            },
-            status=container.status,
-            created=container.created,
-            modified=container.modified,
-            has_alert=container.has_alert
-        )
+        performance["labels"] = [bucket_start.isoformat() for bucket_start in buckets]
+        performance["bucket"] = bucket
+        performance["start_date"] = start_date.isoformat()
+        performance["end_date"] = end_date.isoformat()
+        return performance
+
+    @staticmethod
+    def _bucket_starts(start_date: date, end_date: date, bucket: str) -> List[date]:
+        if bucket == "week":
+            current = start_date - timedelta(days=start_date.weekday())
+        elif bucket == "month":
+            current = start_date.replace(day=1)
+        else:
+            current = start_date
+
+        buckets = []
+        while current <= end_date and len(buckets) <= MAX_PERFORMANCE_BUCKETS:
+            buckets.append(current)
+            if bucket == "week":
+                current += timedelta(days=7)
+            elif bucket == "month":
+                current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+            else:
+                current += timedelta(days=1)
+        return buckets
+
+    @staticmethod
+    def _cache_key(prefix: str, params: Dict[str, Any]) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{prefix}:{digest}"
+
+    @staticmethod
+    def _round(value: Optional[float]) -> float:
+        return round(float(value), 2) if value is not None else 0.0
+
+    async def _convert_to_response(self, container: Container, with_inventory: bool = True) -> ContainerResponse:
+        snapshot = None
+        if with_inventory:
+            snapshots = await self.repository.get_inventory_snapshots([container.id])
+            snapshot = snapshots[container.id]
+        with SERIALIZATION_SECONDS.labels("response", "build").time():
+            return ContainerResponse(**self.serializer.to_dict(container, snapshot))
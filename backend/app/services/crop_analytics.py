@@ -0,0 +1,206 @@
+import numpy as np
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence
+
+# Per-crop statistics are kept as additive sufficient statistics (counts, sums, sums of
+# squares and cross products, maxima), so any split of a crop's readings across chunks
+# or runs merges back into exactly the same result. Times are days relative to a fixed
+# per-crop origin, its first reading, which keeps the regression sums well conditioned.
+
+REGRESSED_METRICS = ("height_cm", "biomass_g", "health_score")
+MAX_METRICS = ("height_cm", "biomass_g", "leaf_count")
+FLAG_METRICS = ("disease_detected", "pest_detected")
+METRIC_COLUMNS = ("height_cm", "biomass_g", "health_score", "leaf_count", "disease_detected", "pest_detected")
+
+SUM_FIELDS = ("rows",) + tuple(
+    f"{metric}_{term}" for metric in REGRESSED_METRICS for term in ("n", "t", "tt", "y", "ty")
+) + tuple(f"{metric}_count" for metric in FLAG_METRICS)
+# high_water_mark is the newest recorded_at in epoch seconds, kept exact for incremental runs
+MAX_FIELDS = tuple(f"{metric}_max" for metric in MAX_METRICS) + ("last_t", "high_water_mark")
+STAT_FIELDS = SUM_FIELDS + MAX_FIELDS
+
+HEALTH_TREND_THRESHOLD = 0.005
+SECONDS_PER_DAY = 86_400.0
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def to_days(values: Sequence[Optional[datetime]]) -> np.ndarray:
+    stamps = np.array(values, dtype="datetime64[us]")
+    return np.where(np.isnat(stamps), np.nan, stamps.astype(np.int64) / MICROSECONDS_PER_DAY)
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    # Rows arrive sorted by crop, so each crop is one contiguous run
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+
+def summarize(
+    starts: np.ndarray, seconds: np.ndarray, t: np.ndarray, columns: Dict[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    stats = {"rows": np.diff(np.r_[starts, len(t)]).astype(np.float64)}
+    for metric in REGRESSED_METRICS:
+        y = columns[metric]
+        present = ~np.isnan(y)
+        ty = np.where(present, t, 0.0)
+        yy = np.where(present, y, 0.0)
+        stats[f"{metric}_n"] = np.add.reduceat(present.astype(np.float64), starts)
+        stats[f"{metric}_t"] = np.add.reduceat(ty, starts)
+        stats[f"{metric}_tt"] = np.add.reduceat(ty * ty, starts)
+        stats[f"{metric}_y"] = np.add.reduceat(yy, starts)
+        stats[f"{metric}_ty"] = np.add.reduceat(ty * yy, starts)
+    for metric in FLAG_METRICS:
+        stats[f"{metric}_count"] = np.add.reduceat(np.nan_to_num(columns[metric]), starts)
+    for metric in MAX_METRICS:
+        # fmax ignores NaN unless a crop has no reading at all for the metric
+        stats[f"{metric}_max"] = np.fmax.reduceat(columns[metric], starts)
+    stats["last_t"] = np.maximum.reduceat(t, starts)
+    stats["high_water_mark"] = np.maximum.reduceat(seconds, starts)
+    return stats
+
+
+def merge(left: Dict[str, np.ndarray], right: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    merged = {field: left[field] + right[field] for field in SUM_FIELDS}
+    for field in MAX_FIELDS:
+        merged[field] = np.fmax(left[field], right[field])
+    return merged
+
+
+def shift(stats: Dict[str, np.ndarray], delta: np.ndarray) -> Dict[str, np.ndarray]:
+    # Re-expresses statistics with t measured from an origin `delta` days earlier
+    shifted = dict(stats)
+    for metric in REGRESSED_METRICS:
+        n, st, sy = stats[f"{metric}_n"], stats[f"{metric}_t"], stats[f"{metric}_y"]
+        shifted[f"{metric}_t"] = st + n * delta
+        shifted[f"{metric}_tt"] = stats[f"{metric}_tt"] + 2.0 * delta * st + n * delta * delta
+        shifted[f"{metric}_ty"] = stats[f"{metric}_ty"] + delta * sy
+    shifted["last_t"] = stats["last_t"] + delta
+    return shifted
+
+
+def empty(size: int) -> Dict[str, np.ndarray]:
+    # Identity for merge: zero sums and NaN maxima
+    stats = {field: np.zeros(size) for field in SUM_FIELDS}
+    stats.update({field: np.full(size, np.nan) for field in MAX_FIELDS})
+    return stats
+
+
+def take(stats: Dict[str, np.ndarray], index) -> Dict[str, np.ndarray]:
+    return {field: np.atleast_1d(values[index]) for field, values in stats.items()}
+
+
+def concat(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    return {field: np.concatenate([part[field] for part in parts]) for field in STAT_FIELDS}
+
+
+class StatsBatch:
+    def __init__(self, crop_ids: np.ndarray, origins: np.ndarray, stats: Dict[str, np.ndarray]):
+        self.crop_ids = crop_ids
+        self.origins = origins
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self.crop_ids)
+
+
+def chunk_columns(rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    # Rows are (crop_id, recorded_at as epoch seconds, *METRIC_COLUMNS); None becomes NaN.
+    # Converting datetimes in Python costs more than all of the statistics, so the
+    # database sends epoch seconds instead.
+    # Column-at-a-time itemgetter is several times faster than transposing with zip(*rows).
+    def column(index: int) -> list:
+        return list(map(itemgetter(index), rows))
+
+    columns = {
+        name: np.array(column(index), dtype=np.float64) for index, name in enumerate(METRIC_COLUMNS, start=2)
+    }
+    seconds = np.array(column(1), dtype=np.float64)
+    return {"crop_ids": np.array(column(0), dtype=object), "seconds": seconds, "columns": columns}
+
+
+class CropStatsAccumulator:
+    # Consumes chunks sorted by (crop_id, recorded_at). Only the last crop of a chunk can
+    # continue into the next one, so it is held back and every other crop is complete.
+    def __init__(self):
+        self._pending: Optional[StatsBatch] = None
+
+    def feed(self, rows: Sequence[Sequence[Any]]) -> StatsBatch:
+        chunk = chunk_columns(rows)
+        return self.feed_columns(chunk["crop_ids"], chunk["seconds"], chunk["columns"])
+
+    def feed_columns(self, crop_ids: np.ndarray, seconds: np.ndarray, columns: Dict[str, np.ndarray]) -> StatsBatch:
+        batch = self.summarize_chunk(crop_ids, seconds, columns)
+        if self._pending is not None and batch.crop_ids[0] == self._pending.crop_ids[0]:
+            first = merge(self._pending.stats, take(batch.stats, slice(0, 1)))
+            batch.stats = concat([first, take(batch.stats, slice(1, None))])
+            self._pending = None
+        completed = self._pending
+        last = len(batch) - 1
+        self._pending = StatsBatch(batch.crop_ids[last:], batch.origins[last:], take(batch.stats, slice(last, None)))
+        ready = StatsBatch(batch.crop_ids[:last], batch.origins[:last], take(batch.stats, slice(0, last)))
+        if completed is not None:
+            ready = StatsBatch(
+                np.concatenate([completed.crop_ids, ready.crop_ids]),
+                np.concatenate([completed.origins, ready.origins]),
+                concat([completed.stats, ready.stats])
+            )
+        return ready
+
+    def flush(self) -> Optional[StatsBatch]:
+        pending, self._pending = self._pending, None
+        return pending
+
+    def summarize_chunk(self, crop_ids: np.ndarray, seconds: np.ndarray, columns: Dict[str, np.ndarray]) -> StatsBatch:
+        days = seconds / SECONDS_PER_DAY
+        starts = group_starts(crop_ids)
+        origins = days[starts].copy()
+        if self._pending is not None and crop_ids[0] == self._pending.crop_ids[0]:
+            origins[0] = self._pending.origins[0]
+        t = days - np.repeat(origins, np.diff(np.r_[starts, len(days)]))
+        return StatsBatch(crop_ids[starts], origins, summarize(starts, seconds, t, columns))
+
+
+def regression(stats: Dict[str, np.ndarray], metric: str):
+    n = stats[f"{metric}_n"]
+    st, stt = stats[f"{metric}_t"], stats[f"{metric}_tt"]
+    sy, sty = stats[f"{metric}_y"], stats[f"{metric}_ty"]
+    denominator = n * stt - st * st
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # A single reading, or readings all at one instant, has no slope
+        slope = np.where(denominator > 1e-9 * np.maximum(n * stt, 1.0), (n * sty - st * sy) / denominator, np.nan)
+        intercept = np.where(n > 0, (sy - np.nan_to_num(slope) * st) / n, np.nan)
+    return slope, intercept
+
+
+def finalize(batch: StatsBatch, harvest_days: np.ndarray) -> Dict[str, np.ndarray]:
+    # harvest_days: actual or planned harvest per crop in days since the epoch, NaN if unknown
+    stats = batch.stats
+    growth_rate, _ = regression(stats, "height_cm")
+    biomass_slope, biomass_intercept = regression(stats, "biomass_g")
+    health_slope, _ = regression(stats, "health_score")
+
+    # Biomass is extrapolated to the harvest date, or read off the trend at the last reading
+    target_t = np.where(np.isnan(harvest_days), stats["last_t"], harvest_days - batch.origins)
+    predicted_yield = np.clip(biomass_intercept + np.nan_to_num(biomass_slope) * target_t, 0.0, None)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_health = stats["health_score_y"] / stats["health_score_n"]
+        relative_health_slope = health_slope / np.abs(mean_health)
+        disease_resistance = 1.0 - stats["disease_detected_count"] / stats["rows"]
+        pest_resistance = 1.0 - stats["pest_detected_count"] / stats["rows"]
+
+    trend = np.full(len(batch), None, dtype=object)
+    trend[np.isfinite(relative_health_slope)] = "stable"
+    trend[relative_health_slope > HEALTH_TREND_THRESHOLD] = "improving"
+    trend[relative_health_slope < -HEALTH_TREND_THRESHOLD] = "declining"
+
+    return {
+        "avg_daily_growth_rate": growth_rate,
+        "max_recorded_height": stats["height_cm_max"],
+        "total_leaf_count": stats["leaf_count_max"],
+        "predicted_yield_g": predicted_yield,
+        "yield_quality_score": mean_health,
+        "disease_resistance": disease_resistance,
+        "pest_resistance": pest_resistance,
+        "overall_health_trend": trend,
+    }
@@ -0,0 +1,49 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional, Tuple
+from datetime import date, datetime
+from app.repositories.crop_lifecycle_repository import CropLifecycleRepository
+
+LIFECYCLE_BATCH_SIZE = 50_000
+
+class CropLifecycleService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = CropLifecycleRepository(db)
+
+    async def refresh(
+        self, as_of: Optional[date] = None, container_id: Optional[str] = None, batch_size: int = LIFECYCLE_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        # Recomputes age, overdue_days and status for every crop, or one container's crops.
+        # Each batch commits on its own so row locks are short-lived and an interrupted run
+        # has still stored its progress; rerunning is safe because unchanged rows are skipped.
+        as_of = as_of or datetime.utcnow().date()
+        scanned = 0
+        updated = 0
+        transitions: Dict[Tuple[str, str], int] = {}
+        after_id = ""
+        while True:
+            rows = await self.repository.refresh_batch(as_of, after_id, batch_size, container_id)
+            await self.db.commit()
+            batch_scanned = rows[0].scanned
+            scanned += batch_scanned
+            for row in rows:
+                if row.crops is None:
+                    continue
+                updated += row.crops
+                if row.previous_status != row.status:
+                    key = (row.previous_status, row.status)
+                    transitions[key] = transitions.get(key, 0) + row.crops
+            if batch_scanned < batch_size:
+                break
+            after_id = rows[0].last_id
+
+        return {
+            "as_of": as_of.isoformat(),
+            "crops": scanned,
+            "updated": updated,
+            "status_changes": sum(transitions.values()),
+            "transitions": [
+                {"from": previous, "to": status, "crops": crops}
+                for (previous, status), crops in sorted(transitions.items(), key=lambda item: -item[1])
+            ],
+        }
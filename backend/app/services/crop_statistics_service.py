@@ -0,0 +1,184 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import math
+import numpy as np
+from app.repositories.crop_statistic_repository import CropStatisticRepository, CROP_STATISTICS_SOURCE
+from app.repositories.metric_rollup_repository import MetricRollupRepository
+from app.services.crop_analytics import (
+    CropStatsAccumulator, StatsBatch, METRIC_COLUMNS, STAT_FIELDS, empty, finalize, merge, shift, to_days
+)
+
+STATISTICS_CHUNK_SIZE = 50_000
+UPSERT_BATCH_SIZE = 1_000
+CHECK_TOLERANCE = 1e-6
+CHECK_REPORT_LIMIT = 20
+
+class CropStatisticsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = CropStatisticRepository(db)
+        self.watermarks = MetricRollupRepository(db)
+
+    async def rebuild(self, chunk_size: int = STATISTICS_CHUNK_SIZE) -> Dict[str, int]:
+        # Drops every stored state and rewinds the watermark, then folds in everything up to
+        # the safe id in one streaming pass. Completed crops are upserted as each chunk is
+        # consumed and everything commits together at the end.
+        await self.repository.lock()
+        await self.watermarks.lock_watermark(CROP_STATISTICS_SOURCE)
+        await self.repository.clear_states()
+        await self.watermarks.reset_watermark(CROP_STATISTICS_SOURCE)
+        return await self._advance(chunk_size, self._store)
+
+    async def refresh(self, chunk_size: int = STATISTICS_CHUNK_SIZE) -> Dict[str, int]:
+        # Folds the metric rows written since the last run into the stored state of their
+        # crops, so the work is proportional to the new rows and crops without them are not
+        # read. The statistics are additive, so a reading recorded before ones already
+        # folded in still merges into the same result as a rebuild.
+        await self.repository.lock()
+        return await self._advance(chunk_size, self._store_increment)
+
+    async def _advance(self, chunk_size: int, handle) -> Dict[str, int]:
+        # Rows are taken by id up to the same committed-id horizon the rollups use, so a row
+        # whose transaction was still open is picked up by a later run rather than skipped
+        watermark = await self.watermarks.lock_watermark(CROP_STATISTICS_SOURCE)
+        low_id = watermark.last_id
+        high_id = await self.watermarks.get_safe_id(CROP_STATISTICS_SOURCE, watermark)
+        result = {"rows": 0, "crops": 0}
+        if high_id > low_id:
+            result = await self._consume(
+                self.repository.stream_metrics(METRIC_COLUMNS, chunk_size, low_id, high_id), handle
+            )
+            await self.watermarks.set_watermark(CROP_STATISTICS_SOURCE, high_id)
+        await self.db.commit()
+        return result
+
+    async def check(self, chunk_size: int = STATISTICS_CHUNK_SIZE) -> Dict[str, Any]:
+        # Recomputes every crop from the rows folded in so far, without writing, and compares
+        # it with the stored state
+        report = {"crops": 0, "mismatched": 0, "missing_state": 0, "examples": []}
+
+        async def compare(batch: StatsBatch) -> int:
+            states = await self.repository.get_states(batch.crop_ids.tolist())
+            stored, has_state, origins = self._state_arrays(batch, states)
+            # Express the fresh statistics from the stored origin before comparing
+            fresh = shift(batch.stats, np.where(has_state, batch.origins - origins, 0.0))
+            differs = np.zeros(len(batch), dtype=bool)
+            fields = [[] for _ in range(len(batch))]
+            for field in STAT_FIELDS:
+                close = np.isclose(fresh[field], stored[field], rtol=CHECK_TOLERANCE, atol=CHECK_TOLERANCE, equal_nan=True)
+                for i in np.flatnonzero(~close & has_state):
+                    fields[i].append(field)
+                differs |= ~close
+            differs &= has_state
+            report["missing_state"] += int((~has_state).sum())
+            report["mismatched"] += int(differs.sum())
+            for i in np.flatnonzero(differs | ~has_state):
+                if len(report["examples"]) >= CHECK_REPORT_LIMIT:
+                    break
+                report["examples"].append({
+                    "crop_id": batch.crop_ids[i],
+                    "fields": fields[i] if has_state[i] else ["missing_state"],
+                })
+            return len(batch)
+
+        last_id = await self.watermarks.get_last_id(CROP_STATISTICS_SOURCE)
+        result = await self._consume(
+            self.repository.stream_metrics(METRIC_COLUMNS, chunk_size, high_id=last_id), compare
+        )
+        report["crops"] = result["crops"]
+        await self.db.rollback()
+        return report
+
+    async def _consume(self, chunks, handle) -> Dict[str, int]:
+        accumulator = CropStatsAccumulator()
+        rows = 0
+        crops = 0
+        async for chunk in chunks:
+            rows += len(chunk)
+            crops += await self._in_batches(accumulator.feed(chunk), handle)
+        pending = accumulator.flush()
+        if pending is not None:
+            crops += await self._in_batches(pending, handle)
+        return {"rows": rows, "crops": crops}
+
+    @staticmethod
+    async def _in_batches(batch: StatsBatch, handle) -> int:
+        handled = 0
+        for start in range(0, len(batch), UPSERT_BATCH_SIZE):
+            part = slice(start, start + UPSERT_BATCH_SIZE)
+            handled += await handle(StatsBatch(
+                batch.crop_ids[part], batch.origins[part], {field: values[part] for field, values in batch.stats.items()}
+            ))
+        return handled
+
+    async def _store_increment(self, batch: StatsBatch) -> int:
+        states = await self.repository.get_states(batch.crop_ids.tolist())
+        stored, has_state, origins = self._state_arrays(batch, states)
+        # New readings were summarized from their own first reading; move them onto the stored origin
+        increment = shift(batch.stats, np.where(has_state, batch.origins - origins, 0.0))
+        return await self._store(StatsBatch(batch.crop_ids, origins, merge(stored, increment)))
+
+    async def _store(self, batch: StatsBatch) -> int:
+        await self.repository.upsert(await self._statistics_rows(batch))
+        now = datetime.utcnow()
+        columns = {field: values.tolist() for field, values in batch.stats.items()}
+        origins = batch.origins.tolist()
+        await self.repository.upsert_states([
+            {
+                "crop_id": crop_id,
+                "origin_days": origins[i],
+                "updated_at": now,
+                **{field: self._clean(values[i]) for field, values in columns.items()},
+            }
+            for i, crop_id in enumerate(batch.crop_ids.tolist())
+        ])
+        return len(batch)
+
+    @staticmethod
+    def _state_arrays(batch: StatsBatch, states: Dict[str, Any]):
+        stored = empty(len(batch))
+        has_state = np.zeros(len(batch), dtype=bool)
+        origins = batch.origins.copy()
+        for i, crop_id in enumerate(batch.crop_ids.tolist()):
+            state = states.get(crop_id)
+            if state is None:
+                continue
+            has_state[i] = True
+            origins[i] = state.origin_days
+            for field in STAT_FIELDS:
+                value = getattr(state, field)
+                stored[field][i] = value if value is not None else np.nan
+        return stored, has_state, origins
+
+    async def _statistics_rows(self, batch: StatsBatch) -> List[Dict[str, Any]]:
+        crop_ids = batch.crop_ids.tolist()
+        crop_dates = await self.repository.get_crop_dates(crop_ids)
+        harvest_dates = [self._harvest_date(crop_dates.get(crop_id)) for crop_id in crop_ids]
+        computed = {name: values.tolist() for name, values in finalize(batch, to_days(harvest_dates)).items()}
+
+        rows = []
+        for i, crop_id in enumerate(crop_ids):
+            row = {name: self._clean(values[i]) for name, values in computed.items()}
+            leaf_count = row["total_leaf_count"]
+            row["total_leaf_count"] = int(leaf_count) if leaf_count is not None else None
+            row["crop_id"] = crop_id
+            crop = crop_dates.get(crop_id)
+            row["time_to_harvest_days"] = (
+                (harvest_dates[i] - crop.seed_date).days
+                if harvest_dates[i] is not None and crop.seed_date is not None else None
+            )
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _harvest_date(crop: Any) -> Optional[datetime]:
+        if crop is None:
+            return None
+        return crop.harvesting_date or crop.harvesting_date_planned
+
+    @staticmethod
+    def _clean(value: Any) -> Any:
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
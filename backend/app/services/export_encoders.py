@@ -0,0 +1,157 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from pydantic_core import to_json
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, Numeric
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Incremental encoders for streamed exports: each chunk of rows becomes one piece of the
+# response body, so memory use is bounded by the chunk size rather than the result size.
+# Columns are (name, kind) pairs, with kind one of string, int, float, bool, datetime or
+# json; json values are nested structures, written as JSON text in CSV and Arrow.
+
+Columns = Sequence[Tuple[str, str]]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+EXPORT_EXTENSIONS = {"ndjson": "ndjson", "csv": "csv", "arrow": "arrows"}
+
+
+def export_columns(query) -> List[Tuple[str, str]]:
+    return [(column.name, _column_kind(column.type)) for column in query.selected_columns]
+
+
+def _column_kind(sql_type) -> str:
+    if isinstance(sql_type, Boolean):
+        return "bool"
+    if isinstance(sql_type, Integer):
+        return "int"
+    if isinstance(sql_type, (Float, Numeric)):
+        return "float"
+    if isinstance(sql_type, DateTime):
+        return "datetime"
+    if isinstance(sql_type, JSON):
+        return "json"
+    return "string"
+
+
+class NDJSONEncoder:
+    def __init__(self, columns: Columns):
+        self.names = [name for name, _ in columns]
+
+    def start(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return b"".join(to_json(dict(zip(self.names, row))) + b"\n" for row in rows)
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CSVEncoder:
+    def __init__(self, columns: Columns):
+        self.names = [name for name, _ in columns]
+        self.json_positions = [i for i, (_, kind) in enumerate(columns) if kind == "json"]
+
+    def start(self) -> bytes:
+        return self._write([self.names])
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return self._write(self._values(row) for row in rows)
+
+    def finish(self) -> bytes:
+        return b""
+
+    def _values(self, row: Sequence[Any]) -> List[Any]:
+        values = list(row)
+        for i in self.json_positions:
+            if values[i] is not None:
+                values[i] = json.dumps(values[i], separators=(",", ":"))
+        for i, value in enumerate(values):
+            if isinstance(value, bool):
+                values[i] = "true" if value else "false"
+            elif isinstance(value, (datetime, date)):
+                values[i] = value.isoformat()
+        return values
+
+    @staticmethod
+    def _write(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    # File object for the Arrow stream writer; whatever it wrote since the last drain()
+    # is the next piece of the response
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ArrowEncoder:
+    def __init__(self, columns: Columns):
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise RuntimeError("Arrow export requires the 'pyarrow' package") from e
+        self.pa = pyarrow
+        types = {
+            "string": pyarrow.string(),
+            "int": pyarrow.int64(),
+            "float": pyarrow.float64(),
+            "bool": pyarrow.bool_(),
+            "datetime": pyarrow.timestamp("us"),
+            "json": pyarrow.string(),
+        }
+        self.columns = list(columns)
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in self.columns])
+        self.sink = _ChunkSink()
+        self.writer = None
+
+    def start(self) -> bytes:
+        self.writer = self.pa.ipc.new_stream(self.sink, self.schema)
+        return self.sink.drain()
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        arrays = []
+        for i, (_, kind) in enumerate(self.columns):
+            values = [row[i] for row in rows]
+            if kind == "json":
+                values = [None if value is None else json.dumps(value, separators=(",", ":")) for value in values]
+            elif kind == "string":
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(self.pa.array(values, type=self.schema.field(i).type))
+        self.writer.write_batch(self.pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+ENCODERS: Dict[str, type] = {
+    "ndjson": NDJSONEncoder,
+    "csv": CSVEncoder,
+    "arrow": ArrowEncoder,
+}
+
+
+def get_encoder(export_format: str, columns: Columns):
+    return ENCODERS[export_format](columns)
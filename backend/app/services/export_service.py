@@ -0,0 +1,73 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Optional
+from datetime import date
+from app.core.config import settings
+from app.repositories.container_repository import ContainerRepository
+from app.repositories.crop_metric_repository import CropMetricRepository
+from app.services.export_encoders import export_columns, get_encoder
+
+
+async def closing_session(body: AsyncIterator[bytes], session: AsyncSession) -> AsyncIterator[bytes]:
+    # A streamed body outlives the endpoint function, so the stream owns its session
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        await session.close()
+
+
+class ExportService:
+    def __init__(self, db: AsyncSession, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        self.container_repository = ContainerRepository(db)
+        self.crop_metric_repository = CropMetricRepository(db)
+
+    def export_containers(
+        self,
+        export_format: str,
+        search: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        tenant_filter: Optional[str] = None,
+        purpose_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        has_alerts: Optional[bool] = None
+    ) -> AsyncIterator[bytes]:
+        # Not a coroutine: an unavailable format raises here, before the response starts
+        query = self.container_repository.export_query(
+            search=search,
+            type_filter=type_filter,
+            tenant_filter=tenant_filter,
+            purpose_filter=purpose_filter,
+            status_filter=status_filter,
+            has_alerts=has_alerts
+        )
+        encoder = get_encoder(export_format, export_columns(query))
+        return self._encode(self.container_repository.stream_export(query, self.chunk_size), encoder)
+
+    def export_crop_metrics(
+        self,
+        export_format: str,
+        crop_id: Optional[str] = None,
+        container_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> AsyncIterator[bytes]:
+        if start_date and end_date and start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+        query = self.crop_metric_repository.export_query(
+            crop_id=crop_id, container_id=container_id, start_date=start_date, end_date=end_date
+        )
+        encoder = get_encoder(export_format, export_columns(query))
+        return self._encode(self.crop_metric_repository.stream_export(query, self.chunk_size), encoder)
+
+    @staticmethod
+    async def _encode(chunks: AsyncIterator, encoder) -> AsyncIterator[bytes]:
+        start = encoder.start()
+        if start:
+            yield start
+        async for rows in chunks:
+            yield encoder.encode(rows)
+        end = encoder.finish()
+        if end:
+            yield end
@@ -0,0 +1,159 @@
+import asyncio
+import json
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, ValidationError
+from typing import AsyncIterator, Dict, List, Optional, Set, Type
+from app.core.cache import ResponseCache, container_change_tags, get_response_cache
+from app.core.config import settings
+from app.repositories.container_repository import ContainerRepository
+from app.repositories.metric_ingest_repository import MetricIngestRepository, INGEST_TARGETS
+from app.schemas.metric import (
+    CropMetricCreate, InventoryMetricCreate, IngestBatchResult, IngestError, IngestResponse
+)
+
+INGEST_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    "crop": CropMetricCreate,
+    "inventory": InventoryMetricCreate,
+}
+
+_ingest_slots = asyncio.Semaphore(settings.INGEST_MAX_CONCURRENCY)
+
+
+class IngestBusyError(Exception):
+    pass
+
+
+class IngestTooLargeError(Exception):
+    pass
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def read_json_array(chunks: AsyncIterator[bytes], max_bytes: int) -> List:
+    # Reading stops as soon as the body passes max_bytes instead of buffering all of it
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) > max_bytes:
+            raise IngestTooLargeError(f"JSON array bodies are limited to {max_bytes} bytes; send NDJSON instead")
+    payload = json.loads(body)
+    if not isinstance(payload, list):
+        raise ValueError("Request body is not a JSON array")
+    return payload
+
+
+async def iter_items(items: List) -> AsyncIterator:
+    for item in items:
+        yield item
+
+
+class MetricIngestService:
+    def __init__(self, db: AsyncSession, cache: Optional[ResponseCache] = None):
+        self.db = db
+        self.repository = MetricIngestRepository(db, use_copy=settings.INGEST_USE_COPY)
+        self.containers = ContainerRepository(db)
+        self.cache = cache or get_response_cache()
+
+    async def ingest(self, kind: str, items: AsyncIterator, batch_size: Optional[int] = None) -> IngestResponse:
+        # Bounded concurrency is the back-pressure: excess requests wait briefly, then get
+        # IngestBusyError, and each request only reads more input after its batch is written.
+        try:
+            await asyncio.wait_for(_ingest_slots.acquire(), timeout=settings.INGEST_QUEUE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise IngestBusyError("Too many concurrent ingest requests")
+        try:
+            return await self._ingest(kind, items, batch_size or settings.INGEST_BATCH_SIZE)
+        finally:
+            _ingest_slots.release()
+
+    async def _ingest(self, kind: str, items: AsyncIterator, batch_size: int) -> IngestResponse:
+        schema = INGEST_SCHEMAS[kind]
+        columns = list(schema.model_fields)
+        response = IngestResponse(accepted=0, rejected=0, batches=[], errors=[])
+        pending = []
+        touched: Set[str] = set()
+
+        index = 0
+        async for item in items:
+            if index >= settings.INGEST_MAX_ROWS:
+                response.truncated = True
+                self._add_error(response, index, f"Row limit of {settings.INGEST_MAX_ROWS} exceeded")
+                break
+            try:
+                if isinstance(item, (bytes, str)):
+                    row = schema.model_validate_json(item)
+                else:
+                    row = schema.model_validate(item)
+                pending.append((index, row.model_dump()))
+            except ValidationError as e:
+                response.rejected += 1
+                self._add_error(response, index, self._format_validation_error(e))
+            index += 1
+
+            if len(pending) >= batch_size:
+                await self._flush(kind, columns, pending, response, touched)
+                pending = []
+
+        if pending:
+            await self._flush(kind, columns, pending, response, touched)
+
+        await self.db.commit()
+        if kind == "inventory" and touched:
+            # Container pages carry the latest inventory reading, yield and utilisation
+            tenants = await self.containers.get_tenants_of(sorted(touched))
+            await self.cache.invalidate(container_change_tags(touched, tenants))
+        return response
+
+    async def _flush(
+        self, kind: str, columns: List[str], pending: List, response: IngestResponse, touched: Set[str]
+    ) -> None:
+        _, parent_key, _ = INGEST_TARGETS[kind]
+        batch = IngestBatchResult(batch=len(response.batches), accepted=0, rejected=0)
+        response.batches.append(batch)
+
+        known = await self.repository.existing_parent_ids(kind, {row[parent_key] for _, row in pending})
+        rows = []
+        for index, row in pending:
+            if row[parent_key] in known:
+                rows.append(row)
+            else:
+                batch.rejected += 1
+                self._add_error(response, index, f"Unknown {parent_key} '{row[parent_key]}'")
+
+        if rows:
+            # Every batch gets a savepoint so one failing batch doesn't discard the others
+            try:
+                async with self.db.begin_nested():
+                    await self.repository.write_rows(kind, columns, rows)
+                batch.accepted = len(rows)
+                touched.update(row[parent_key] for row in rows)
+            except SQLAlchemyError as e:
+                batch.rejected += len(rows)
+                batch.error = str(e.orig if getattr(e, "orig", None) is not None else e).splitlines()[0]
+
+        response.accepted += batch.accepted
+        response.rejected += batch.rejected
+
+    @staticmethod
+    def _add_error(response: IngestResponse, index: int, error: str) -> None:
+        if len(response.errors) < settings.INGEST_MAX_ERRORS:
+            response.errors.append(IngestError(index=index, error=error))
+        else:
+            response.errors_omitted += 1
+
+    @staticmethod
+    def _format_validation_error(error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+        )
@@ -0,0 +1,101 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from datetime import date
+from app.repositories.metric_rollup_repository import MetricRollupRepository, ROLLUP_SOURCES, RollupSource
+from app.schemas.metric import MetricSeriesResponse, MetricSeriesPoint, MetricSummary
+
+ROLLUP_BATCH_SIZE = 100_000
+SERIES_RESOLUTIONS = ("day", "week", "month")
+
+class MetricRollupService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = MetricRollupRepository(db)
+
+    async def refresh(self, source_name: Optional[str] = None, batch_size: int = ROLLUP_BATCH_SIZE) -> Dict[str, int]:
+        processed = {}
+        for source in self._sources(source_name):
+            processed[source.name] = await self._refresh_source(source, batch_size)
+        return processed
+
+    async def backfill(self, source_name: Optional[str] = None, batch_size: int = ROLLUP_BATCH_SIZE) -> Dict[str, int]:
+        for source in self._sources(source_name):
+            await self.repository.lock_watermark(source)
+            await self.repository.clear(source)
+            await self.db.commit()
+        return await self.refresh(source_name, batch_size)
+
+    async def get_inventory_series(
+        self, container_id: str, start_date: date, end_date: date, resolution: str = "day"
+    ) -> MetricSeriesResponse:
+        return await self._get_series(ROLLUP_SOURCES["inventory_metrics"], container_id, start_date, end_date, resolution)
+
+    async def get_crop_series(
+        self, crop_id: str, start_date: date, end_date: date, resolution: str = "day"
+    ) -> MetricSeriesResponse:
+        return await self._get_series(ROLLUP_SOURCES["crop_metrics"], crop_id, start_date, end_date, resolution)
+
+    async def _refresh_source(self, source: RollupSource, batch_size: int) -> int:
+        # Each batch commits with its watermark, so an interrupted run resumes where it stopped.
+        processed = 0
+        while True:
+            watermark = await self.repository.lock_watermark(source)
+            low_id = watermark.last_id
+            safe_id = await self.repository.get_safe_id(source, watermark)
+            if safe_id <= low_id:
+                await self.db.commit()
+                return processed
+            high_id = min(safe_id, low_id + batch_size)
+            await self.repository.apply_range(source, low_id, high_id)
+            await self.repository.set_watermark(source, high_id)
+            await self.db.commit()
+            processed += high_id - low_id
+
+    async def _get_series(
+        self, source: RollupSource, key: str, start_date: date, end_date: date, resolution: str
+    ) -> MetricSeriesResponse:
+        if resolution not in SERIES_RESOLUTIONS:
+            raise ValueError(f"Unsupported resolution '{resolution}'")
+        if start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+
+        granularity = self._select_granularity(start_date, end_date, resolution)
+        rows = await self.repository.get_series(source, key, start_date, end_date, granularity, resolution)
+
+        points = []
+        for row in rows:
+            values = {}
+            for metric in source.metrics:
+                count = int(row[f"{metric}_count"] or 0)
+                total = row[f"{metric}_sum"]
+                values[metric] = MetricSummary(
+                    min=row[f"{metric}_min"],
+                    max=row[f"{metric}_max"],
+                    avg=total / count if count else None,
+                    count=count
+                )
+            points.append(MetricSeriesPoint(bucket=row["bucket"], values=values))
+
+        return MetricSeriesResponse(
+            resolution=resolution,
+            source_granularity=granularity,
+            start_date=start_date,
+            end_date=end_date,
+            points=points
+        )
+
+    @staticmethod
+    def _select_granularity(start_date: date, end_date: date, resolution: str) -> str:
+        # Weekly rollups only answer week-resolution ranges that cover whole ISO weeks;
+        # anything else is regrouped from the daily rollup
+        if resolution == "week" and start_date.weekday() == 0 and end_date.weekday() == 6:
+            return "week"
+        return "day"
+
+    @staticmethod
+    def _sources(source_name: Optional[str]) -> List[RollupSource]:
+        if source_name is None:
+            return list(ROLLUP_SOURCES.values())
+        if source_name not in ROLLUP_SOURCES:
+            raise ValueError(f"Unknown rollup source '{source_name}'")
+        return [ROLLUP_SOURCES[source_name]]
@@ -0,0 +1,89 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+from app.repositories.partition_repository import (
+    PartitionRepository, PARTITIONED_TABLES, add_months, month_start
+)
+from app.core.config import settings
+
+RETENTION_SETTINGS = {
+    "crop_metrics": "CROP_METRICS_RETENTION_MONTHS",
+    "inventory_metrics": "INVENTORY_METRICS_RETENTION_MONTHS",
+}
+
+class PartitionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = PartitionRepository(db)
+
+    async def plan(
+        self,
+        table_name: Optional[str] = None,
+        today: Optional[date] = None,
+        premake_months: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        today = today or datetime.utcnow().date()
+        if premake_months is None:
+            premake_months = settings.METRIC_PARTITION_PREMAKE_MONTHS
+
+        plans = {}
+        current = month_start(today)
+        for table in self._tables(table_name):
+            partitions = await self.repository.get_partitions(table)
+            months = [add_months(current, offset) for offset in range(premake_months + 1)]
+            create = [
+                month for month in months
+                if not any(partition.covers(month) for partition in partitions)
+            ]
+
+            retention = getattr(settings, RETENTION_SETTINGS[table])
+            cutoff = add_months(current, -retention) if retention else None
+            drop = [
+                partition.name for partition in partitions
+                if cutoff is not None and not partition.is_default and partition.upper <= cutoff
+            ]
+            plans[table] = {"create": create, "drop": drop, "cutoff": cutoff}
+        return plans
+
+    async def maintain(
+        self,
+        table_name: Optional[str] = None,
+        today: Optional[date] = None,
+        premake_months: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        plans = await self.plan(table_name, today, premake_months)
+        # Commit per partition so each DDL lock on the parent is held only briefly
+        await self.db.commit()
+
+        report = {}
+        for table, plan in plans.items():
+            created: List[str] = []
+            for month in plan["create"]:
+                created.append(await self.repository.create_partition(table, month))
+                await self.db.commit()
+
+            dropped: List[str] = []
+            for name in plan["drop"]:
+                await self.repository.drop_partition(table, name)
+                await self.db.commit()
+                dropped.append(name)
+
+            expired_default_rows = 0
+            if plan["cutoff"] is not None:
+                expired_default_rows = await self.repository.delete_default_rows_before(table, plan["cutoff"])
+                await self.db.commit()
+
+            report[table] = {
+                "created": created,
+                "dropped": dropped,
+                "expired_default_rows": expired_default_rows,
+            }
+        return report
+
+    @staticmethod
+    def _tables(table_name: Optional[str]) -> List[str]:
+        if table_name is None:
+            return list(PARTITIONED_TABLES)
+        if table_name not in PARTITIONED_TABLES:
+            raise ValueError(f"Unknown partitioned table '{table_name}'")
+        return [table_name]
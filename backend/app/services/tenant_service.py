@@ -1,12 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
+from app.core.cache import ResponseCache, get_response_cache, TENANTS_TAG
+from app.core.replica import reads_own_writes
 from app.repositories.tenant_repository import TenantRepository
-from app.schemas.tenant import TenantResponse
+from app.schemas.tenant import TenantResponse, TenantSummaryResponse
+from pydantic_core import to_json
 
 class TenantService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: Optional[ResponseCache] = None):
         self.db = db
         self.repository = TenantRepository(db)
+        self.cache = cache or get_response_cache()
 
     async def get_all_tenants(self) -> List[TenantResponse]:
         tenant_names = await self.repository.get_all()
@@ -14,3 +18,16 @@ class TenantService:
             TenantResponse(id=name, name=name)
             for name in tenant_names
         ]
+
+    async def get_tenant_summaries(self) -> List[TenantSummaryResponse]:
+        tenants = await self.repository.get_summaries()
+        return [
+            TenantSummaryResponse.model_validate(tenant).model_copy(update={"id": tenant.name})
+            for tenant in tenants
+        ]
+
+    async def get_all_tenants_json(self) -> bytes:
+        async def load() -> bytes:
+            return to_json([tenant.model_dump() for tenant in await self.get_all_tenants()])
+
+        return await self.cache.get_or_load("tenants", [TENANTS_TAG], load, refresh=reads_own_writes(self.db))
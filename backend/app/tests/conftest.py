@@ -0,0 +1,134 @@
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, List, Tuple
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models  # noqa: F401
+from app.core import cache
+from app.core.config import settings
+from app.core.db import Base, get_async_db, get_async_read_db
+from app.main import app
+from app.models import Container, InventoryMetric, Panel, Tray
+
+# These tests need a PostgreSQL database they are allowed to wipe: the public schema is
+# dropped and rebuilt from the models for every test.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+TRIGRAM_INDEX = "ix_containers_search_text_trgm"
+
+
+class StatementRecorder:
+    def __init__(self, engine):
+        self.statements: List[Tuple[str, Any]] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def take(self) -> List[Tuple[str, Any]]:
+        statements, self.statements = self.statements, []
+        return statements
+
+
+async def _reset_schema(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA public CASCADE"))
+        await conn.execute(text("CREATE SCHEMA public"))
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        trigram = True
+    except DBAPIError:
+        # Without pg_trgm the trigram index is left out and the search checks skip
+        trigram = False
+    containers = Base.metadata.tables["containers"]
+    skipped = set() if trigram else {index for index in containers.indexes if index.name == TRIGRAM_INDEX}
+    containers.indexes.difference_update(skipped)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    finally:
+        containers.indexes.update(skipped)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(TEST_DATABASE_URL)
+    await _reset_schema(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def client(engine, monkeypatch):
+    # The API against the test database, reads and writes on the same engine, with a
+    # response cache of its own so entries never outlive the schema they were built from
+    async def test_db():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    monkeypatch.setattr(cache, "response_cache", cache.ResponseCache(
+        cache.MemoryCacheBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+    ))
+    app.dependency_overrides[get_async_db] = test_db
+    app.dependency_overrides[get_async_read_db] = test_db
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_async_read_db, None)
+
+
+@pytest_asyncio.fixture
+async def has_trigram(engine) -> bool:
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+        return result.scalar() is not None
+
+
+async def seed_containers(engine, count: int) -> List[str]:
+    # Containers with trays, panels and a week of inventory readings each
+    now = datetime(2025, 6, 30, 12)
+    ids = [f"container-{i:04d}" for i in range(count)]
+    containers, trays, panels, metrics = [], [], [], []
+    for i, container_id in enumerate(ids):
+        containers.append({
+            "id": container_id,
+            "name": f"farm-{i:04d}",
+            "type": ("physical", "virtual")[i % 2],
+            "tenant": f"tenant-{i % 3}",
+            "purpose": ("development", "research", "production")[i % 3],
+            "status": ("created", "active", "maintenance", "inactive")[i % 4],
+            "has_alert": i % 5 == 0,
+            "seed_types": [],
+            "created": now - timedelta(days=i),
+            "modified": now - timedelta(hours=i),
+        })
+        trays += [{"id": f"{container_id}-tray-{n}", "container_id": container_id} for n in range(2)]
+        panels += [{"id": f"{container_id}-panel-{n}", "container_id": container_id} for n in range(2)]
+        metrics += [
+            {"container_id": container_id, "date": date(2025, 6, 24) + timedelta(days=n), "yield_kg": float(n)}
+            for n in range(7)
+        ]
+    async with engine.begin() as conn:
+        await conn.execute(insert(Container), containers)
+        await conn.execute(insert(Tray), trays)
+        await conn.execute(insert(Panel), panels)
+        await conn.execute(insert(InventoryMetric), metrics)
+        await conn.execute(text("ANALYZE"))
+    return ids
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+from starlette.requests import Request
+
+from app.core.conditional import (
+    compute_etag,
+    conditional_json_response,
+    last_modified_of,
+    split_last_modified,
+    with_last_modified,
+)
+
+BODY = b'{"id":"container-0001"}'
+LAST_MODIFIED = "Mon, 30 Jun 2025 12:00:00 GMT"
+
+
+def request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_last_modified_is_the_latest_timestamp():
+    assert last_modified_of([None, datetime(2025, 6, 30, 12), datetime(2025, 6, 1, 8, 30, 15, 999)]) == LAST_MODIFIED
+    assert last_modified_of([None]) is None
+
+
+@pytest.mark.parametrize("last_modified", [LAST_MODIFIED, None])
+def test_cached_body_keeps_its_last_modified(last_modified):
+    assert split_last_modified(with_last_modified(BODY, last_modified)) == (BODY, last_modified)
+
+
+@pytest.mark.parametrize("headers,status", [
+    ({}, 200),
+    ({"if_none_match": compute_etag(BODY)}, 304),
+    ({"if_none_match": f'"other", W/{compute_etag(BODY)}'}, 304),
+    ({"if_none_match": '"other"'}, 200),
+    ({"if_modified_since": LAST_MODIFIED}, 304),
+    ({"if_modified_since": "Mon, 30 Jun 2025 12:00:01 GMT"}, 304),
+    ({"if_modified_since": "Mon, 30 Jun 2025 11:59:59 GMT"}, 200),
+    ({"if_modified_since": "not a date"}, 200),
+    # If-None-Match wins over If-Modified-Since
+    ({"if_none_match": '"other"', "if_modified_since": LAST_MODIFIED}, 200),
+])
+def test_conditional_response(headers, status):
+    response = conditional_json_response(request(**headers), BODY, LAST_MODIFIED)
+    assert response.status_code == status
+    assert response.headers["etag"] == compute_etag(BODY)
+    assert response.headers["last-modified"] == LAST_MODIFIED
+    assert response.body == (BODY if status == 200 else b"")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/containers/", "/api/v1/containers/{id}"])
+async def test_container_revalidation(client, path):
+    created = await client.post("/api/v1/containers/", json={
+        "name": "revalidated", "type": "virtual", "tenant": "tenant-a", "purpose": "research"
+    })
+    url = path.format(id=created.json()["id"])
+
+    first = await client.get(url)
+    assert first.status_code == 200
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 304
+    assert (await client.get(url, headers={"If-Modified-Since": last_modified})).status_code == 304
+
+    await client.put(f"/api/v1/containers/{created.json()['id']}", json={"notes": "changed"})
+    changed = await client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
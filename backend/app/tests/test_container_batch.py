@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Container
+from app.tests.conftest import StatementRecorder, seed_containers
+
+BATCH_URL = "/api/v1/containers/batch"
+
+
+async def create(client, name: str, **fields) -> dict:
+    body = {"name": name, "type": "physical", "tenant": "tenant-a", "purpose": "research", **fields}
+    response = await client.post("/api/v1/containers/", json=body)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_batch_update_reports_each_item(client):
+    first = await create(client, "first")
+    second = await create(client, "second", notes="kept")
+    response = await client.put(BATCH_URL, json=[
+        {"id": first["id"], "status": "active", "tenant": "tenant-b"},
+        {"id": "missing", "status": "active"},
+        {"id": first["id"], "notes": "duplicate"},
+        {"id": second["id"], "purpose": "production"},
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    assert [(result["index"], result["status"]) for result in body["results"]] == [
+        (0, "updated"), (1, "not_found"), (2, "conflict"), (3, "updated")
+    ]
+    updated = body["results"][0]["container"]
+    assert (updated["status"], updated["tenant"], updated["purpose"]) == ("active", "tenant-b", "research")
+    # Fields another item set are left alone on this one
+    assert body["results"][3]["container"]["notes"] == "kept"
+    assert body["results"][3]["container"]["status"] == "created"
+
+    tenants = (await client.get("/api/v1/tenants/summary")).json()
+    assert {tenant["name"]: tenant["container_count"] for tenant in tenants} == {"tenant-a": 1, "tenant-b": 1}
+
+
+@pytest.mark.asyncio
+async def test_batch_update_statement_count_does_not_grow_with_batch_size(client, engine):
+    ids = await seed_containers(engine, 6)
+    recorder = StatementRecorder(engine)
+    counts = []
+    for size in (2, 6):
+        recorder.take()
+        items = [{"id": container_id, "notes": f"size {size}"} for container_id in ids[:size]]
+        assert (await client.put(BATCH_URL, json=items)).json()["succeeded"] == size
+        counts.append(len(recorder.take()))
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_of_location_moves_modified(client):
+    container = await create(client, "located", location={"city": "Berlin", "country": "DE"})
+    response = await client.put(BATCH_URL, json=[
+        {"id": container["id"], "location": {"city": "Hamburg", "country": "DE"}}
+    ])
+    result = response.json()["results"][0]["container"]
+    assert result["location"]["city"] == "Hamburg"
+    assert result["modified"] > container["modified"]
+
+    detail = (await client.get(f"/api/v1/containers/{container['id']}")).json()
+    assert detail["location"]["city"] == "Hamburg"
+    assert detail["modified"] == result["modified"]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_keeps_unset_settings(client, session):
+    container = await create(client, "shadowed", settings={"shadow_service_enabled": True})
+    await client.put(BATCH_URL, json=[{"id": container["id"], "settings": {"ecosystem": {"connected": True}}}])
+    row = (await session.execute(select(Container).where(Container.id == container["id"]))).scalar_one()
+    assert row.shadow_service_enabled is True
+    assert row.ecosystem_connected is True
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_reports_containers_in_use(client, engine):
+    in_use = (await seed_containers(engine, 1))[0]
+    free = await create(client, "free")
+    response = await client.post(f"{BATCH_URL}/delete", json={"ids": [free["id"], in_use, "missing", free["id"]]})
+    body = response.json()
+    assert [(result["id"], result["status"]) for result in body["results"]] == [
+        (free["id"], "deleted"), (in_use, "conflict"), ("missing", "not_found"), (free["id"], "conflict")
+    ]
+    assert (await client.get(f"/api/v1/containers/{free['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_of_container_in_use_is_409(client, engine):
+    in_use = (await seed_containers(engine, 1))[0]
+    response = await client.delete(f"/api/v1/containers/{in_use}")
+    assert response.status_code == 409
+    assert (await client.get(f"/api/v1/containers/{in_use}")).status_code == 200
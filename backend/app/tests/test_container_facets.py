@@ -0,0 +1,48 @@
+from collections import Counter
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Container
+from app.tests.conftest import StatementRecorder, seed_containers
+
+LIST_URL = "/api/v1/containers/"
+FACETS = ("type", "tenant", "purpose", "status", "has_alert")
+
+
+async def expected_facets(engine, **filters) -> dict:
+    async with engine.connect() as conn:
+        rows = (await conn.execute(select(Container))).mappings().all()
+    rows = [row for row in rows if all(row[name] == value for name, value in filters.items())]
+    counts = {name: Counter() for name in FACETS}
+    for row in rows:
+        for name in FACETS:
+            value = row[name]
+            counts[name][str(value).lower() if isinstance(value, bool) else value] += 1
+    return {name: dict(counter) for name, counter in counts.items()}, len(rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params,filters", [
+    ({}, {}),
+    ({"status_filter": "active"}, {"status": "active"}),
+    ({"tenant_filter": "tenant-2", "has_alerts": "true"}, {"tenant": "tenant-2", "has_alert": True}),
+])
+async def test_facets_count_the_filtered_containers(client, engine, params, filters):
+    await seed_containers(engine, 30)
+    recorder = StatementRecorder(engine)
+    response = await client.get(LIST_URL, params={"facets": "true", "total_mode": "exact", "limit": 5, **params})
+    body = response.json()
+
+    facets, total = await expected_facets(engine, **filters)
+    assert body["facets"] == facets
+    assert body["total"] == total
+    assert len(body["containers"]) == min(5, total)
+    # The facet query's grand total stands in for the COUNT
+    assert not any("count(containers.id)" in statement for statement, _ in recorder.take())
+
+
+@pytest.mark.asyncio
+async def test_facets_are_left_out_unless_asked_for(client, engine):
+    await seed_containers(engine, 3)
+    assert (await client.get(LIST_URL)).json()["facets"] is None
@@ -0,0 +1,33 @@
+import pytest
+
+from app.core import cache
+from app.tests.conftest import StatementRecorder, seed_containers
+
+
+@pytest.fixture
+def uncached(client, monkeypatch):
+    monkeypatch.setattr(cache, "response_cache", cache.ResponseCache(None))
+    return client
+
+
+async def count_list_statements(client, recorder: StatementRecorder, **params) -> int:
+    recorder.take()
+    response = await client.get("/api/v1/containers/", params=params)
+    assert response.status_code == 200
+    assert len(response.json()["containers"]) == params["limit"]
+    return len(recorder.take())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {},
+    {"tenant_filter": "tenant-1"},
+    {"total_mode": "none"},
+    {"facets": "true"},
+])
+async def test_list_statement_count_does_not_grow_with_page_size(engine, uncached, params):
+    await seed_containers(engine, 120)
+    recorder = StatementRecorder(engine)
+    small = await count_list_statements(uncached, recorder, limit=5, **params)
+    large = await count_list_statements(uncached, recorder, limit=30, **params)
+    assert small == large
@@ -0,0 +1,72 @@
+import base64
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.tests.conftest import seed_containers
+
+LIST_URL = "/api/v1/containers/"
+
+
+def test_cursor_round_trip():
+    modified = datetime(2025, 6, 30, 12, 0, 0, 123456)
+    assert decode_cursor(encode_cursor(modified, "container-0001")) == (modified, "container-0001")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+    base64.urlsafe_b64encode(b'{"m": "yesterday", "i": "x"}').decode(),
+    base64.urlsafe_b64encode(b'{"i": "x"}').decode(),
+])
+def test_decode_cursor_rejects_malformed_cursors(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+async def walk_pages(client, limit: int, **filters):
+    ids = []
+    params = {"limit": limit, "total_mode": "none", **filters}
+    while True:
+        response = await client.get(LIST_URL, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        ids += [container["id"] for container in body["containers"]]
+        if body["next_cursor"] is None:
+            return ids
+        params["cursor"] = body["next_cursor"]
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_container_once(client, engine):
+    await seed_containers(engine, 20)
+    async with engine.begin() as conn:
+        # Ties on modified are broken by id; a row written without modified gets the default
+        await conn.execute(text("""
+            INSERT INTO containers (id, name, type, tenant, purpose, status, modified)
+            SELECT 'tied-' || n, 'tied-' || n, 'physical', 'tenant-0', 'research', 'active',
+                   (SELECT modified FROM containers WHERE id = 'container-0003')
+            FROM generate_series(1, 5) AS n
+        """))
+        await conn.execute(text("""
+            INSERT INTO containers (id, name, type, tenant, purpose, status)
+            VALUES ('defaulted', 'defaulted', 'virtual', 'tenant-0', 'research', 'active')
+        """))
+        expected = list((await conn.execute(text("SELECT id FROM containers ORDER BY modified DESC, id DESC"))).scalars())
+        defaulted = await conn.execute(text("SELECT modified FROM containers WHERE id = 'defaulted'"))
+        assert defaulted.scalar() is not None
+
+    assert await walk_pages(client, 7) == expected
+    assert await walk_pages(client, 1, tenant_filter="tenant-0") == [
+        container_id for container_id in expected
+        if container_id.startswith(("tied-", "defaulted")) or int(container_id[-4:]) % 3 == 0
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_400(client):
+    response = await client.get(LIST_URL, params={"cursor": "not a cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from app.models import InventoryMetric
+from app.tests.conftest import seed_containers
+
+PERFORMANCE_URL = "/api/v1/containers/performance"
+
+
+async def seed(engine) -> None:
+    # Two physical and two virtual containers with yields 0..6 over 2025-06-24..30, plus
+    # utilization readings for the virtual ones on the last day
+    container_ids = await seed_containers(engine, 4)
+    async with engine.begin() as conn:
+        await conn.execute(insert(InventoryMetric), [
+            {
+                "container_id": container_id, "date": date(2025, 6, 30),
+                "nursery_station_utilization": nursery, "cultivation_area_utilization": cultivation,
+            }
+            for container_id, nursery, cultivation in [(container_ids[1], 80, None), (container_ids[3], 60, 40)]
+        ])
+
+
+@pytest.mark.asyncio
+async def test_daily_performance(client, engine):
+    await seed(engine)
+    response = await client.get(PERFORMANCE_URL, params={"start_date": "2025-06-26", "end_date": "2025-06-30"})
+    body = response.json()
+    assert body["labels"] == ["2025-06-26", "2025-06-27", "2025-06-28", "2025-06-29", "2025-06-30"]
+    assert body["physical"] == {
+        "count": 2, "avg_yield": 4.0, "total_yield": 40.0, "avg_utilization": 0.0,
+        "yield_data": [4.0, 6.0, 8.0, 10.0, 12.0], "utilization_data": [0.0] * 5,
+    }
+    assert body["virtual"] == {
+        "count": 2, "avg_yield": 4.0, "total_yield": 40.0, "avg_utilization": 65.0,
+        "yield_data": [4.0, 6.0, 8.0, 10.0, 12.0], "utilization_data": [0.0, 0.0, 0.0, 0.0, 65.0],
+    }
+
+
+@pytest.mark.asyncio
+async def test_weekly_performance_for_one_type(client, engine):
+    await seed(engine)
+    response = await client.get(PERFORMANCE_URL, params={
+        "start_date": "2025-06-24", "end_date": "2025-06-30", "bucket": "week", "type_filter": "physical"
+    })
+    body = response.json()
+    assert body["labels"] == ["2025-06-23", "2025-06-30"]
+    assert (body["physical"]["yield_data"], body["physical"]["total_yield"]) == ([30.0, 12.0], 42.0)
+    assert body["virtual"]["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_containers_without_readings_still_count(client, engine):
+    await seed(engine)
+    response = await client.get(PERFORMANCE_URL, params={"start_date": "2025-01-01", "end_date": "2025-01-03"})
+    body = response.json()
+    assert (body["physical"]["count"], body["physical"]["total_yield"]) == (2, 0.0)
+    assert body["physical"]["yield_data"] == [0.0, 0.0, 0.0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {"start_date": "2025-07-01", "end_date": "2025-06-01"},
+    {"start_date": "2000-01-01", "end_date": "2025-06-01", "bucket": "day"},
+])
+async def test_invalid_windows_are_400(client, params):
+    assert (await client.get(PERFORMANCE_URL, params=params)).status_code == 400
@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+from app.tests.conftest import StatementRecorder, seed_containers
+
+CONTAINERS_URL = "/api/v1/containers/"
+CONTAINER_STATEMENT = re.compile(r"\b(INTO|UPDATE|FROM)\s+containers\b")
+
+
+def container_statements(recorder: StatementRecorder) -> list:
+    return [statement.split()[0] for statement, _ in recorder.take() if CONTAINER_STATEMENT.search(statement)]
+
+
+@pytest.mark.asyncio
+async def test_each_write_touches_containers_once(client, engine):
+    recorder = StatementRecorder(engine)
+    body = {"name": "single", "type": "physical", "tenant": "tenant-a", "purpose": "research"}
+    created = (await client.post(CONTAINERS_URL, json=body)).json()
+    assert container_statements(recorder) == ["INSERT"]
+
+    response = await client.put(f"{CONTAINERS_URL}{created['id']}", json={"status": "active", "tenant": "tenant-b"})
+    assert (response.json()["status"], response.json()["tenant"]) == ("active", "tenant-b")
+    assert container_statements(recorder) == ["WITH"]
+
+    assert (await client.delete(f"{CONTAINERS_URL}{created['id']}")).status_code == 200
+    assert container_statements(recorder) == ["DELETE"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_name_is_rejected_without_a_lookup(client, engine):
+    body = {"name": "taken", "type": "physical", "tenant": "tenant-a", "purpose": "research"}
+    await client.post(CONTAINERS_URL, json=body)
+    recorder = StatementRecorder(engine)
+    response = await client.post(CONTAINERS_URL, json={**body, "type": "virtual"})
+    assert response.status_code == 400
+    assert container_statements(recorder) == ["INSERT"]
+
+
+@pytest.mark.asyncio
+async def test_update_honours_if_unmodified_since(client, engine):
+    container_id = (await seed_containers(engine, 1))[0]
+    last_modified = (await client.get(f"{CONTAINERS_URL}{container_id}")).headers["last-modified"]
+    url = f"{CONTAINERS_URL}{container_id}"
+
+    first = await client.put(url, json={"notes": "first"}, headers={"If-Unmodified-Since": last_modified})
+    assert first.status_code == 200
+    # The first write moved modified past the header, so a second writer holding it loses
+    second = await client.put(url, json={"notes": "second"}, headers={"If-Unmodified-Since": last_modified})
+    assert second.status_code == 412
+    assert (await client.get(url)).json()["notes"] == "first"
+
+    missing = await client.put(f"{CONTAINERS_URL}missing", json={"notes": "x"}, headers={
+        "If-Unmodified-Since": last_modified
+    })
+    assert missing.status_code == 404
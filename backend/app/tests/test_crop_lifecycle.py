@@ -0,0 +1,87 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models import Crop
+from app.services.crop_lifecycle_service import CropLifecycleService
+from app.tests.conftest import seed_containers
+
+AS_OF = date(2025, 7, 1)
+NOON = datetime(2025, 7, 1, 12)
+
+
+def days(n: int) -> datetime:
+    return NOON + timedelta(days=n)
+
+
+# id: (seed_date, transplanted_date, harvesting_date_planned, harvesting_date), expected (age, overdue_days, status)
+CROPS = {
+    "crop-01": ((days(-3), None, days(30), None), (3, 0, "germinating")),
+    "crop-02": ((days(-20), days(-10), days(10), None), (20, 0, "growing")),
+    "crop-03": ((days(-40), days(-30), days(0), None), (40, 0, "ready_for_harvest")),
+    "crop-04": ((days(-50), days(-40), days(-4), None), (50, 4, "overdue")),
+    # A harvested crop keeps its age and lateness as of the harvest day
+    "crop-05": ((days(-60), days(-50), days(-12), days(-9)), (51, 3, "harvested")),
+    "crop-06": ((days(-60), None, days(-5), days(-8)), (52, 0, "harvested")),
+    "crop-07": ((None, None, None, None), (None, None, "germinating")),
+    "crop-08": ((days(2), None, days(40), None), (0, 0, "germinating")),
+}
+
+
+async def add_crops(engine, container_ids) -> None:
+    rows = []
+    for n, (crop_id, (dates, _)) in enumerate(CROPS.items()):
+        seed_date, transplanted_date, planned, harvested = dates
+        rows.append({
+            "id": crop_id,
+            "container_id": container_ids[n % len(container_ids)],
+            "seed_type": "basil",
+            "seed_date": seed_date,
+            "transplanted_date": transplanted_date,
+            "harvesting_date_planned": planned,
+            "harvesting_date": harvested,
+        })
+    async with engine.begin() as conn:
+        await conn.execute(insert(Crop), rows)
+
+
+async def lifecycle(engine) -> dict:
+    async with engine.connect() as conn:
+        result = await conn.execute(select(Crop.id, Crop.age, Crop.overdue_days, Crop.status).order_by(Crop.id))
+        return {row.id: (row.age, row.overdue_days, row.status) for row in result}
+
+
+@pytest.mark.asyncio
+async def test_refresh_derives_age_overdue_days_and_status(engine, session):
+    await add_crops(engine, await seed_containers(engine, 2))
+    service = CropLifecycleService(session)
+
+    result = await service.refresh(as_of=AS_OF, batch_size=3)
+    # crop-07 has no dates, so its stored defaults are already right and it isn't rewritten
+    assert (result["crops"], result["updated"]) == (len(CROPS), len(CROPS) - 1)
+    assert await lifecycle(engine) == {crop_id: expected for crop_id, (_, expected) in CROPS.items()}
+    moved = {(t["from"], t["to"]): t["crops"] for t in result["transitions"]}
+    assert moved == {("germinating", "growing"): 1, ("germinating", "ready_for_harvest"): 1,
+                     ("germinating", "overdue"): 1, ("germinating", "harvested"): 2}
+    assert result["status_changes"] == 5
+
+    # Nothing changed, so nothing is rewritten
+    assert (await service.refresh(as_of=AS_OF, batch_size=3))["updated"] == 0
+
+    later = await service.refresh(as_of=AS_OF + timedelta(days=1), batch_size=100)
+    assert later["transitions"] == [{"from": "ready_for_harvest", "to": "overdue", "crops": 1}]
+    # Ages of unharvested crops move on; harvested and not yet seeded crops stay as they were
+    assert later["updated"] == 4
+
+
+@pytest.mark.asyncio
+async def test_refresh_can_be_limited_to_one_container(engine, session):
+    container_ids = await seed_containers(engine, 2)
+    await add_crops(engine, container_ids)
+    result = await CropLifecycleService(session).refresh(as_of=AS_OF, container_id=container_ids[1], batch_size=2)
+    assert result["crops"] == len(CROPS) // 2
+
+    refreshed = await lifecycle(engine)
+    for n, (crop_id, (_, expected)) in enumerate(CROPS.items()):
+        assert refreshed[crop_id] == (expected if n % 2 else (None, None, "germinating"))
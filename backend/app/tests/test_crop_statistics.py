@@ -0,0 +1,103 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models import Crop, CropMetric, CropStatistic
+from app.repositories.crop_statistic_repository import COMPUTED_COLUMNS
+from app.services.crop_statistics_service import CropStatisticsService
+from app.tests.conftest import seed_containers
+
+START = datetime(2025, 5, 1, 6)
+
+
+def readings(crop_id: str, days) -> list:
+    return [
+        {
+            "crop_id": crop_id,
+            "recorded_at": START + timedelta(days=day, hours=day % 5),
+            "height_cm": 2.0 + 0.7 * day,
+            "biomass_g": 5.0 + 1.5 * day + (day % 3),
+            "health_score": 0.9 - 0.002 * day,
+            "leaf_count": 3 + day // 2,
+            "disease_detected": day % 11 == 0,
+            "pest_detected": day % 7 == 0,
+        }
+        for day in days
+    ]
+
+
+async def add_crops(engine, container_id: str, crop_ids) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(insert(Crop), [
+            {
+                "id": crop_id,
+                "container_id": container_id,
+                "seed_type": "basil",
+                "seed_date": START - timedelta(days=3),
+                "harvesting_date_planned": START + timedelta(days=40),
+            }
+            for crop_id in crop_ids
+        ])
+
+
+async def add_readings(engine, rows) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(insert(CropMetric), rows)
+
+
+async def statistics(engine) -> dict:
+    async with engine.connect() as conn:
+        result = await conn.execute(select(CropStatistic).order_by(CropStatistic.crop_id))
+        return {row.crop_id: {name: getattr(row, name) for name in COMPUTED_COLUMNS} for row in result}
+
+
+def assert_same_statistics(left: dict, right: dict) -> None:
+    assert left.keys() == right.keys()
+    for crop_id in left:
+        for name in COMPUTED_COLUMNS:
+            a, b = left[crop_id][name], right[crop_id][name]
+            if isinstance(a, float) and isinstance(b, float):
+                assert math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9), (crop_id, name, a, b)
+            else:
+                assert a == b, (crop_id, name, a, b)
+
+
+@pytest.mark.asyncio
+async def test_refresh_matches_rebuild(engine, session):
+    container_id = (await seed_containers(engine, 1))[0]
+    await add_crops(engine, container_id, ["crop-a", "crop-b", "crop-c"])
+    await add_readings(engine, readings("crop-a", range(0, 20)) + readings("crop-b", range(5, 15)))
+
+    service = CropStatisticsService(session)
+    assert await service.rebuild() == {"rows": 30, "crops": 2}
+
+    # New readings: later ones, one recorded before anything already folded in, and a new crop
+    late = readings("crop-a", range(20, 30)) + readings("crop-b", [2]) + readings("crop-c", range(0, 8))
+    await add_readings(engine, late)
+    assert await service.refresh() == {"rows": len(late), "crops": 3}
+    assert await service.refresh() == {"rows": 0, "crops": 0}
+
+    check = await service.check()
+    assert (check["crops"], check["mismatched"], check["missing_state"]) == (3, 0, 0)
+
+    incremental = await statistics(engine)
+    async with engine.connect() as conn:
+        predicted = await conn.execute(select(CropStatistic.predicted_harvest_date))
+        assert set(predicted.scalars()) == {None}
+    assert await service.rebuild() == {"rows": 30 + len(late), "crops": 3}
+    assert_same_statistics(incremental, await statistics(engine))
+
+
+@pytest.mark.asyncio
+async def test_refresh_only_reads_new_rows(engine, session):
+    container_id = (await seed_containers(engine, 1))[0]
+    crop_ids = [f"crop-{i:03d}" for i in range(40)]
+    await add_crops(engine, container_id, crop_ids)
+    await add_readings(engine, [row for crop_id in crop_ids for row in readings(crop_id, range(10))])
+    service = CropStatisticsService(session)
+    await service.rebuild()
+
+    await add_readings(engine, readings("crop-007", [10, 11]))
+    assert await service.refresh() == {"rows": 2, "crops": 1}
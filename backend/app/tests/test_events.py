@@ -0,0 +1,113 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.events import (
+    MAX_NOTIFY_PAYLOAD,
+    RESYNC,
+    EventBroker,
+    PostgresEventBus,
+    container_event,
+    event_stream,
+)
+
+
+def event(container_id: str, tenant: str, **fields) -> dict:
+    return {"type": "updated", "id": container_id, "tenant": tenant, "status": "active", "has_alert": False, **fields}
+
+
+def drain(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_events_reach_matching_subscribers_only():
+    broker = EventBroker(queue_size=10)
+    everything = broker.subscribe()
+    tenant_a = broker.subscribe(tenant="tenant-a")
+    watched = broker.subscribe(container_ids=["c1", "c3"])
+    watched_in_b = broker.subscribe(tenant="tenant-b", container_ids=["c1", "c2"])
+
+    events = [
+        event("c1", "tenant-a"),
+        event("c2", "tenant-b"),
+        event("c3", "tenant-c"),
+        event("c1", "tenant-b", previous_tenant="tenant-a"),
+    ]
+    for published in events:
+        broker.dispatch(published)
+
+    assert drain(everything) == events
+    # A container moving between tenants is reported to both
+    assert drain(tenant_a) == [events[0], events[3]]
+    assert drain(watched) == [events[0], events[2], events[3]]
+    assert drain(watched_in_b) == [events[1], events[3]]
+
+
+def test_unsubscribe_drops_empty_index_entries():
+    broker = EventBroker(queue_size=10)
+    subscriptions = [broker.subscribe(tenant="tenant-a"), broker.subscribe(container_ids=["c1"]), broker.subscribe()]
+    for subscription in subscriptions:
+        broker.unsubscribe(subscription)
+    assert broker.subscriptions() == set()
+    assert (broker._by_tenant, broker._by_container) == ({}, {})
+    broker.dispatch(event("c1", "tenant-a"))
+
+
+def test_slow_subscriber_is_told_to_resync():
+    broker = EventBroker(queue_size=3)
+    slow = broker.subscribe()
+    fast = broker.subscribe()
+    for n in range(3):
+        broker.dispatch(event(f"c{n}", "tenant-a"))
+    drain(fast)
+    broker.dispatch(event("c3", "tenant-a"))
+
+    # The backlog is dropped for a single marker; later events queue up behind it
+    assert drain(slow) == [RESYNC]
+    broker.dispatch(event("c4", "tenant-a"))
+    assert drain(slow) == [event("c4", "tenant-a")]
+    assert drain(fast) == [event("c3", "tenant-a"), event("c4", "tenant-a")]
+
+
+def test_resync_reaches_every_subscriber():
+    broker = EventBroker(queue_size=10)
+    subscriptions = [broker.subscribe(), broker.subscribe(tenant="tenant-a"), broker.subscribe(container_ids=["c1"])]
+    broker.resync()
+    assert [drain(subscription) for subscription in subscriptions] == [[RESYNC]] * 3
+
+
+def test_container_event_only_reports_a_changed_tenant():
+    container = SimpleNamespace(id="c1", tenant="tenant-b", status="active", has_alert=None)
+    assert "previous_tenant" not in container_event("updated", container, "tenant-b")
+    moved = container_event("updated", container, "tenant-a")
+    assert (moved["previous_tenant"], moved["has_alert"]) == ("tenant-a", False)
+
+
+def test_notify_payloads_stay_under_the_limit():
+    events = [event(f"container-{n:05d}", "tenant-a", notes="x" * 200) for n in range(200)]
+    payloads = list(PostgresEventBus._payloads(events))
+    assert len(payloads) > 1
+    assert all(len(payload) <= MAX_NOTIFY_PAYLOAD for payload in payloads)
+    assert [decoded for payload in payloads for decoded in json.loads(payload)] == events
+
+
+@pytest.mark.asyncio
+async def test_event_stream_formats_events_and_unsubscribes():
+    broker = EventBroker(queue_size=10)
+    stream = event_stream(broker, "tenant-a", None, heartbeat=0.01)
+    assert await stream.__anext__() == b": connected\n\n"
+    assert await stream.__anext__() == b": heartbeat\n\n"
+
+    broker.dispatch(event("c1", "tenant-b"))
+    broker.dispatch(event("c2", "tenant-a"))
+    broker.resync()
+    first = await stream.__anext__()
+    assert first.startswith(b"event: container\ndata: ") and b'"id":"c2"' in first
+    assert await stream.__anext__() == b'event: resync\ndata: {"type":"resync"}\n\n'
+
+    await stream.aclose()
+    assert broker.subscriptions() == set()
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Container
+from app.services.export_encoders import ArrowEncoder, export_columns, get_encoder
+from app.services.export_service import ExportService
+
+COLUMNS = [
+    ("id", "string"),
+    ("count", "int"),
+    ("score", "float"),
+    ("active", "bool"),
+    ("modified", "datetime"),
+    ("settings", "json"),
+]
+ROWS = [
+    ("c1", 3, 0.5, True, datetime(2025, 6, 30, 12, 0, 1), {"ecosystem": {"connected": True}}),
+    ("c2, \"quoted\"", None, None, False, None, None),
+    ("c3\nnewline", 0, -1.25, None, datetime(2025, 1, 1), ["a", 1]),
+]
+
+
+async def chunks(rows, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def export(export_format: str, rows=ROWS, size: int = 2) -> bytes:
+    body = ExportService._encode(chunks(rows, size), get_encoder(export_format, COLUMNS))
+    return b"".join([piece async for piece in body])
+
+
+def test_export_columns_follow_the_sql_types():
+    query = select(Container.id, Container.has_alert, Container.modified, Container.seed_types)
+    assert export_columns(query) == [
+        ("id", "string"), ("has_alert", "bool"), ("modified", "datetime"), ("seed_types", "json")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_writes_one_object_per_row():
+    lines = (await export("ndjson")).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {
+            "id": "c1", "count": 3, "score": 0.5, "active": True,
+            "modified": "2025-06-30T12:00:01", "settings": {"ecosystem": {"connected": True}},
+        },
+        {"id": 'c2, "quoted"', "count": None, "score": None, "active": False, "modified": None, "settings": None},
+        {"id": "c3\nnewline", "count": 0, "score": -1.25, "active": None, "modified": "2025-01-01T00:00:00", "settings": ["a", 1]},
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 2, 10])
+async def test_csv_export_is_the_same_for_any_chunk_size(size):
+    body = await export("csv", size=size)
+    assert body == await export("csv", size=1)
+    assert list(csv.reader(io.StringIO(body.decode()))) == [
+        ["id", "count", "score", "active", "modified", "settings"],
+        ["c1", "3", "0.5", "true", "2025-06-30T12:00:01", '{"ecosystem":{"connected":true}}'],
+        ['c2, "quoted"', "", "", "false", "", ""],
+        ["c3\nnewline", "0", "-1.25", "", "2025-01-01T00:00:00", '["a",1]'],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_empty_export_still_has_a_header():
+    assert await export("csv", rows=[]) == b"id,count,score,active,modified,settings\n"
+    assert await export("ndjson", rows=[]) == b""
+
+
+@pytest.mark.asyncio
+async def test_arrow_export_round_trips():
+    pyarrow = pytest.importorskip("pyarrow")
+    table = pyarrow.ipc.open_stream(await export("arrow", size=1)).read_all()
+    assert table.schema.names == [name for name, _ in COLUMNS]
+    assert table.num_rows == len(ROWS)
+    assert table.column("settings").to_pylist() == ['{"ecosystem":{"connected":true}}', None, '["a",1]']
+    assert table.column("modified").to_pylist() == [row[4] for row in ROWS]
+
+
+def test_arrow_export_needs_pyarrow(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        ArrowEncoder(COLUMNS)
@@ -0,0 +1,118 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Set
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+
+from app.models import Crop, CropMetric
+from app.repositories.container_repository import ContainerRepository
+from app.tests.conftest import StatementRecorder, seed_containers
+
+# Every container filter path and foreign key lookup must be answered by its index. The
+# statements are captured from the repositories, so a query shape that stops matching
+# its index fails here. Sequential scans are disabled for the session, which makes the
+# plans independent of how few rows the test database holds.
+
+CURSOR = (datetime(2100, 1, 1), "ffffffff")
+
+LIST_CHECKS = [
+    ({}, "ix_containers_modified_id"),
+    ({"type_filter": "physical"}, "ix_containers_type_modified"),
+    ({"tenant_filter": "tenant-1"}, "ix_containers_tenant_modified"),
+    ({"purpose_filter": "research"}, "ix_containers_purpose_modified"),
+    ({"status_filter": "active"}, "ix_containers_status_modified"),
+    ({"has_alerts": True}, "ix_containers_alert_modified"),
+]
+
+
+def walk(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+async def plan_nodes(session, statement: str, parameters: Any) -> List[Dict[str, Any]]:
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(walk(plan[0]["Plan"]))
+
+
+async def index_family(session, index: str) -> Set[str]:
+    # A partitioned table's index is used through the partitions' own copies of it
+    result = await session.execute(
+        text("""
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :index
+        """),
+        {"index": index}
+    )
+    return {index, *result.scalars()}
+
+
+async def assert_uses_index(session, statement: str, parameters: Any, index: str) -> None:
+    nodes = await plan_nodes(session, statement, parameters)
+    seq_scans = sorted({node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"})
+    used = {node["Index Name"] for node in nodes if "Index Name" in node}
+    assert not seq_scans, f"sequential scan on {seq_scans}"
+    assert used & await index_family(session, index), f"expected {index}, plan used {sorted(used)}"
+
+
+@pytest_asyncio.fixture
+async def explain_session(engine, session):
+    await seed_containers(engine, 50)
+    await session.execute(text("SET enable_seqscan = off"))
+    return session
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", [None, CURSOR], ids=["offset", "cursor"])
+@pytest.mark.parametrize("filters,index", LIST_CHECKS, ids=[index for _, index in LIST_CHECKS])
+async def test_list_filter_uses_index(engine, explain_session, filters, index, cursor):
+    recorder = StatementRecorder(engine)
+    await ContainerRepository(explain_session).get_all(limit=20, cursor=cursor, count_mode="none", **filters)
+    statement, parameters = recorder.take()[0]
+    await assert_uses_index(explain_session, statement, parameters, index)
+
+
+@pytest.mark.asyncio
+async def test_search_uses_trigram_index(engine, explain_session, has_trigram):
+    if not has_trigram:
+        pytest.skip("pg_trgm is not available")
+    recorder = StatementRecorder(engine)
+    repository = ContainerRepository(explain_session, search_backend="trigram")
+    await repository.get_all(search="farm-0001", limit=20, count_mode="none")
+    statement, parameters = recorder.take()[0]
+    await assert_uses_index(explain_session, statement, parameters, "ix_containers_search_text_trgm")
+
+
+@pytest.mark.asyncio
+async def test_inventory_snapshot_lookups_use_indexes(engine, explain_session):
+    recorder = StatementRecorder(engine)
+    await ContainerRepository(explain_session).get_inventory_snapshots(["container-0001"])
+    statements = recorder.take()
+    indexes = ["ix_trays_container_id", "ix_panels_container_id", "ix_inventory_metrics_container_date"]
+    assert len(statements) == len(indexes)
+    for (statement, parameters), index in zip(statements, indexes, strict=True):
+        await assert_uses_index(explain_session, statement, parameters, index)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query,index", [
+    (select(Crop.id).where(Crop.container_id == "container-0001"), "ix_crops_container_id"),
+    (
+        select(CropMetric).where(CropMetric.crop_id == "crop-0001").order_by(CropMetric.recorded_at),
+        "ix_crop_metrics_crop_recorded_at"
+    ),
+], ids=["crops_by_container", "crop_metrics_by_crop"])
+async def test_crop_lookups_use_indexes(engine, explain_session, query, index):
+    recorder = StatementRecorder(engine)
+    await explain_session.execute(query)
+    statement, parameters = recorder.take()[0]
+    await assert_uses_index(explain_session, statement, parameters, index)
@@ -0,0 +1,96 @@
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+
+from app.core.instrumentation import (
+    HTTP_REQUEST_SECONDS,
+    UNATTRIBUTED,
+    UNMATCHED_ROUTE,
+    RequestMetricsMiddleware,
+    current_repository_method,
+    instrument_repository,
+)
+from app.core.metrics import Counter, Family, Gauge, Histogram, Registry
+
+
+def test_registry_renders_the_text_exposition_format():
+    registry = Registry()
+    registry.register(Counter("jobs_total", "Jobs run")).inc(3)
+    registry.register(Gauge("queue_depth", "Queued jobs", function=lambda: 1.5))
+    latency = registry.register(Histogram("job_seconds", "Job time", buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 2.0):
+        latency.observe(value)
+    registry.register(Family(Counter, "errors_total", "Errors", ("kind",))).labels('bad "input"').inc()
+
+    assert registry.render().splitlines() == [
+        "# HELP jobs_total Jobs run",
+        "# TYPE jobs_total counter",
+        "jobs_total 3",
+        "# HELP queue_depth Queued jobs",
+        "# TYPE queue_depth gauge",
+        "queue_depth 1.5",
+        "# HELP job_seconds Job time",
+        "# TYPE job_seconds histogram",
+        'job_seconds_bucket{le="0.1"} 1',
+        'job_seconds_bucket{le="1.0"} 2',
+        'job_seconds_bucket{le="+Inf"} 3',
+        "job_seconds_sum 2.55",
+        "job_seconds_count 3",
+        "# HELP errors_total Errors",
+        "# TYPE errors_total counter",
+        'errors_total{kind="bad \\"input\\""} 1',
+    ]
+    with pytest.raises(ValueError):
+        registry.register(Counter("jobs_total", "Again"))
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template():
+    inner = FastAPI()
+    router = APIRouter()
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    inner.include_router(router, prefix="/api/items")
+    transport = httpx.ASGITransport(app=RequestMetricsMiddleware(inner))
+    before = {key: child.snapshot()["count"] for key, child in HTTP_REQUEST_SECONDS._children.items()}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in ("/api/items/a", "/api/items/b", "/api/items/missing", "/nowhere"):
+            await client.get(path)
+
+    counts = {
+        key: child.snapshot()["count"] - before.get(key, 0)
+        for key, child in HTTP_REQUEST_SECONDS._children.items()
+    }
+    assert counts[("GET", "/api/items/{item_id}", "200")] == 2
+    assert counts[("GET", "/api/items/{item_id}", "404")] == 1
+    assert counts[("GET", UNMATCHED_ROUTE, "404")] == 1
+
+
+@instrument_repository
+class Repository:
+    async def fetch(self):
+        return current_repository_method.get()
+
+    async def stream(self):
+        for _ in range(2):
+            yield current_repository_method.get()
+
+    async def _private(self):
+        return current_repository_method.get()
+
+
+@pytest.mark.asyncio
+async def test_repository_methods_tag_their_statements():
+    repository = Repository()
+    assert await repository.fetch() == "Repository.fetch"
+    assert await repository._private() == UNATTRIBUTED
+
+    # The tag is set while the generator runs, not while its caller handles an item
+    async for tag in repository.stream():
+        assert tag == "Repository.stream"
+        assert current_repository_method.get() == UNATTRIBUTED
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.tests.conftest import seed_containers
+
+INVENTORY_URL = "/api/v1/metrics/inventory"
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+@pytest.mark.asyncio
+async def test_row_errors_are_capped(client, engine, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_MAX_ERRORS", 3)
+    container_id = (await seed_containers(engine, 1))[0]
+    lines = [{"container_id": "missing", "date": f"2025-07-{day:02d}"} for day in range(1, 6)]
+    lines += [{"container_id": container_id, "date": "not a date"}] * 4
+    lines += [{"container_id": container_id, "date": "2025-08-01", "yield_kg": 1.5}]
+    body = "\n".join(json.dumps(line) for line in lines)
+
+    response = await client.post(INVENTORY_URL, content=body, headers=NDJSON)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["accepted"], result["rejected"]) == (1, 9)
+    assert len(result["errors"]) == 3
+    assert result["errors_omitted"] == 6
+
+
+@pytest.mark.asyncio
+async def test_json_array_body_is_limited(client, engine, monkeypatch):
+    container_id = (await seed_containers(engine, 1))[0]
+    rows = [{"container_id": container_id, "date": f"2025-08-{day:02d}", "yield_kg": 2.0} for day in range(1, 11)]
+    body = json.dumps(rows)
+
+    monkeypatch.setattr(settings, "INGEST_MAX_JSON_BYTES", len(body))
+    accepted = await client.post(INVENTORY_URL, content=body, headers={"Content-Type": "application/json"})
+    assert accepted.status_code == 200
+    assert accepted.json()["accepted"] == 10
+
+    monkeypatch.setattr(settings, "INGEST_MAX_JSON_BYTES", len(body) - 1)
+    too_large = await client.post(INVENTORY_URL, content=body, headers={"Content-Type": "application/json"})
+    assert too_large.status_code == 413
+
+    # The same rows as NDJSON are streamed and not limited
+    ndjson = "\n".join(json.dumps(row) for row in rows)
+    streamed = await client.post(INVENTORY_URL, content=ndjson, headers=NDJSON)
+    assert streamed.status_code == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", ['{"container_id": "x"}', "[1, 2", ""])
+async def test_json_body_must_be_an_array(client, body):
+    response = await client.post(INVENTORY_URL, content=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
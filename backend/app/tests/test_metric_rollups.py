@@ -0,0 +1,120 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, insert, select, text
+
+from app.models import InventoryMetric, InventoryMetricRollup, RollupWatermark
+from app.services.metric_rollup_service import MetricRollupService
+from app.tests.conftest import seed_containers
+
+SOURCE = "inventory_metrics"
+SEEDED_ROWS = 7
+
+
+def reading(container_id: str, temperature: float) -> dict:
+    return {"container_id": container_id, "date": date(2025, 7, 1), "air_temperature": temperature}
+
+
+async def rolled_up_readings(engine) -> int:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(func.coalesce(func.sum(InventoryMetricRollup.air_temperature_count), 0))
+            .where(InventoryMetricRollup.granularity == "day")
+        )
+        return result.scalar()
+
+
+async def watermark(engine) -> tuple:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(RollupWatermark.last_id, RollupWatermark.fence_id).where(RollupWatermark.source == SOURCE)
+        )
+        return tuple(result.one())
+
+
+@pytest_asyncio.fixture
+async def open_writer(engine):
+    # Transactions that have taken an xid and stay open until the test ends them; any still
+    # open when the test stops are rolled back so they can't block the next schema reset
+    connections = []
+
+    async def open_writer():
+        conn = await engine.connect()
+        connections.append(conn)
+        transaction = await conn.begin()
+        await conn.execute(text("SELECT pg_current_xact_id()"))
+        return conn, transaction
+
+    yield open_writer
+    for conn in connections:
+        await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_waits_for_lower_ids_committed_late(engine, session, open_writer):
+    container_id = (await seed_containers(engine, 1))[0]
+    service = MetricRollupService(session)
+    assert await service.refresh(SOURCE) == {SOURCE: SEEDED_ROWS}
+
+    slow, transaction = await open_writer()
+    await slow.execute(insert(InventoryMetric).values(reading(container_id, 20.0)))
+    async with engine.begin() as conn:
+        await conn.execute(insert(InventoryMetric).values(reading(container_id, 21.0)))
+
+    # The committed row sits above an id that is still in flight, so neither is consumed yet
+    assert await service.refresh(SOURCE) == {SOURCE: 0}
+    assert await service.refresh(SOURCE) == {SOURCE: 0}
+    assert await rolled_up_readings(engine) == 0
+
+    await transaction.commit()
+    await slow.close()
+    assert await service.refresh(SOURCE) == {SOURCE: 2}
+    assert await rolled_up_readings(engine) == 2
+    assert await watermark(engine) == (SEEDED_ROWS + 2, None)
+
+
+@pytest.mark.asyncio
+async def test_fence_holds_until_running_transactions_end(engine, session, open_writer):
+    container_id = (await seed_containers(engine, 1))[0]
+    service = MetricRollupService(session)
+    await service.refresh(SOURCE)
+
+    # Another transaction is running while new rows commit: they could sit above an id it
+    # is about to write, so the rows are fenced instead of consumed
+    other, transaction = await open_writer()
+    async with engine.begin() as conn:
+        await conn.execute(insert(InventoryMetric), [reading(container_id, 18.0 + n) for n in range(5)])
+    assert await service.refresh(SOURCE, batch_size=2) == {SOURCE: 0}
+    assert await watermark(engine) == (SEEDED_ROWS, SEEDED_ROWS + 5)
+    await transaction.commit()
+    await other.close()
+
+    # Once those transactions are gone the fence is passed, even with a new one running
+    other, transaction = await open_writer()
+    assert await service.refresh(SOURCE, batch_size=2) == {SOURCE: 5}
+    assert await rolled_up_readings(engine) == 5
+    await transaction.rollback()
+    await other.close()
+
+    assert await service.refresh(SOURCE) == {SOURCE: 0}
+    assert await watermark(engine) == (SEEDED_ROWS + 5, None)
+
+
+@pytest.mark.asyncio
+async def test_backfill_matches_incremental_refresh(engine, session):
+    container_ids = await seed_containers(engine, 3)
+    service = MetricRollupService(session)
+    await service.refresh(SOURCE)
+    async with engine.begin() as conn:
+        await conn.execute(insert(InventoryMetric), [
+            reading(container_id, 15.0 + n) for n in range(4) for container_id in container_ids
+        ])
+    await service.refresh(SOURCE, batch_size=5)
+    incremental = (await service.get_inventory_series(container_ids[1], date(2025, 6, 1), date(2025, 7, 31))).points
+
+    await service.backfill(SOURCE)
+    rebuilt = (await service.get_inventory_series(container_ids[1], date(2025, 6, 1), date(2025, 7, 31))).points
+    assert incremental == rebuilt
+    july = rebuilt[-1].values["air_temperature"]
+    assert (july.count, july.min, july.max, july.avg) == (4, 15.0, 18.0, 16.5)
@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.core.config import settings
+from app.models import InventoryMetric
+from app.repositories.partition_repository import add_months
+from app.services.partition_service import PartitionService
+from app.tests.conftest import seed_containers
+
+TABLE = "inventory_metrics"
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+async def rows_per_partition(engine) -> dict:
+    async with engine.connect() as conn:
+        result = await conn.execute(text(f"SELECT tableoid::regclass::text, count(*) FROM {TABLE} GROUP BY 1"))
+        return dict(result.all())
+
+
+@pytest.mark.asyncio
+async def test_maintain_creates_months_ahead_and_moves_default_rows(engine, session, monkeypatch):
+    monkeypatch.setattr(settings, "INVENTORY_METRICS_RETENTION_MONTHS", None)
+    await seed_containers(engine, 2)
+    assert await rows_per_partition(engine) == {"inventory_metrics_default": 14}
+
+    service = PartitionService(session)
+    report = await service.maintain(TABLE, today=date(2025, 6, 15), premake_months=1)
+    assert report[TABLE] == {
+        "created": ["inventory_metrics_p202506", "inventory_metrics_p202507"], "dropped": [], "expired_default_rows": 0
+    }
+    # The seeded week of June moved out of the default partition when June was attached
+    assert await rows_per_partition(engine) == {"inventory_metrics_p202506": 14}
+
+    plan = await service.plan(TABLE, today=date(2025, 6, 20), premake_months=1)
+    assert plan[TABLE]["create"] == []
+
+
+@pytest.mark.asyncio
+async def test_maintain_drops_months_past_retention(engine, session, monkeypatch):
+    container_id = (await seed_containers(engine, 1))[0]
+    async with engine.begin() as conn:
+        await conn.execute(insert(InventoryMetric).values(container_id=container_id, date=date(2024, 1, 5)))
+    service = PartitionService(session)
+    monkeypatch.setattr(settings, "INVENTORY_METRICS_RETENTION_MONTHS", None)
+    await service.maintain(TABLE, today=date(2025, 6, 1), premake_months=0)
+
+    monkeypatch.setattr(settings, "INVENTORY_METRICS_RETENTION_MONTHS", 1)
+    report = await service.maintain(TABLE, today=date(2025, 8, 10), premake_months=0)
+    assert report[TABLE] == {
+        "created": ["inventory_metrics_p202508"], "dropped": ["inventory_metrics_p202506"], "expired_default_rows": 1
+    }
+    assert await rows_per_partition(engine) == {}
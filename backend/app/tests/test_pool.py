@@ -0,0 +1,51 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.metrics import registry
+from app.core.pool import InstrumentedAsyncPool, pool_snapshot, register_pool_metrics
+from app.tests.conftest import TEST_DATABASE_URL
+
+
+@pytest_asyncio.fixture
+async def pooled_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(
+        TEST_DATABASE_URL, poolclass=InstrumentedAsyncPool, pool_size=1, max_overflow=0, pool_timeout=0.2
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_checkouts_and_timeouts(pooled_engine):
+    for _ in range(3):
+        async with pooled_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async with pooled_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            await pooled_engine.connect()
+        snapshot = pool_snapshot(pooled_engine.pool)
+        assert (snapshot["size"], snapshot["checked_out"]) == (1, 1)
+
+    snapshot = pool_snapshot(pooled_engine.pool)
+    assert (snapshot["checkouts"], snapshot["timeouts"], snapshot["checked_out"]) == (4, 1, 0)
+    assert snapshot["wait_seconds"]["count"] == 5
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_survive_dispose(pooled_engine):
+    register_pool_metrics("pool-test", pooled_engine)
+    async with pooled_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await pooled_engine.dispose()
+    async with pooled_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert pool_snapshot(pooled_engine.pool)["checkouts"] == 2
+    rendered = registry.render()
+    assert 'db_pool_checkouts_total{pool="pool-test"} 2' in rendered
+    assert 'db_pool_size{pool="pool-test"} 1' in rendered
@@ -0,0 +1,58 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import profiling
+from app.core.config import settings
+from app.main import app
+
+
+def profiled_app(token):
+    inner = FastAPI()
+
+    @inner.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return profiling.ProfilingMiddleware(inner, header="X-Profile", token=token, sample_rate=0.0, slow_seconds=None)
+
+
+async def get(asgi_app, path: str, headers=None) -> httpx.Response:
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = profiling.ProfileStore(10)
+    monkeypatch.setattr(profiling, "profile_store", store)
+    return store
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token,header,profiled", [
+    (None, "1", False),
+    ("s3cret", "1", False),
+    ("s3cret", "s3cret-not", False),
+    ("s3cret", "s3cret", True),
+])
+async def test_profiling_header_needs_the_internal_token(store, token, header, profiled):
+    response = await get(profiled_app(token), "/ping", {"X-Profile": header})
+    assert response.status_code == 200
+    assert ("x-profile-id" in response.headers) is profiled
+    assert len(store.list()) == int(profiled)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token,header,status", [
+    (None, None, 404),
+    (None, "anything", 404),
+    ("s3cret", None, 403),
+    ("s3cret", "wrong", 403),
+    ("s3cret", "s3cret", 200),
+])
+async def test_internal_endpoints_need_the_internal_token(store, monkeypatch, token, header, status):
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", token)
+    headers = {"X-Internal-Token": header} if header is not None else None
+    assert (await get(app, "/internal/profiles", headers)).status_code == status
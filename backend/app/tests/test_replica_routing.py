@@ -0,0 +1,65 @@
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import db
+from app.core.config import settings
+from app.core.replica import ReadYourWritesMiddleware, reads_own_writes
+
+COOKIE = settings.REPLICA_STICKY_COOKIE
+
+
+def request(cookie=None) -> Request:
+    headers = [(b"cookie", f"{COOKIE}={cookie}".encode())] if cookie is not None else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    # Session factories that are never connected; only which one is picked matters
+    monkeypatch.setattr(db, "AsyncSessionLocal", sessionmaker(class_=AsyncSession, info={"engine": "primary"}))
+    monkeypatch.setattr(db, "ReplicaSessionLocal", sessionmaker(class_=AsyncSession, info={"engine": "replica"}))
+    monkeypatch.setattr(db, "replica_engine", object())
+
+
+@pytest.mark.parametrize("cookie,pinned", [
+    (None, False),
+    (str(int(time.time()) + 60), True),
+    (str(int(time.time()) - 1), False),
+    ("garbage", False),
+])
+def test_reads_go_to_the_replica_unless_the_client_just_wrote(replica, cookie, pinned):
+    session = db.open_read_session(request(cookie))
+    assert session.info["engine"] == ("primary" if pinned else "replica")
+    assert reads_own_writes(session) is pinned
+
+
+def test_without_a_replica_reads_use_the_primary(monkeypatch):
+    monkeypatch.setattr(db, "replica_engine", None)
+    session = db.open_read_session(request(str(int(time.time()) + 60)))
+    assert reads_own_writes(session) is False
+
+
+@pytest.mark.asyncio
+async def test_successful_writes_pin_the_client_to_the_primary():
+    inner = FastAPI()
+
+    @inner.api_route("/items", methods=["GET", "POST"])
+    async def items():
+        return {}
+
+    @inner.post("/rejected")
+    async def rejected():
+        raise HTTPException(status_code=400)
+
+    transport = httpx.ASGITransport(app=ReadYourWritesMiddleware(inner, cookie=COOKIE, seconds=5))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert COOKIE not in (await client.get("/items")).cookies
+        assert COOKIE not in (await client.post("/rejected")).cookies
+        pinned_until = int((await client.post("/items")).cookies[COOKIE])
+    assert time.time() < pinned_until <= time.time() + 5
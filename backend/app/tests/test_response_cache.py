@@ -0,0 +1,120 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.core import cache
+from app.core.cache import MemoryCacheBackend, ResponseCache, container_change_tags
+from app.tests.conftest import seed_containers
+
+
+def memory_cache(max_entries: int = 100) -> ResponseCache:
+    return ResponseCache(MemoryCacheBackend(max_entries, ttl_seconds=60))
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_entries_are_served_until_one_of_their_tags_is_invalidated():
+    response_cache = memory_cache()
+    detail, listing = Loader(b"detail"), Loader(b"list")
+    for _ in range(2):
+        assert await response_cache.get_or_load("detail", ["container:c1"], detail) == b"detail"
+        assert await response_cache.get_or_load("list", ["containers:all"], listing) == b"list"
+    assert (detail.calls, listing.calls) == (1, 1)
+
+    await response_cache.invalidate(["container:c1"])
+    await response_cache.get_or_load("detail", ["container:c1"], detail)
+    await response_cache.get_or_load("list", ["containers:all"], listing)
+    assert (detail.calls, listing.calls) == (2, 1)
+    assert response_cache.stats.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_a_load_makes_the_entry_stale():
+    response_cache = memory_cache()
+
+    async def racing_load():
+        # A write lands after the tag versions were read but before the body is stored
+        await response_cache.invalidate(["container:c1"])
+        return b"built before the write"
+
+    await response_cache.get_or_load("detail", ["container:c1"], racing_load)
+    assert await response_cache.get("detail") is None
+
+
+@pytest.mark.asyncio
+async def test_missing_values_are_not_cached_and_refresh_replaces_entries():
+    response_cache = memory_cache()
+    missing = Loader(None)
+    await response_cache.get_or_load("detail", ["container:c1"], missing)
+    await response_cache.get_or_load("detail", ["container:c1"], missing)
+    assert missing.calls == 2
+
+    await response_cache.get_or_load("detail", ["container:c1"], Loader(b"old"))
+    assert await response_cache.get_or_load("detail", ["container:c1"], Loader(b"new"), refresh=True) == b"new"
+    assert await response_cache.get("detail") == b"new"
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used_entries():
+    response_cache = memory_cache(max_entries=2)
+    for key in ("a", "b"):
+        await response_cache.get_or_load(key, [], Loader(key.encode()))
+    await response_cache.get("a")
+    await response_cache.get_or_load("c", [], Loader(b"c"))
+    assert [await response_cache.get(key) for key in ("a", "b", "c")] == [b"a", None, b"c"]
+
+
+@pytest.mark.asyncio
+async def test_without_a_backend_every_read_loads():
+    response_cache = ResponseCache(None)
+    loader = Loader(b"body")
+    await response_cache.get_or_load("detail", ["container:c1"], loader)
+    await response_cache.get_or_load("detail", ["container:c1"], loader)
+    await response_cache.invalidate(["container:c1"])
+    assert loader.calls == 2
+
+
+def test_container_change_tags_cover_detail_and_list_pages():
+    assert container_change_tags(["c2", "c1"], ["tenant-a"]) == [
+        "container:c1", "container:c2", "containers:all", "containers:tenant:tenant-a"
+    ]
+
+
+async def latest_yield(client, container_id: str, **params) -> list:
+    detail = (await client.get(f"/api/v1/containers/{container_id}")).json()
+    listing = (await client.get("/api/v1/containers/", params=params)).json()
+    listed = {container["id"]: container for container in listing["containers"]}
+    return [detail["metrics"]["yield_kg"], listed[container_id]["metrics"]["yield_kg"]]
+
+
+@pytest.mark.asyncio
+async def test_inventory_ingest_invalidates_cached_container_pages(client, engine):
+    container_id = (await seed_containers(engine, 3))[1]
+    assert await latest_yield(client, container_id) == [6.0, 6.0]
+    assert await latest_yield(client, container_id, tenant_filter="tenant-1") == [6.0, 6.0]
+
+    # Written behind the API's back, so the cached pages are still served
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE inventory_metrics SET yield_kg = 99 WHERE date = '2025-06-30'"))
+    assert await latest_yield(client, container_id) == [6.0, 6.0]
+
+    invalidations = cache.response_cache.stats.invalidations
+    crop_rows = json.dumps([{"crop_id": "missing", "recorded_at": "2025-07-01T00:00:00"}])
+    await client.post("/api/v1/metrics/crop", content=crop_rows, headers={"Content-Type": "application/json"})
+    assert cache.response_cache.stats.invalidations == invalidations
+
+    rows = json.dumps([{"container_id": container_id, "date": "2025-07-01", "yield_kg": 7.5}])
+    response = await client.post("/api/v1/metrics/inventory", content=rows, headers={"Content-Type": "application/json"})
+    assert response.json()["accepted"] == 1
+    assert await latest_yield(client, container_id) == [7.5, 7.5]
+    assert await latest_yield(client, container_id, tenant_filter="tenant-1") == [7.5, 7.5]
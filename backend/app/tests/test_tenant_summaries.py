@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import text
+
+from app.models.tenant import TENANT_COUNTER_COLUMNS
+
+CONTAINERS_URL = "/api/v1/containers/"
+
+RECOUNT = text("""
+    SELECT tenant AS name,
+           count(*) AS container_count,
+           count(*) FILTER (WHERE type = 'physical') AS physical_count,
+           count(*) FILTER (WHERE type = 'virtual') AS virtual_count,
+           count(*) FILTER (WHERE status = 'created') AS created_count,
+           count(*) FILTER (WHERE status = 'active') AS active_count,
+           count(*) FILTER (WHERE status = 'maintenance') AS maintenance_count,
+           count(*) FILTER (WHERE status = 'inactive') AS inactive_count,
+           count(*) FILTER (WHERE has_alert) AS alert_count
+    FROM containers GROUP BY tenant ORDER BY tenant
+""")
+
+
+async def assert_counters_match_containers(client, engine) -> None:
+    async with engine.connect() as conn:
+        expected = [dict(row) for row in (await conn.execute(RECOUNT)).mappings()]
+    summaries = (await client.get("/api/v1/tenants/summary")).json()
+    assert [{"name": summary["name"], **{column: summary[column] for column in TENANT_COUNTER_COLUMNS}}
+            for summary in summaries] == expected
+    tenants = (await client.get("/api/v1/tenants/")).json()
+    assert [tenant["name"] for tenant in tenants] == [row["name"] for row in expected]
+
+
+async def create(client, name: str, tenant: str, container_type: str = "physical") -> str:
+    body = {"name": name, "type": container_type, "tenant": tenant, "purpose": "research"}
+    response = await client.post(CONTAINERS_URL, json=body)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_tenant_counters_follow_container_writes(client, engine):
+    first = await create(client, "first", "tenant-a")
+    second = await create(client, "second", "tenant-a", "virtual")
+    third = await create(client, "third", "tenant-b")
+    await assert_counters_match_containers(client, engine)
+
+    await client.put(f"{CONTAINERS_URL}{first}", json={"status": "maintenance"})
+    await client.put(f"{CONTAINERS_URL}{second}", json={"tenant": "tenant-c", "status": "active"})
+    await assert_counters_match_containers(client, engine)
+
+    await client.put(f"{CONTAINERS_URL}batch", json=[
+        {"id": first, "tenant": "tenant-b"}, {"id": third, "status": "inactive"}
+    ])
+    await assert_counters_match_containers(client, engine)
+
+    # A tenant whose last container leaves drops out of both listings
+    await client.delete(f"{CONTAINERS_URL}{second}")
+    await client.post(f"{CONTAINERS_URL}batch", json=[
+        {"name": "fourth", "type": "virtual", "tenant": "tenant-d", "purpose": "production"},
+        {"name": "first", "type": "virtual", "tenant": "tenant-d", "purpose": "production"},
+    ])
+    await client.post(f"{CONTAINERS_URL}batch/delete", json={"ids": [third]})
+    await assert_counters_match_containers(client, engine)
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_leave_counters_alone(client, engine):
+    container_id = await create(client, "only", "tenant-a")
+    assert (await client.post(CONTAINERS_URL, json={
+        "name": "only", "type": "virtual", "tenant": "tenant-b", "purpose": "research"
+    })).status_code == 400
+    assert (await client.put(f"{CONTAINERS_URL}missing", json={"tenant": "tenant-b"})).status_code == 404
+    assert (await client.put(f"{CONTAINERS_URL}{container_id}", json={"tenant": "tenant-b"}, headers={
+        "If-Unmodified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+    })).status_code == 412
+    await assert_counters_match_containers(client, engine)
@@ -0,0 +1,71 @@
+"""Compare two benchmarks.load_test result files and flag regressions.
+
+    python -m benchmarks.compare before.json after.json --threshold 0.10
+
+A scenario regresses when the chosen latency percentile grows by more than the
+threshold, or its throughput drops by more than the threshold. The exit status is 1
+if any scenario regressed, so the script can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def compare(baseline: dict, candidate: dict, percentile: str, threshold: float):
+    rows = []
+    for name, before in baseline["scenarios"].items():
+        after = candidate["scenarios"].get(name)
+        if after is None:
+            continue
+        latency_change = change(before["latency_ms"][percentile], after["latency_ms"][percentile])
+        throughput_change = change(before["throughput_rps"], after["throughput_rps"])
+        rows.append({
+            "scenario": name,
+            "before_ms": before["latency_ms"][percentile],
+            "after_ms": after["latency_ms"][percentile],
+            "latency_change": latency_change,
+            "before_rps": before["throughput_rps"],
+            "after_rps": after["throughput_rps"],
+            "throughput_change": throughput_change,
+            "regressed": latency_change > threshold or throughput_change < -threshold,
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two load test result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--percentile", choices=["p50", "p95", "p99"], default="p95")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative change")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    print(f"baseline  {baseline['meta'].get('commit')}  {baseline['meta'].get('timestamp')}")
+    print(f"candidate {candidate['meta'].get('commit')}  {candidate['meta'].get('timestamp')}")
+    print(f"{'scenario':<18} {args.percentile + ' before':>12} {'after':>10} {'change':>8} {'rps before':>11} {'after':>9} {'change':>8}")
+
+    rows = compare(baseline, candidate, args.percentile, args.threshold)
+    for row in rows:
+        print(
+            f"{row['scenario']:<18} {row['before_ms']:>10.2f}ms {row['after_ms']:>8.2f}ms {row['latency_change']:>+8.1%} "
+            f"{row['before_rps']:>11.1f} {row['after_rps']:>9.1f} {row['throughput_change']:>+8.1%}"
+            f"{'  REGRESSION' if row['regressed'] else ''}"
+        )
+    regressions = [row["scenario"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
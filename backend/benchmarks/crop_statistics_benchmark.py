@@ -0,0 +1,137 @@
+"""Throughput and peak memory of the vectorized crop statistics pass.
+
+Needs no database. Synthetic crop_metrics rows are generated one chunk at a time in the
+shape the repository streams them, so peak memory reflects the chunk size and not the
+total row count. Timings exclude generating the rows:
+
+    python -m benchmarks.crop_statistics_benchmark --rows 10000000 --chunk-size 50000
+
+A per-crop pure Python loop over the first --baseline-rows rows is timed for comparison.
+"""
+import argparse
+import json
+import math
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from app.services.crop_analytics import CropStatsAccumulator, finalize
+
+START_SECONDS = datetime(2025, 1, 1).timestamp()
+
+
+def generate_chunk(first_row: int, size: int, readings_per_crop: int, rng: np.random.Generator):
+    index = np.arange(first_row, first_row + size)
+    crops = index // readings_per_crop
+    day = index % readings_per_crop
+    height = 2.0 + 0.4 * day + rng.normal(0, 0.5, size)
+    height[rng.random(size) < 0.05] = np.nan
+    biomass = 5.0 + 1.5 * day + rng.normal(0, 2.0, size)
+    health = 90.0 - 0.1 * day + rng.normal(0, 1.0, size)
+    leaves = (day // 3).astype(np.float64)
+    disease = rng.random(size) < 0.02
+    pest = rng.random(size) < 0.01
+    return [
+        (f"crop-{crop:07d}", seconds, *values)
+        for crop, seconds, *values in zip(
+            crops.tolist(), (START_SECONDS + day * 86_400.0 + (crops % 24) * 3_600.0).tolist(), height.tolist(), biomass.tolist(), health.tolist(),
+            leaves.tolist(), disease.tolist(), pest.tolist(), strict=True
+        )
+    ]
+
+
+def run_vectorized(rows: int, chunk_size: int, readings_per_crop: int, trace_memory: bool = False) -> dict:
+    rng = np.random.default_rng(7)
+    accumulator = CropStatsAccumulator()
+    crops = 0
+    generate_seconds = 0.0
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for first_row in range(0, rows, chunk_size):
+        generated = time.perf_counter()
+        chunk = generate_chunk(first_row, min(chunk_size, rows - first_row), readings_per_crop, rng)
+        generate_seconds += time.perf_counter() - generated
+        batch = accumulator.feed(chunk)
+        finalize(batch, np.full(len(batch), np.nan))
+        crops += len(batch)
+        del chunk
+    pending = accumulator.flush()
+    if pending is not None:
+        finalize(pending, np.full(len(pending), np.nan))
+        crops += len(pending)
+    elapsed = time.perf_counter() - start - generate_seconds
+    result = {
+        "rows": rows,
+        "crops": crops,
+        "chunk_size": chunk_size,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed),
+    }
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_memory_mb"] = round(peak / 2 ** 20, 1)
+    return result
+
+
+def python_statistics(readings):
+    # The crop-by-crop shape this job replaces: one least-squares fit per crop in Python
+    heights = [(t, h) for t, h, *_ in readings if not math.isnan(h)]
+    n = len(heights)
+    mean_t = sum(t for t, _ in heights) / n
+    mean_h = sum(h for _, h in heights) / n
+    variance = sum((t - mean_t) ** 2 for t, _ in heights)
+    slope = sum((t - mean_t) * (h - mean_h) for t, h in heights) / variance if variance else None
+    biomass = [b for _, _, b, *_ in readings if b is not None]
+    health = [s for _, _, _, s, *_ in readings if s is not None]
+    return slope, max(h for _, h in heights), max(biomass), sum(health) / len(health)
+
+
+def run_python(rows: int, readings_per_crop: int) -> dict:
+    chunk = generate_chunk(0, rows, readings_per_crop, np.random.default_rng(7))
+    start = time.perf_counter()
+    by_crop = {}
+    for crop_id, recorded_at, *values in chunk:
+        t = (recorded_at - START_SECONDS) / 86_400
+        by_crop.setdefault(crop_id, []).append((t, *values))
+    for readings in by_crop.values():
+        python_statistics(readings)
+    elapsed = time.perf_counter() - start
+    return {"rows": rows, "seconds": round(elapsed, 3), "rows_per_second": round(rows / elapsed)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--readings-per-crop", type=int, default=90)
+    parser.add_argument("--baseline-rows", type=int, default=500_000)
+    parser.add_argument("--memory-rows", type=int, nargs="+", default=[500_000, 2_000_000])
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    vectorized = run_vectorized(args.rows, args.chunk_size, args.readings_per_crop)
+    print(
+        f"vectorized: {vectorized['rows']} rows, {vectorized['crops']} crops in {vectorized['seconds']}s "
+        f"({vectorized['rows_per_second']} rows/s) with chunks of {vectorized['chunk_size']}"
+    )
+    # tracemalloc slows every allocation down, so memory is measured in separate runs;
+    # the peak should not move as the row count grows
+    memory = []
+    for rows in args.memory_rows:
+        traced = run_vectorized(rows, args.chunk_size, args.readings_per_crop, trace_memory=True)
+        memory.append({"rows": rows, "peak_memory_mb": traced["peak_memory_mb"]})
+        print(f"peak memory for {rows} rows: {traced['peak_memory_mb']} MB")
+    baseline = run_python(args.baseline_rows, args.readings_per_crop)
+    print(f"per-crop python: {baseline['rows']} rows in {baseline['seconds']}s ({baseline['rows_per_second']} rows/s)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"vectorized": vectorized, "memory": memory, "python": baseline}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
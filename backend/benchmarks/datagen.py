@@ -0,0 +1,311 @@
+"""Populate a scratch database with a synthetic farm for benchmarks and load tests.
+
+Run against a database migrated to head. Every table the generator writes is emptied
+first. The values are derived from the row numbers and --seed, so the same arguments
+always produce the same data:
+
+    python -m benchmarks.datagen --database-url postgresql+asyncpg://.../bench --containers 100000
+
+Containers are generated for all --containers. Daily crop and inventory metrics are
+generated for the first --metric-containers containers only, covering --months months
+up to --anchor. Those metric rows are what dominate the database size.
+Afterwards the tenant counters, metric rollups and (with --statistics) crop statistics
+are rebuilt the way the application maintains them, and the tables are analyzed.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.repositories.partition_repository import (
+    PARTITIONED_TABLES,
+    PartitionRepository,
+    add_months,
+    month_start,
+)
+from app.services.crop_statistics_service import CropStatisticsService
+from app.services.metric_rollup_service import MetricRollupService
+
+SEED_TYPES = ["basil", "tomato", "lettuce", "kale", "spinach", "arugula", "mint", "microgreens"]
+
+TRUNCATE_SQL = """
+    TRUNCATE containers, locations, tenants, crops, trays, panels, crop_metrics, inventory_metrics,
+        inventory_metric_rollups, crop_metric_rollups, rollup_watermarks, crop_statistics,
+        crop_statistic_states CASCADE
+"""
+
+# h is a per-row 31-bit hash of the seed and row number; slicing it with different
+# divisors gives independent-looking but reproducible attributes
+ROW_HASH = "(hashtext(:seed || ':' || {key})::bigint & 2147483647)"
+
+LOCATIONS_SQL = text(f"""
+    INSERT INTO locations (id, city, country, address)
+    SELECT
+        md5('location-' || i)::uuid,
+        (ARRAY['Berlin', 'Lisbon', 'Austin', 'Osaka', 'Nairobi', 'Toronto', 'Lyon', 'Pune'])[1 + h % 8],
+        (ARRAY['DE', 'PT', 'US', 'JP', 'KE', 'CA', 'FR', 'IN'])[1 + h % 8],
+        (h % 900 + 1) || ' Greenhouse Road'
+    FROM generate_series(0, CAST(:locations AS integer) - 1) AS i,
+        LATERAL (SELECT {ROW_HASH.format(key="'location-' || i")} AS h) AS r
+""")
+
+CONTAINERS_SQL = text(f"""
+    INSERT INTO containers (
+        id, type, name, tenant, purpose, location_id, status, seed_types,
+        created, modified, has_alert, notes, shadow_service_enabled, ecosystem_connected
+    )
+    SELECT
+        'bench-' || lpad(i::text, 7, '0'),
+        (ARRAY['physical', 'virtual'])[1 + h % 2],
+        seed_type || '-farm-' || lpad(i::text, 7, '0'),
+        'tenant-' || lpad(((h / 3) % CAST(:tenants AS integer))::text, 3, '0'),
+        (ARRAY['development', 'research', 'production'])[1 + (h / 7) % 3],
+        md5('location-' || (i % CAST(:locations AS integer)))::uuid,
+        (ARRAY['created', 'active', 'active', 'active', 'maintenance', 'inactive'])[1 + (h / 11) % 6],
+        json_build_array(json_build_object(
+            'id', 'seed-' || seed_type, 'name', initcap(seed_type), 'variety', NULL,
+            'supplier', 'Supplier ' || (h / 13) % 5, 'batch_id', 'B' || (h / 17) % 1000
+        )),
+        created,
+        LEAST(created + make_interval(mins => ((h / 19) % 86400)::int), CAST(:anchor AS timestamp)),
+        (h / 23) % 10 = 0,
+        CASE WHEN (h / 29) % 4 = 0 THEN 'Generated for benchmarks' END,
+        (h / 31) % 2 = 0,
+        (h / 37) % 2 = 0
+    FROM generate_series(CAST(:low AS integer), CAST(:high AS integer)) AS i,
+        LATERAL (SELECT {ROW_HASH.format(key="i")} AS h) AS r,
+        LATERAL (SELECT
+            (CAST(:seed_types AS text[]))[1 + (h / 41) % 8] AS seed_type,
+            CAST(:anchor AS timestamp) - make_interval(mins => ((h / 43) % 525600)::int) AS created
+        ) AS a
+""")
+
+TRAYS_SQL = text(f"""
+    INSERT INTO trays (id, rfid_tag, utilization_percentage, crop_count, is_empty, provisioned_at, container_id)
+    SELECT
+        'bench-tray-' || i || '-' || j,
+        'RFID-T-' || i || '-' || j,
+        (h % 101)::int,
+        (h / 101 % 40)::int,
+        h % 101 = 0,
+        CAST(:anchor AS timestamp) - make_interval(days => ((h / 7) % 365)::int),
+        'bench-' || lpad(i::text, 7, '0')
+    FROM generate_series(CAST(:low AS integer), CAST(:high AS integer)) AS i, generate_series(1, CAST(:trays AS integer)) AS j,
+        LATERAL (SELECT {ROW_HASH.format(key="'tray-' || i || '-' || j")} AS h) AS r
+""")
+
+PANELS_SQL = text(f"""
+    INSERT INTO panels (id, rfid_tag, utilization_percentage, crop_count, is_empty, provisioned_at, container_id)
+    SELECT
+        'bench-panel-' || i || '-' || j,
+        'RFID-P-' || i || '-' || j,
+        (h % 101)::int,
+        (h / 101 % 60)::int,
+        h % 101 = 0,
+        CAST(:anchor AS timestamp) - make_interval(days => ((h / 7) % 365)::int),
+        'bench-' || lpad(i::text, 7, '0')
+    FROM generate_series(CAST(:low AS integer), CAST(:high AS integer)) AS i, generate_series(1, CAST(:panels AS integer)) AS j,
+        LATERAL (SELECT {ROW_HASH.format(key="'panel-' || i || '-' || j")} AS h) AS r
+""")
+
+CROPS_SQL = text(f"""
+    INSERT INTO crops (
+        id, container_id, seed_type, seed_date, transplanting_date_planned, harvesting_date_planned,
+        transplanted_date, harvesting_date, age, status, overdue_days
+    )
+    SELECT
+        'bench-crop-' || i || '-' || j,
+        'bench-' || lpad(i::text, 7, '0'),
+        (CAST(:seed_types AS text[]))[1 + h % 8],
+        seed_date,
+        seed_date + interval '14 days',
+        seed_date + interval '45 days',
+        CASE WHEN age >= 14 THEN seed_date + interval '14 days' END,
+        CASE WHEN age > 50 THEN seed_date + interval '50 days' END,
+        age,
+        CASE WHEN age > 50 THEN 'harvested' WHEN age >= 14 THEN 'growing' ELSE 'germinating' END,
+        GREATEST(age - 45, 0)
+    FROM generate_series(CAST(:low AS integer), CAST(:high AS integer)) AS i, generate_series(1, CAST(:crops AS integer)) AS j,
+        LATERAL (SELECT {ROW_HASH.format(key="'crop-' || i || '-' || j")} AS h) AS r,
+        LATERAL (SELECT (h / 8 % 60)::int AS age) AS a,
+        LATERAL (SELECT CAST(:anchor AS timestamp) - make_interval(days => age) AS seed_date) AS s
+""")
+
+INVENTORY_METRICS_SQL = text(f"""
+    INSERT INTO inventory_metrics (
+        container_id, date, nursery_station_utilization, cultivation_area_utilization,
+        air_temperature, humidity, co2_level, yield_kg
+    )
+    SELECT
+        'bench-' || lpad(i::text, 7, '0'),
+        day,
+        (40 + h % 60)::int,
+        (30 + (h / 60) % 70)::int,
+        18 + (h / 4200 % 80) / 10.0,
+        (50 + (h / 7) % 30)::int,
+        (600 + (h / 11) % 600)::int,
+        ((h / 13) % 500) / 10.0
+    FROM generate_series(CAST(:low AS integer), CAST(:high AS integer)) AS i,
+        generate_series(CAST(:start AS date), CAST(:anchor AS date), interval '1 day') AS day,
+        LATERAL (SELECT {ROW_HASH.format(key="i || ':' || day")} AS h) AS r
+""")
+
+CROP_METRICS_SQL = text(f"""
+    INSERT INTO crop_metrics (
+        crop_id, recorded_at, height_cm, leaf_count, biomass_g, health_score,
+        disease_detected, pest_detected, temperature_c, humidity_percent, ph_level, ec_level
+    )
+    SELECT
+        'bench-crop-' || i || '-' || j,
+        day + make_interval(hours => (h % 24)::int),
+        round(CAST(1 + 0.6 * t + (h % 100) / 50.0 AS numeric), 2),
+        (2 + t / 3)::int,
+        round(CAST(2 + 4.5 * t + (h / 100 % 100) / 10.0 AS numeric), 2),
+        round(CAST(95 - t * 0.05 - (h / 10000 % 100) / 20.0 AS numeric), 2),
+        h % 97 = 0,
+        h % 131 = 0,
+        round(CAST(19 + (h / 7 % 60) / 10.0 AS numeric), 1),
+        round(CAST(55 + (h / 11 % 250) / 10.0 AS numeric), 1),
+        round(CAST(5.5 + (h / 13 % 15) / 10.0 AS numeric), 2),
+        round(CAST(1.2 + (h / 17 % 10) / 10.0 AS numeric), 2)
+    FROM generate_series(CAST(:low AS integer), CAST(:high AS integer)) AS i, generate_series(1, CAST(:crops AS integer)) AS j,
+        generate_series(CAST(:start AS date), CAST(:anchor AS date), interval '1 day') AS day,
+        LATERAL (SELECT {ROW_HASH.format(key="i || ':' || j || ':' || day")} AS h) AS r,
+        LATERAL (SELECT extract(day FROM day - CAST(:start AS date))::int AS t) AS d
+""")
+
+TENANTS_SQL = text("""
+    INSERT INTO tenants (
+        id, name, container_count, physical_count, virtual_count,
+        created_count, active_count, maintenance_count, inactive_count, alert_count
+    )
+    SELECT
+        md5('tenant-' || tenant),
+        tenant,
+        count(*),
+        count(*) FILTER (WHERE type = 'physical'),
+        count(*) FILTER (WHERE type = 'virtual'),
+        count(*) FILTER (WHERE status = 'created'),
+        count(*) FILTER (WHERE status = 'active'),
+        count(*) FILTER (WHERE status = 'maintenance'),
+        count(*) FILTER (WHERE status = 'inactive'),
+        count(*) FILTER (WHERE has_alert)
+    FROM containers
+    GROUP BY tenant
+""")
+
+ANALYZED_TABLES = ("locations", "containers", "trays", "panels", "crops", "crop_metrics", "inventory_metrics", "tenants")
+
+
+def months_before(anchor: date, months: int) -> date:
+    return add_months(month_start(anchor), -months)
+
+
+async def ensure_partitions(session: AsyncSession, start: date, anchor: date) -> None:
+    repository = PartitionRepository(session)
+    for table in PARTITIONED_TABLES:
+        partitions = await repository.get_partitions(table)
+        month = month_start(start)
+        while month <= anchor:
+            if not any(partition.covers(month) for partition in partitions):
+                await repository.create_partition(table, month)
+            month = add_months(month, 1)
+    await session.commit()
+
+
+async def insert_in_batches(session: AsyncSession, statement, label: str, first: int, last: int, batch: int, **params) -> None:
+    start = time.perf_counter()
+    for low in range(first, last + 1, batch):
+        high = min(low + batch - 1, last)
+        await session.execute(statement, {"low": low, "high": high, **params})
+        await session.commit()
+    print(f"{label:<18} containers {first}-{last} in {time.perf_counter() - start:.1f}s")
+
+
+async def generate(args) -> dict:
+    anchor = datetime.combine(args.anchor, datetime.min.time())
+    start = months_before(args.anchor, args.months)
+    common = {"seed": str(args.seed), "anchor": anchor, "seed_types": SEED_TYPES}
+    metric_containers = min(args.metric_containers, args.containers)
+
+    engine = create_async_engine(args.database_url)
+    async with AsyncSession(engine) as session:
+        await session.execute(text(TRUNCATE_SQL))
+        await session.commit()
+        await ensure_partitions(session, start, args.anchor)
+
+        locations = max(1, args.containers // 10)
+        await session.execute(LOCATIONS_SQL, {"seed": str(args.seed), "locations": locations})
+        await session.commit()
+
+        batch = args.batch_size
+        await insert_in_batches(
+            session, CONTAINERS_SQL, "containers", 1, args.containers, batch,
+            tenants=args.tenants, locations=locations, **common
+        )
+        await insert_in_batches(session, TRAYS_SQL, "trays", 1, args.containers, batch, trays=args.trays, **common)
+        await insert_in_batches(session, PANELS_SQL, "panels", 1, args.containers, batch, panels=args.panels, **common)
+        await insert_in_batches(session, CROPS_SQL, "crops", 1, args.containers, batch, crops=args.crops, **common)
+
+        # Metric statements produce crops * days rows per container, so they go in smaller steps
+        metric_batch = max(1, batch // 50)
+        if metric_containers:
+            await insert_in_batches(
+                session, INVENTORY_METRICS_SQL, "inventory_metrics", 1, metric_containers, metric_batch,
+                start=start, **common
+            )
+            await insert_in_batches(
+                session, CROP_METRICS_SQL, "crop_metrics", 1, metric_containers, metric_batch,
+                crops=args.crops, start=start, **common
+            )
+
+        await session.execute(TENANTS_SQL)
+        await session.commit()
+
+        rollups = await MetricRollupService(session).backfill()
+        print(f"rollups: {rollups}")
+        if args.statistics:
+            statistics = await CropStatisticsService(session).rebuild()
+            print(f"crop statistics: {statistics}")
+
+        counts = {}
+        for table in ANALYZED_TABLES:
+            counts[table] = (await session.execute(text(f"SELECT count(*) FROM {table}"))).scalar_one()
+            await session.execute(text(f"ANALYZE {table}"))
+        await session.commit()
+    await engine.dispose()
+    return {"anchor": args.anchor.isoformat(), "metrics_start": start.isoformat(), "seed": args.seed, "rows": counts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--containers", type=int, default=10_000)
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--trays", type=int, default=4, help="trays per container")
+    parser.add_argument("--panels", type=int, default=2, help="panels per container")
+    parser.add_argument("--crops", type=int, default=4, help="crops per container")
+    parser.add_argument("--metric-containers", type=int, default=1_000)
+    parser.add_argument("--months", type=int, default=3)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date(2025, 6, 30))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50_000, help="containers per INSERT")
+    parser.add_argument("--statistics", action="store_true", help="also rebuild crop statistics")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = asyncio.run(generate(args))
+    summary["seconds"] = round(time.perf_counter() - start, 1)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
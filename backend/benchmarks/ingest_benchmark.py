@@ -0,0 +1,90 @@
+"""Measure bulk metric ingestion throughput through the FastAPI app.
+
+Run against a scratch database migrated to head:
+
+    python -m benchmarks.ingest_benchmark --database-url postgresql+asyncpg://.../bench
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+def build_rows(crop_ids, rows: int):
+    start = datetime(2025, 1, 1)
+    for i in range(rows):
+        yield {
+            "crop_id": random.choice(crop_ids),
+            "recorded_at": (start + timedelta(minutes=5 * i)).isoformat(),
+            "height_cm": random.uniform(1, 40),
+            "biomass_g": random.uniform(1, 300),
+            "health_score": random.uniform(0.5, 1.0),
+            "temperature_c": random.uniform(18, 26),
+            "humidity_percent": random.uniform(50, 80),
+        }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--crops", type=int, default=500)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.environ["ASYNC_SQLALCHEMY_DATABASE_URI"] = args.database_url
+    os.environ["INGEST_MAX_ROWS"] = str(args.rows)
+
+    import httpx
+    from sqlalchemy import insert
+
+    from app.core.db import AsyncSessionLocal
+    from app.main import app
+    from app.models import Container, Crop
+
+    container_id = str(uuid.uuid4())
+    crop_ids = [str(uuid.uuid4()) for _ in range(args.crops)]
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(Container).values(
+            id=container_id, name=f"ingest-bench-{container_id[:8]}", type="physical",
+            tenant="bench", purpose="research", status="active"
+        ))
+        await session.execute(insert(Crop), [
+            {"id": crop_id, "container_id": container_id, "seed_type": "basil", "status": "growing"}
+            for crop_id in crop_ids
+        ])
+        await session.commit()
+
+    rows = list(build_rows(crop_ids, args.rows))
+    ndjson = "\n".join(json.dumps(row) for row in rows).encode()
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for mode, kwargs in (
+            ("json", {"json": rows}),
+            ("ndjson", {"content": ndjson, "headers": {"content-type": "application/x-ndjson"}}),
+        ):
+            start = time.perf_counter()
+            response = await client.post("/api/v1/metrics/crop", **kwargs)
+            elapsed = time.perf_counter() - start
+            body = response.json()
+            results[mode] = {
+                "rows": args.rows,
+                "accepted": body["accepted"],
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(body["accepted"] / elapsed, 1),
+            }
+            print(f"{mode:<7} {body['accepted']:>9} rows in {elapsed:7.2f}s -> {results[mode]['rows_per_second']:>10.0f} rows/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
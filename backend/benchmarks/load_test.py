@@ -0,0 +1,254 @@
+"""Repeatable load-test scenarios against the FastAPI app.
+
+Populate the database with benchmarks.datagen first. The scenarios address the
+generated containers by their deterministic ids, and the performance scenario uses
+the same --anchor. By default the app runs in-process on the given database with the
+response cache disabled, so every request reaches the database:
+
+    python -m benchmarks.load_test --database-url postgresql+asyncpg://.../bench --output before.json
+
+Pass --base-url to load a running server instead. The results hold p50/p95/p99 latency
+and throughput per scenario, plus the git commit, so two runs can be compared with
+benchmarks.compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+API = "/api/v1"
+SEARCH_TERMS = ["basil", "tomato-farm-00001", "research active", "mint", "zz-no-match"]
+SEED_TYPES = ["basil", "tomato", "lettuce", "kale", "spinach", "arugula", "mint", "microgreens"]
+
+
+def container_id(index: int) -> str:
+    return f"bench-{index:07d}"
+
+
+def list_page(rng, i, ctx):
+    return "GET", f"{API}/containers/", {"params": {"limit": 20, "skip": 20 * rng.randrange(5)}}
+
+
+def list_filter(name, values):
+    def build(rng, i, ctx):
+        return "GET", f"{API}/containers/", {"params": {"limit": 20, name: rng.choice(values)}}
+    return build
+
+
+def list_tenant(rng, i, ctx):
+    return "GET", f"{API}/containers/", {"params": {"limit": 20, "tenant_filter": rng.choice(ctx["tenants"])}}
+
+
+def list_deep_offset(rng, i, ctx):
+    skip = rng.randrange(max(ctx["containers"] - 20, 1))
+    return "GET", f"{API}/containers/", {"params": {"limit": 20, "skip": skip, "total_mode": "estimate"}}
+
+
+def list_facets(rng, i, ctx):
+    return "GET", f"{API}/containers/", {"params": {"limit": 20, "facets": "true"}}
+
+
+def search(rng, i, ctx):
+    return "GET", f"{API}/containers/", {"params": {"limit": 20, "search": rng.choice(SEARCH_TERMS)}}
+
+
+def detail(rng, i, ctx):
+    return "GET", f"{API}/containers/{container_id(rng.randint(1, ctx['containers']))}", {}
+
+
+def tenants(rng, i, ctx):
+    return "GET", f"{API}/tenants/", {}
+
+
+def performance(rng, i, ctx):
+    end = ctx["anchor"] - timedelta(days=rng.randrange(30))
+    days, bucket = rng.choice([(7, "day"), (30, "day"), (90, "week")])
+    params = {"start_date": (end - timedelta(days=days - 1)).isoformat(), "end_date": end.isoformat(), "bucket": bucket}
+    return "GET", f"{API}/containers/performance", {"params": params}
+
+
+def create(rng, i, ctx):
+    body = {
+        "name": f"loadtest-{ctx['run_id']}-{i:06d}",
+        "type": rng.choice(["physical", "virtual"]),
+        "tenant": rng.choice(ctx["tenants"]),
+        "purpose": rng.choice(["development", "research", "production"]),
+        "seed_types": [{"id": f"seed-{seed}", "name": seed.title()} for seed in rng.sample(SEED_TYPES, 2)],
+        "location": {"city": "Berlin", "country": "DE", "address": "1 Load Test Street"},
+    }
+    return "POST", f"{API}/containers/", {"json": body}
+
+
+def update(rng, i, ctx):
+    body = {"notes": f"load test {ctx['run_id']} #{i}", "status": rng.choice(["active", "maintenance"])}
+    return "PUT", f"{API}/containers/{container_id(rng.randint(1, ctx['containers']))}", {"json": body}
+
+
+def delete(rng, i, ctx):
+    # Removes what the create scenario added, so repeated runs see the same dataset
+    return "DELETE", f"{API}/containers/{ctx['created'][i]}", {}
+
+
+SCENARIOS = {
+    "list_page": list_page,
+    "list_type": list_filter("type_filter", ["physical", "virtual"]),
+    "list_purpose": list_filter("purpose_filter", ["development", "research", "production"]),
+    "list_status": list_filter("status_filter", ["created", "active", "maintenance", "inactive"]),
+    "list_alerts": list_filter("has_alerts", ["true"]),
+    "list_tenant": list_tenant,
+    "list_deep_offset": list_deep_offset,
+    "list_facets": list_facets,
+    "search": search,
+    "detail": detail,
+    "tenants": tenants,
+    "performance": performance,
+    "create": create,
+    "update": update,
+    "delete": delete,
+}
+WRITE_SCENARIOS = ("create", "update", "delete")
+
+
+def percentile(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies, errors: int, seconds: float) -> dict:
+    ordered = sorted(latencies)
+    completed = len(ordered)
+    return {
+        "requests": completed,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(completed / seconds, 2) if seconds else 0.0,
+        "latency_ms": {
+            "min": round(ordered[0], 3) if ordered else 0.0,
+            "mean": round(sum(ordered) / completed, 3) if ordered else 0.0,
+            "p50": round(percentile(ordered, 0.50), 3),
+            "p95": round(percentile(ordered, 0.95), 3),
+            "p99": round(percentile(ordered, 0.99), 3),
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+        },
+    }
+
+
+async def run_scenario(client, name: str, requests: int, concurrency: int, warmup: int, ctx: dict, seed: int) -> dict:
+    build = SCENARIOS[name]
+    rng = random.Random(f"{seed}:{name}")
+    plan = [build(rng, i, ctx) for i in range(requests)]
+    warmup_plan = [] if name in WRITE_SCENARIOS else [build(rng, i, ctx) for i in range(warmup)]
+    for method, url, kwargs in warmup_plan:
+        await client.request(method, url, **kwargs)
+
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < len(plan):
+            index = next_index
+            next_index += 1
+            method, url, kwargs = plan[index]
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            elif name == "create":
+                ctx["created"].append(response.json()["id"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def git_revision() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git("status", "--porcelain")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Run load-test scenarios against the API")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--database-url", help="run the app in-process against this database")
+    target.add_argument("--base-url", help="load a running server instead")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date(2025, 6, 30))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled (in-process only)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    import httpx
+    if args.database_url:
+        os.environ["ASYNC_SQLALCHEMY_DATABASE_URI"] = args.database_url
+        if not args.cache:
+            os.environ["CACHE_BACKEND"] = "none"
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://bench", timeout=None)
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=None)
+
+    results = {}
+    async with client:
+        first_page = (await client.get(f"{API}/containers/", params={"limit": 1})).json()
+        ctx = {
+            "run_id": uuid.uuid4().hex[:8],
+            "containers": max(first_page["total"] or 1, 1),
+            "tenants": [tenant["name"] for tenant in (await client.get(f"{API}/tenants/")).json()] or ["tenant-000"],
+            "anchor": args.anchor,
+            "created": [],
+        }
+        for name in args.scenarios:
+            requests = len(ctx["created"]) if name == "delete" else args.requests
+            if requests == 0:
+                continue
+            results[name] = await run_scenario(client, name, requests, args.concurrency, args.warmup, ctx, args.seed)
+            latency = results[name]["latency_ms"]
+            print(
+                f"{name:<18} {results[name]['throughput_rps']:>9.1f} req/s  p50={latency['p50']:>8.2f}ms "
+                f"p95={latency['p95']:>8.2f}ms p99={latency['p99']:>8.2f}ms errors={results[name]['errors']}"
+            )
+
+    report = {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "target": "in-process" if args.database_url else args.base_url,
+            "containers": ctx["containers"],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "cache": bool(args.cache) if args.database_url else None,
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""Compare the ilike and trigram container search backends.
+
+Run against a scratch database that has been migrated to head; the containers
+table is truncated and refilled for every dataset size:
+
+    python -m benchmarks.search_benchmark --database-url postgresql+asyncpg://.../bench
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.repositories.container_repository import ContainerRepository
+
+SIZES = [10_000, 100_000, 1_000_000]
+QUERIES = ["farm", "tomato-0042", "research active", "zz-no-match"]
+
+SEED_SQL = text("""
+    INSERT INTO containers (id, type, name, tenant, purpose, status, created, modified, has_alert)
+    SELECT
+        md5(i::text),
+        (ARRAY['physical', 'virtual'])[1 + i % 2],
+        (ARRAY['farm', 'tomato', 'basil', 'lettuce', 'kale'])[1 + i % 5] || '-' || lpad(i::text, 4, '0'),
+        'tenant-' || (i % 50),
+        (ARRAY['development', 'research', 'production'])[1 + i % 3],
+        (ARRAY['created', 'active', 'maintenance', 'inactive'])[1 + i % 4],
+        now() - (i || ' minutes')::interval,
+        now() - (i || ' minutes')::interval,
+        i % 7 = 0
+    FROM generate_series(1, :rows) AS i
+""")
+
+
+async def seed(engine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE containers CASCADE"))
+        await conn.execute(SEED_SQL, {"rows": rows})
+        await conn.execute(text("ANALYZE containers"))
+
+
+async def time_query(engine, backend: str, search: str, repeat: int) -> float:
+    samples = []
+    async with AsyncSession(engine) as session:
+        repository = ContainerRepository(session, search_backend=backend)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await repository.get_all(search=search, limit=20)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    results = []
+    for rows in args.sizes:
+        await seed(engine, rows)
+        for search in QUERIES:
+            row = {"rows": rows, "search": search}
+            for backend in ("ilike", "trigram"):
+                row[f"{backend}_ms"] = round(await time_query(engine, backend, search, args.repeat), 3)
+            results.append(row)
+            print(f"{rows:>9} {search!r:<20} ilike={row['ilike_ms']:>9.2f}ms trigram={row['trigram_ms']:>9.2f}ms")
+    await engine.dispose()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
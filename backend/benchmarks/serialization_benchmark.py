@@ -0,0 +1,87 @@
+"""Per-page serialization cost of the container list, before and after the batch serializer.
+
+Needs no database; containers are built as transient ORM objects:
+
+    python -m benchmarks.serialization_benchmark
+"""
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime
+
+from app.models import Container, Location
+from app.schemas.container import ContainerListResponse, ContainerResponse
+from app.services.container_serializer import container_serializer
+
+
+def build_containers(count: int):
+    containers = []
+    for i in range(count):
+        location = Location(id=uuid.uuid4(), city="Lviv", country="Ukraine", address=f"Street {i}") if i % 2 else None
+        containers.append(Container(
+            id=str(uuid.uuid4()), name=f"container-{i}", type="physical" if i % 2 else "virtual",
+            tenant=f"tenant-{i % 5}", purpose="research", status="active",
+            seed_types=[{"id": "s1", "name": "Basil"}, {"id": "s2", "name": "Kale", "variety": "Curly"}],
+            location=location, notes=None, created=datetime.utcnow(), modified=datetime.utcnow(),
+            has_alert=bool(i % 3), shadow_service_enabled=False
+        ))
+    return containers
+
+
+def legacy_response(container: Container) -> ContainerResponse:
+    location_data = None
+    if container.location:
+        location_data = {
+            "city": container.location.city,
+            "country": container.location.country,
+            "address": container.location.address
+        }
+    return ContainerResponse(
+        id=container.id, name=container.name, type=container.type, tenant=container.tenant,
+        purpose=container.purpose, seed_types=container.seed_types or [], location=location_data,
+        notes=container.notes,
+        settings={"shadow_service_enabled": container.shadow_service_enabled, "copied_environment_from": None,
+                  "robotics_simulation_enabled": None, "ecosystem": None},
+        environment={"air_temperature": None, "humidity": None, "co2": None,
+                     "nursery_station": None, "cultivation_area": None},
+        inventory={"tray_ids": [], "panel_ids": []},
+        metrics={"yield_kg": None, "space_utilization_percentage": None},
+        status=container.status, created=container.created, modified=container.modified,
+        has_alert=container.has_alert
+    )
+
+
+def before(containers) -> bytes:
+    # Per-row model construction, then FastAPI's response_model validation and JSON encoding
+    response = ContainerListResponse(
+        containers=[legacy_response(c) for c in containers], total=1000, page=1, size=len(containers), pages=10
+    )
+    validated = ContainerListResponse.model_validate(response.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode()
+
+
+def after(containers) -> bytes:
+    payload = container_serializer.list_payload(containers, total=1000, page=1, size=len(containers), pages=10)
+    return container_serializer.dumps(payload)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--containers", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    containers = build_containers(args.containers)
+    expected = json.loads(before(containers))
+    expected.setdefault("next_cursor", None)
+    expected.setdefault("facets", None)
+    assert json.loads(after(containers)) == expected, "serializers disagree"
+
+    for name, fn in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(lambda fn=fn: fn(containers), number=args.number, repeat=5)) / args.number
+        print(f"{name:<7} {seconds * 1000:8.3f} ms per {args.containers} containers")
+
+
+if __name__ == "__main__":
+    main()